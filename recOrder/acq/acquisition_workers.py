@@ -22,9 +22,7 @@ from recOrder.cli import settings
 from recOrder.cli.apply_inverse_transfer_function import (
     apply_inverse_transfer_function_cli,
 )
-from recOrder.cli.compute_transfer_function import (
-    compute_transfer_function_cli,
-)
+from recOrder.cli.tf_cache import get_cached_transfer_function
 from recOrder.io.utils import add_index_to_path, model_to_yaml, ram_message
 
 # avoid runtime import error
@@ -301,15 +299,13 @@ class BFAcquisitionWorker(WorkerBase):
         self._check_abort()
 
         # Create i/o paths
-        transfer_function_path = Path(self.snap_dir) / "transfer_function.zarr"
         reconstruction_path = Path(self.snap_dir) / "reconstruction.zarr"
         input_data_path = Path(self.latest_out_path) / "0" / "0" / "0"
 
-        # TODO: skip if config files match
-        compute_transfer_function_cli(
+        # Skips computation if a matching transfer function is cached
+        transfer_function_path = get_cached_transfer_function(
             input_position_dirpath=input_data_path,
             config_filepath=self.config_path,
-            output_dirpath=transfer_function_path,
         )
 
         apply_inverse_transfer_function_cli(
@@ -364,7 +360,6 @@ class BFAcquisitionWorker(WorkerBase):
                 continue
 
 
-# TODO: Cache common OTF's on local computers and use those for reconstruction
 class PolarizationAcquisitionWorker(WorkerBase):
     """
     Class to execute a birefringence/phase acquisition.  First step is to snap the images follow by a second
@@ -582,15 +577,13 @@ class PolarizationAcquisitionWorker(WorkerBase):
         self._check_abort()
 
         # Create config and i/o paths
-        transfer_function_path = Path(self.snap_dir) / "transfer_function.zarr"
         reconstruction_path = Path(self.snap_dir) / "reconstruction.zarr"
         input_data_path = Path(self.latest_out_path) / "0" / "0" / "0"
 
-        # TODO: skip if config files match
-        compute_transfer_function_cli(
+        # Skips computation if a matching transfer function is cached
+        transfer_function_path = get_cached_transfer_function(
             input_position_dirpath=input_data_path,
             config_filepath=self.config_path,
-            output_dirpath=transfer_function_path,
         )
 
         apply_inverse_transfer_function_cli(
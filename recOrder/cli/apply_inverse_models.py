@@ -4,6 +4,7 @@ This module converts recOrder's reconstructions into waveorder calls
 
 import numpy as np
 import torch
+from waveorder import correction, stokes
 from waveorder.models import (
     inplane_oriented_thick_pol3d,
     isotropic_fluorescent_thick_3d,
@@ -11,6 +12,8 @@ from waveorder.models import (
     phase_thick_3d,
 )
 
+from recOrder.cli.transfer_function_cache import load_transfer_function
+
 
 def radians_to_nanometers(retardance_rad, wavelength_illumination_um):
     """
@@ -22,6 +25,47 @@ def radians_to_nanometers(retardance_rad, wavelength_illumination_um):
     return retardance_rad * wavelength_illumination_um * 1e3 / (2 * np.pi)
 
 
+def _background_corrected_stokes(
+    czyx_data,
+    intensity_to_stokes_matrix,
+    cyx_no_sample_data=None,
+    remove_estimated_background=False,
+):
+    """
+    The Stokes steps of waveorder's birefringence inverse
+    (inplane_oriented_thick_pol3d.apply_inverse_transfer_function) up to, and
+    excluding, the 2D projection. Callers that need both 2D and 3D parameters
+    compute the Stokes volume only once.
+    """
+    data_stokes = stokes.mmul(intensity_to_stokes_matrix, czyx_data)
+
+    if cyx_no_sample_data is None:
+        background_corrected_stokes = data_stokes
+    else:
+        measured_no_sample_stokes = stokes.mmul(
+            intensity_to_stokes_matrix, cyx_no_sample_data
+        )
+        inverse_background_mueller = stokes.mueller_from_stokes(
+            *measured_no_sample_stokes, model="adr", direction="inverse"
+        )
+        background_corrected_stokes = stokes.mmul(
+            inverse_background_mueller, data_stokes
+        )
+
+    if remove_estimated_background:
+        for stokes_index in range(background_corrected_stokes.shape[0]):
+            z_projection = torch.mean(
+                background_corrected_stokes[stokes_index], dim=0
+            )
+            background_corrected_stokes[
+                stokes_index
+            ] -= correction.estimate_background(
+                z_projection, order=2, block_size=32
+            )
+
+    return background_corrected_stokes
+
+
 def birefringence(
     czyx_data,
     cyx_no_sample_data,
@@ -31,8 +75,8 @@ def birefringence(
     transfer_function_dataset,
 ):
     # Load transfer function
-    intensity_to_stokes_matrix = torch.tensor(
-        transfer_function_dataset["intensity_to_stokes_matrix"][0, 0, 0]
+    intensity_to_stokes_matrix = load_transfer_function(
+        transfer_function_dataset, "intensity_to_stokes_matrix", (0, 0, 0)
     )
 
     # Apply reconstruction
@@ -64,11 +108,11 @@ def phase(
     # [phase only, 2]
     if recon_dim == 2:
         # Load transfer functions
-        absorption_transfer_function = torch.tensor(
-            transfer_function_dataset["absorption_transfer_function"][0, 0]
+        absorption_transfer_function = load_transfer_function(
+            transfer_function_dataset, "absorption_transfer_function"
         )
-        phase_transfer_function = torch.tensor(
-            transfer_function_dataset["phase_transfer_function"][0, 0]
+        phase_transfer_function = load_transfer_function(
+            transfer_function_dataset, "phase_transfer_function"
         )
 
         # Apply
@@ -85,13 +129,11 @@ def phase(
     # [phase only, 3]
     elif recon_dim == 3:
         # Load transfer functions
-        real_potential_transfer_function = torch.tensor(
-            transfer_function_dataset["real_potential_transfer_function"][0, 0]
+        real_potential_transfer_function = load_transfer_function(
+            transfer_function_dataset, "real_potential_transfer_function"
         )
-        imaginary_potential_transfer_function = torch.tensor(
-            transfer_function_dataset["imaginary_potential_transfer_function"][
-                0, 0
-            ]
+        imaginary_potential_transfer_function = load_transfer_function(
+            transfer_function_dataset, "imaginary_potential_transfer_function"
         )
 
         # Apply
@@ -120,42 +162,48 @@ def birefringence_and_phase(
     transfer_function_dataset,
 ):
     # Load birefringence transfer function
-    intensity_to_stokes_matrix = torch.tensor(
-        transfer_function_dataset["intensity_to_stokes_matrix"][0, 0, 0]
+    intensity_to_stokes_matrix = load_transfer_function(
+        transfer_function_dataset, "intensity_to_stokes_matrix", (0, 0, 0)
     )
 
     # [biref and phase, 2]
     if recon_dim == 2:
         # Load phase transfer functions
-        absorption_transfer_function = torch.tensor(
-            transfer_function_dataset["absorption_transfer_function"][0, 0]
+        absorption_transfer_function = load_transfer_function(
+            transfer_function_dataset, "absorption_transfer_function"
         )
-        phase_transfer_function = torch.tensor(
-            transfer_function_dataset["phase_transfer_function"][0, 0]
+        phase_transfer_function = load_transfer_function(
+            transfer_function_dataset, "phase_transfer_function"
         )
 
-        # Apply
-        reconstructed_parameters_2d = (
-            inplane_oriented_thick_pol3d.apply_inverse_transfer_function(
-                czyx_data,
-                intensity_to_stokes_matrix,
-                cyx_no_sample_data=cyx_no_sample_data,
-                project_stokes_to_2d=True,
-                **biref_inverse_dict,
-            )
+        # Apply, sharing one Stokes volume between the projected 2D
+        # parameters and the 3D brightfield used for phase
+        background_corrected_stokes = _background_corrected_stokes(
+            czyx_data,
+            intensity_to_stokes_matrix,
+            cyx_no_sample_data=cyx_no_sample_data,
+            remove_estimated_background=biref_inverse_dict[
+                "remove_estimated_background"
+            ],
         )
 
-        reconstructed_parameters_3d = (
-            inplane_oriented_thick_pol3d.apply_inverse_transfer_function(
-                czyx_data,
-                intensity_to_stokes_matrix,
-                cyx_no_sample_data=cyx_no_sample_data,
-                project_stokes_to_2d=False,
-                **biref_inverse_dict,
-            )
-        )
+        # transmittance is the background-corrected s0
+        brightfield_3d = background_corrected_stokes[0].clone()
 
-        brightfield_3d = reconstructed_parameters_3d[2]
+        adr_parameters_2d = stokes.estimate_adr_from_stokes(
+            *torch.mean(background_corrected_stokes, dim=1)[:, None, ...]
+        )
+        orientation_2d = stokes.apply_orientation_offset(
+            adr_parameters_2d[1],
+            rotate=biref_inverse_dict["rotate_orientation"],
+            flip=biref_inverse_dict["flip_orientation"],
+        )
+        reconstructed_parameters_2d = (
+            adr_parameters_2d[0],
+            orientation_2d,
+            adr_parameters_2d[2],
+            adr_parameters_2d[3],
+        )
 
         (
             _,
@@ -181,17 +229,15 @@ def birefringence_and_phase(
     # [biref and phase, 3]
     elif recon_dim == 3:
         # Load phase transfer functions
-        intensity_to_stokes_matrix = torch.tensor(
-            transfer_function_dataset["intensity_to_stokes_matrix"][0, 0, 0]
+        intensity_to_stokes_matrix = load_transfer_function(
+            transfer_function_dataset, "intensity_to_stokes_matrix", (0, 0, 0)
         )
         # Load transfer functions
-        real_potential_transfer_function = torch.tensor(
-            transfer_function_dataset["real_potential_transfer_function"][0, 0]
+        real_potential_transfer_function = load_transfer_function(
+            transfer_function_dataset, "real_potential_transfer_function"
         )
-        imaginary_potential_transfer_function = torch.tensor(
-            transfer_function_dataset["imaginary_potential_transfer_function"][
-                0, 0
-            ]
+        imaginary_potential_transfer_function = load_transfer_function(
+            transfer_function_dataset, "imaginary_potential_transfer_function"
         )
 
         # Apply
@@ -236,8 +282,8 @@ def fluorescence(
     # [fluo, 3]
     elif recon_dim == 3:
         # Load transfer functions
-        optical_transfer_function = torch.tensor(
-            transfer_function_dataset["optical_transfer_function"][0, 0]
+        optical_transfer_function = load_transfer_function(
+            transfer_function_dataset, "optical_transfer_function"
         )
 
         # Apply
@@ -1,5 +1,7 @@
 import itertools
+import time
 import warnings
+from concurrent.futures import ProcessPoolExecutor
 from functools import partial
 from pathlib import Path
 
@@ -15,26 +17,51 @@ from typing import Final
 from recOrder.cli import jobs_mgmt
 
 from recOrder.cli import apply_inverse_models
+from recOrder.cli.compute_transfer_function import (
+    transfer_function_zyx_shape,
+    use_overlap_tiles,
+)
 from recOrder.cli.parsing import (
     config_filepath,
     input_position_dirpaths,
+    job_minutes,
     output_dirpath,
+    resume,
     processes_option,
     transfer_function_dirpath,
     ram_multiplier,
+    run_report,
     unique_id,
+    calibrate,
 )
+from recOrder.cli.executors import get_executor
+from recOrder.cli.ledger import CompletionLedger, ledger_key
 from recOrder.cli.printing import echo_headline, echo_settings
+from recOrder.cli.resource_profile import get_resource_profile, size_job
 from recOrder.cli.settings import ReconstructionSettings
+from recOrder.cli.sharding import plan_shards, shard_size, time_points_label
+from recOrder.cli.transfer_function_cache import (
+    TRANSFER_FUNCTION_CACHE,
+    attach_shared_transfer_functions,
+)
 from recOrder.cli.utils import (
+    OUTPUT_SCALING_KEY,
     apply_inverse_to_zyx_and_save,
+    apply_inverse_to_zyx_and_save_batched,
+    apply_inverse_to_zyx_and_save_overlap_tiled,
+    apply_inverse_to_zyx_and_save_pipelined,
+    apply_inverse_to_zyx_and_save_tiled,
+    auto_time_batch_size,
+    close_output_positions,
     create_empty_hcs_zarr,
+    estimate_output_scaling,
+    get_output_position,
+    get_storage_options,
+    set_output_scaling,
 )
 from recOrder.io import utils
 from recOrder.cli.monitor import monitor_jobs
 
-JM = jobs_mgmt.JobsManagement()
-
 def _check_background_consistency(
     background_shape, data_shape, input_channel_names
 ):
@@ -45,6 +72,151 @@ def _check_background_consistency(
         )
 
 
+def _use_tiled_birefringence(settings: ReconstructionSettings) -> bool:
+    # Birefringence is pixel-local, so it can be reconstructed tile by tile
+    # unless the background is estimated from the whole field of view
+    return (
+        settings.processing.tile_size > 0
+        and settings.birefringence is not None
+        and settings.phase is None
+        and not settings.birefringence.apply_inverse.remove_estimated_background
+    )
+
+
+def _use_time_batches(settings: ReconstructionSettings) -> bool:
+    # 2D birefringence is pixel-local in YX, so time points can be stacked
+    # along Y and inverted together
+    return (
+        settings.processing.time_batch_size != 1
+        and settings.processing.tile_size == 0
+        and settings.reconstruction_dimension == 2
+        and settings.birefringence is not None
+        and settings.phase is None
+        and not settings.birefringence.apply_inverse.remove_estimated_background
+    )
+
+
+def _check_transfer_function_shape(
+    transfer_function_dataset, settings, data_shape
+):
+    tf_yx_shape = transfer_function_zyx_shape(settings, data_shape[2:])[1:]
+    for name in (
+        "real_potential_transfer_function",
+        "optical_transfer_function",
+    ):
+        if name not in transfer_function_dataset.array_keys():
+            continue
+        if transfer_function_dataset[name].shape[-2:] != tf_yx_shape:
+            raise ValueError(
+                f"{name} has YX shape {transfer_function_dataset[name].shape[-2:]}, but processing.tile_size and processing.tile_overlap require {tf_yx_shape}. Recompute the transfer function with the same configuration file."
+            )
+
+
+def _output_chunks(
+    settings: ReconstructionSettings, shape: tuple, dtype
+) -> tuple:
+    """Chunk shape of the reconstructed arrays.
+
+    Chunks never span time points or channels, so that parallel jobs and
+    reconstructions appending channels never write to the same chunk. The
+    "auto" policy matches the write granularity: whole YX planes for
+    volume-at-a-time writers and tile-sized YX blocks when tiling, stacked
+    along Z until a chunk holds about `target_chunk_mb`.
+    """
+    if settings.output.chunks != "auto":
+        return tuple(settings.output.chunks)
+
+    _, _, Z, Y, X = shape
+    yx_chunk = (Y, X)
+    if _use_tiled_birefringence(settings) or use_overlap_tiles(settings):
+        yx_chunk = (
+            min(settings.processing.tile_size, Y),
+            min(settings.processing.tile_size, X),
+        )
+
+    # z-local tiles are written one slice at a time
+    if _use_tiled_birefringence(settings):
+        return (1, 1, 1) + yx_chunk
+
+    plane_bytes = np.prod(yx_chunk) * np.dtype(dtype).itemsize
+    target_bytes = settings.output.target_chunk_mb * 2**20
+    z_chunk = int(np.clip(target_bytes // plane_bytes, 1, Z))
+    return (1, 1, z_chunk) + yx_chunk
+
+
+def _initialize_output_scaling(
+    settings: ReconstructionSettings,
+    apply_inverse_model_function,
+    apply_inverse_args: dict,
+    input_dataset,
+    input_channel_indices: list[int],
+    output_position_dirpath: Path,
+    output_channel_names: list[str],
+    t_idx: int,
+) -> None:
+    # Integer outputs need a scale and offset per channel before any time
+    # point is written, so estimate them from a sample reconstruction
+    output_dataset = get_output_position(output_position_dirpath)
+    output_dtype = output_dataset[0].dtype
+    if not np.issubdtype(output_dtype, np.integer):
+        return
+    output_scaling = output_dataset.zattrs.get(OUTPUT_SCALING_KEY, {})
+    if set(output_channel_names).issubset(output_scaling):
+        return
+
+    # Tiled reconstructions are sampled on the central tile
+    _, _, Z, Y, X = input_dataset.data.shape
+    if use_overlap_tiles(settings):
+        window_shape = transfer_function_zyx_shape(settings, (Z, Y, X))[1:]
+    elif _use_tiled_birefringence(settings):
+        window_shape = (
+            min(settings.processing.tile_size, Y),
+            min(settings.processing.tile_size, X),
+        )
+    else:
+        window_shape = (Y, X)
+    y_slice, x_slice = (
+        slice((length - window) // 2, (length - window) // 2 + window)
+        for length, window in zip((Y, X), window_shape)
+    )
+
+    click.echo(f"Estimating {output_dtype} output scaling from t={t_idx}")
+    czyx_data = torch.from_numpy(
+        input_dataset.data.oindex[
+            t_idx, input_channel_indices, :, y_slice, x_slice
+        ].astype(np.float32)
+    )
+    sample_args = dict(apply_inverse_args)
+    if sample_args.get("cyx_no_sample_data") is not None:
+        sample_args["cyx_no_sample_data"] = sample_args["cyx_no_sample_data"][
+            ..., y_slice, x_slice
+        ]
+    reconstruction_czyx = apply_inverse_model_function(
+        czyx_data, **sample_args
+    )
+    set_output_scaling(
+        output_dataset,
+        output_channel_names,
+        estimate_output_scaling(reconstruction_czyx, output_dtype),
+    )
+
+
+def _apply_inverse_and_record(
+    partial_apply_inverse_to_zyx_and_save, ledger: CompletionLedger, t_idx
+) -> None:
+    partial_apply_inverse_to_zyx_and_save(t_idx)
+    ledger.record([t_idx])
+
+
+def _get_time_indices(settings: ReconstructionSettings, T: int) -> list[int]:
+    if settings.time_indices == "all":
+        return list(range(T))
+    elif isinstance(settings.time_indices, list):
+        return settings.time_indices
+    elif isinstance(settings.time_indices, int):
+        return [settings.time_indices]
+
+
 def get_reconstruction_output_metadata(position_path: Path, config_path: Path):
     # Get non-OME-Zarr plate-level metadata if it's available
     plate_metadata = {}
@@ -95,13 +267,22 @@ def get_reconstruction_output_metadata(position_path: Path, config_path: Path):
     elif recon_dim == 3:
         output_z_shape = input_dataset.data.shape[2]
 
+    output_shape = (T, len(channel_names), output_z_shape, Y, X)
+    output_dtype = np.dtype(settings.output.dtype)
+
     return {
-        "shape": (T, len(channel_names), output_z_shape, Y, X),
-        "chunks": (1, 1, 1, Y, X),
+        "shape": output_shape,
+        "chunks": _output_chunks(settings, output_shape, output_dtype),
         "scale": input_dataset.scale,
         "channel_names": channel_names,
-        "dtype": np.float32,
+        "dtype": output_dtype,
         "plate_metadata": plate_metadata,
+        "storage_options": get_storage_options(
+            settings.output.compression,
+            settings.output.compression_level,
+            settings.output.quantize_digits,
+            output_dtype,
+        ),
     }
 
 
@@ -112,8 +293,17 @@ def apply_inverse_transfer_function_single_position(
     output_position_dirpath: Path,
     num_processes,
     output_channel_names: list[str],
-) -> None:
+    time_indices: list[int] = None,
+    resume: bool = False,
+) -> dict:
+    # Returns the wall-clock start and end times of the job, which the
+    # monitor reports instead of the times its updates noticed them, and the
+    # seconds spent reconstructing and writing time_indices, without loading
+    # the datasets and transfer functions
+    start_time = time.time()
     echo_headline("\nStarting reconstruction...")
+    # Cache statistics are reported per position, the cache itself persists
+    TRANSFER_FUNCTION_CACHE.reset_stats()
 
     # Load datasets
     transfer_function_dataset = open_ome_zarr(transfer_function_dirpath)
@@ -145,13 +335,10 @@ def apply_inverse_transfer_function_single_position(
             output_dataset.channel_names.index(output_channel_name)
         )
 
-    # Find time indices
-    if settings.time_indices == "all":
-        time_indices = range(input_dataset.data.shape[0])
-    elif isinstance(settings.time_indices, list):
-        time_indices = settings.time_indices
-    elif isinstance(settings.time_indices, int):
-        time_indices = [settings.time_indices]
+    # Find time indices, a shard of them for time-sharded jobs
+    all_time_indices = _get_time_indices(settings, input_dataset.data.shape[0])
+    if time_indices is None:
+        time_indices = all_time_indices
 
     # Check for invalid times
     time_ubound = input_dataset.data.shape[0] - 1
@@ -160,6 +347,27 @@ def apply_inverse_transfer_function_single_position(
             f"time_indices = {time_indices} includes a time index beyond the maximum index of the dataset = {time_ubound}"
         )
 
+    # Skip the time points that a previous run already wrote
+    ledger = CompletionLedger(
+        output_position_dirpath, ledger_key(settings, output_channel_names)
+    )
+    if resume:
+        num_requested = len(time_indices)
+        time_indices = ledger.remaining(time_indices)
+        click.echo(
+            f"Resuming: {num_requested - len(time_indices)} of "
+            f"{num_requested} time points were already reconstructed"
+        )
+        if len(time_indices) == 0:
+            output_dataset.close()
+            transfer_function_dataset.close()
+            input_dataset.close()
+            return {
+                "start_time": start_time,
+                "end_time": time.time(),
+                "reconstruction_seconds": 0.0,
+            }
+
     # Simplify important settings names
     recon_biref = settings.birefringence is not None
     recon_phase = settings.phase is not None
@@ -254,35 +462,149 @@ def apply_inverse_transfer_function_single_position(
         }
 
     # Make the partial function for apply inverse
-    partial_apply_inverse_to_zyx_and_save = partial(
-        apply_inverse_to_zyx_and_save,
+    use_tiles = _use_tiled_birefringence(settings)
+    use_overlap = use_overlap_tiles(settings)
+    if use_overlap:
+        _check_transfer_function_shape(
+            transfer_function_dataset, settings, input_dataset.data.shape
+        )
+        partial_apply_inverse_to_zyx_and_save = partial(
+            apply_inverse_to_zyx_and_save_overlap_tiled,
+            apply_inverse_model_function,
+            input_dataset,
+            output_position_dirpath,
+            input_channel_indices,
+            output_channel_indices,
+            tile_size=settings.processing.tile_size,
+            tile_overlap=settings.processing.tile_overlap,
+            **apply_inverse_args,
+        )
+    elif use_tiles:
+        partial_apply_inverse_to_zyx_and_save = partial(
+            apply_inverse_to_zyx_and_save_tiled,
+            apply_inverse_model_function,
+            input_dataset,
+            output_position_dirpath,
+            input_channel_indices,
+            output_channel_indices,
+            tile_size=settings.processing.tile_size,
+            z_local=(recon_dim == 3),
+            **apply_inverse_args,
+        )
+    else:
+        if settings.processing.tile_size > 0:
+            click.echo(
+                "processing.tile_size only applies to birefringence-only "
+                "and 3D phase or fluorescence reconstructions without "
+                "remove_estimated_background. Reconstructing whole volumes."
+            )
+        partial_apply_inverse_to_zyx_and_save = partial(
+            apply_inverse_to_zyx_and_save,
+            apply_inverse_model_function,
+            input_dataset,
+            output_position_dirpath,
+            input_channel_indices,
+            output_channel_indices,
+            **apply_inverse_args,
+        )
+
+    _initialize_output_scaling(
+        settings,
         apply_inverse_model_function,
+        apply_inverse_args,
         input_dataset,
-        output_position_dirpath,
         input_channel_indices,
-        output_channel_indices,
-        **apply_inverse_args,
+        output_position_dirpath,
+        output_channel_names,
+        # shards of a position that estimate the scaling concurrently sample
+        # the same time point, so they store the same scaling
+        all_time_indices[0],
     )
 
+    start = time.perf_counter()
     # Multiprocessing logic
     if num_processes > 1:
         # Loop through T, processing and writing as we go
         click.echo(
             f"\nStarting multiprocess pool with {num_processes} processes"
         )
-        with mp.Pool(num_processes) as p:
+        # Workers attach to one shared copy of the transfer functions
+        shared_transfer_functions = TRANSFER_FUNCTION_CACHE.share(
+            transfer_function_dataset
+        )
+        with mp.Pool(
+            num_processes,
+            initializer=attach_shared_transfer_functions,
+            initargs=(shared_transfer_functions,),
+        ) as p:
             p.starmap(
-                partial_apply_inverse_to_zyx_and_save,
+                partial(
+                    _apply_inverse_and_record,
+                    partial_apply_inverse_to_zyx_and_save,
+                    ledger,
+                ),
                 itertools.product(time_indices),
             )
+        click.echo(
+            f"Shared {TRANSFER_FUNCTION_CACHE.bytes_shared / 2**20:.1f} MB "
+            f"of transfer functions between {num_processes} processes"
+        )
+        TRANSFER_FUNCTION_CACHE.invalidate(transfer_function_dirpath)
+    elif _use_time_batches(settings):
+        time_batch_size = settings.processing.time_batch_size
+        if time_batch_size == "auto":
+            time_batch_size = auto_time_batch_size(
+                (len(input_channel_indices),) + input_dataset.data.shape[2:],
+                len(time_indices),
+            )
+        click.echo(f"Reconstructing {time_batch_size} time points per batch")
+        apply_inverse_to_zyx_and_save_batched(
+            apply_inverse_model_function,
+            input_dataset,
+            output_position_dirpath,
+            input_channel_indices,
+            output_channel_indices,
+            time_indices,
+            batch_size=time_batch_size,
+            on_written=ledger.record,
+            **apply_inverse_args,
+        )
+    elif settings.processing.prefetch_depth > 0 and not (
+        use_tiles or use_overlap
+    ):
+        # Overlap reading, reconstruction, and writing of time points
+        apply_inverse_to_zyx_and_save_pipelined(
+            apply_inverse_model_function,
+            input_dataset,
+            output_position_dirpath,
+            input_channel_indices,
+            output_channel_indices,
+            time_indices,
+            queue_depth=settings.processing.prefetch_depth,
+            on_written=ledger.record,
+            **apply_inverse_args,
+        )
     else:
         for t_idx in time_indices:
-            partial_apply_inverse_to_zyx_and_save(t_idx)
+            _apply_inverse_and_record(
+                partial_apply_inverse_to_zyx_and_save, ledger, t_idx
+            )
+    reconstruction_seconds = time.perf_counter() - start
+
+    # Report transfer function reuse in this process for this position
+    tf_cache_stats = TRANSFER_FUNCTION_CACHE.stats()
+    click.echo(
+        f"Transfer function cache for this position: "
+        f"{tf_cache_stats['hits']} hits, "
+        f"{tf_cache_stats['misses']} misses, "
+        f"{tf_cache_stats['bytes_loaded'] / 2**20:.1f} MB loaded"
+    )
 
     # Save metadata at position level
     output_dataset.zattrs["settings"] = settings.dict()
 
     echo_headline(f"Closing {output_position_dirpath}\n")
+    close_output_positions(output_position_dirpath)
     output_dataset.close()
     transfer_function_dataset.close()
     input_dataset.close()
@@ -290,6 +612,11 @@ def apply_inverse_transfer_function_single_position(
     echo_headline(
         f"Recreate this reconstruction with:\n$ recorder apply-inv-tf {input_position_dirpath} {transfer_function_dirpath} -c {config_filepath} -o {output_position_dirpath}"
     )
+    return {
+        "start_time": start_time,
+        "end_time": time.time(),
+        "reconstruction_seconds": reconstruction_seconds,
+    }
 
 
 def apply_inverse_transfer_function_cli(
@@ -299,8 +626,15 @@ def apply_inverse_transfer_function_cli(
     output_dirpath: Path,
     num_processes: int = 1,
     ram_multiplier: float = 1.0,
-    unique_id: str = ""
+    unique_id: str = "",
+    run_report: bool = False,
+    calibrate: bool = False,
+    job_minutes: float = None,
+    resume: bool = False,
+    pool: ProcessPoolExecutor = None,
 ) -> None:
+    # `pool` runs the jobs in running worker processes, e.g. of
+    # `recorder daemon`, instead of the executor backend of the settings
     output_metadata = get_reconstruction_output_metadata(
         input_position_dirpaths[0], config_filepath
     )
@@ -324,18 +658,119 @@ def apply_inverse_transfer_function_cli(
     voxel_resource_multiplier = 4
     fourier_resource_multiplier = 32
     input_memory = Z * Y * X * gb_per_element
-    if settings.birefringence is not None:
-        gb_ram_request += input_memory * voxel_resource_multiplier
+    # overlap tiles are reconstructed one window at a time
+    use_overlap = use_overlap_tiles(settings)
+    window_memory = input_memory
+    if use_overlap:
+        window_memory = (
+            np.prod(transfer_function_zyx_shape(settings, (Z, Y, X)))
+            * gb_per_element
+        )
+    if _use_tiled_birefringence(settings):
+        # only one tile is resident at a time
+        tile_size = settings.processing.tile_size
+        tile_z = 1 if settings.reconstruction_dimension == 3 else Z
+        tile_memory = (
+            tile_z * min(tile_size, Y) * min(tile_size, X) * gb_per_element
+        )
+        gb_ram_request += tile_memory * C * voxel_resource_multiplier
+    elif settings.birefringence is not None:
+        # fixed-size time batches hold that many time points at once
+        time_batch_size = settings.processing.time_batch_size
+        if not _use_time_batches(settings) or time_batch_size == "auto":
+            time_batch_size = 1
+        gb_ram_request += (
+            window_memory * voxel_resource_multiplier * time_batch_size
+        )
     if settings.phase is not None:
-        gb_ram_request += input_memory * fourier_resource_multiplier
+        gb_ram_request += window_memory * fourier_resource_multiplier
     if settings.fluorescence is not None:
-        gb_ram_request += input_memory * fourier_resource_multiplier
+        gb_ram_request += window_memory * fourier_resource_multiplier
+    # prefetched inputs and pending outputs held by the I/O pipeline
+    if not (_use_tiled_birefringence(settings) or use_overlap):
+        gb_ram_request += (
+            input_memory * 2 * C * settings.processing.prefetch_depth
+        )
 
     gb_ram_request = np.ceil(
         np.max([1, ram_multiplier * gb_ram_request])
     ).astype(int)
-    cpu_request = np.min([32, num_processes])
-    num_jobs = len(input_position_dirpaths)
+    executor_settings = settings.executor
+    cpu_request = np.min([executor_settings.max_cpus_per_job, num_processes])
+    slurm_time = 60
+
+    # On resume, reconstruct only the time points without a ledger entry
+    time_indices = _get_time_indices(settings, T)
+    position_time_indices = {p: time_indices for p in input_position_dirpaths}
+    if resume:
+        key = ledger_key(settings, output_metadata["channel_names"])
+        position_time_indices = {
+            p: CompletionLedger(
+                output_dirpath / Path(*p.parts[-3:]), key
+            ).remaining(time_indices)
+            for p in input_position_dirpaths
+        }
+        num_remaining = sum(len(t) for t in position_time_indices.values())
+        echo_headline(
+            f"Resuming: {num_remaining} of "
+            f"{len(time_indices) * len(input_position_dirpaths)} "
+            "time points remain."
+        )
+        if num_remaining == 0:
+            return
+
+    # Size jobs from a measured reconstruction instead, and with job_minutes
+    # split each position into jobs of time points that take about as long
+    time_points_per_shard = None
+    if calibrate or job_minutes is not None:
+        profile = get_resource_profile(
+            input_position_dirpaths[0],
+            transfer_function_dirpath,
+            config_filepath,
+        )
+        echo_headline(
+            f"Measured {profile['peak_gb']:.2f} GB peak memory and "
+            f"{profile['seconds_per_time_point']:.1f} s per time point."
+        )
+        if job_minutes is not None:
+            time_points_per_shard = shard_size(
+                profile["seconds_per_time_point"], job_minutes, num_processes
+            )
+    shards = [
+        shard
+        for position, remaining_time_indices in position_time_indices.items()
+        if len(remaining_time_indices) > 0
+        for shard in plan_shards(
+            [position], remaining_time_indices, time_points_per_shard
+        )
+    ]
+    if calibrate or job_minutes is not None:
+        time_points_per_job = max(
+            len(shard_time_indices or position_time_indices[position])
+            for position, shard_time_indices in shards
+        )
+        if time_points_per_job < len(time_indices):
+            echo_headline(
+                f"Splitting each position into jobs of up to "
+                f"{time_points_per_job} time points."
+            )
+        resources = size_job(
+            profile,
+            time_points_per_job,
+            num_processes,
+            ram_multiplier,
+            executor_settings.max_cpus_per_job,
+        )
+        gb_ram_request = resources["slurm_mem_per_cpu"]
+        cpu_request = resources["slurm_cpus_per_task"]
+        slurm_time = resources["slurm_time"]
+    num_jobs = len(shards)
+
+    # Fixed resources from the executor settings take precedence
+    if executor_settings.mem_per_cpu_gb != "auto":
+        gb_ram_request = executor_settings.mem_per_cpu_gb
+    if executor_settings.time_limit_min != "auto":
+        slurm_time = executor_settings.time_limit_min
 
     # Prepare and submit jobs
     echo_headline(
@@ -346,21 +781,19 @@ def apply_inverse_transfer_function_cli(
     
     name_without_ext = os.path.splitext(Path(output_dirpath).name)[0]
     executor_folder = os.path.join(Path(output_dirpath).parent.absolute(), name_without_ext + "_logs")
-    executor = submitit.AutoExecutor(folder=Path(executor_folder))
-    
-    executor.update_parameters(
-        slurm_array_parallelism=np.min([50, num_jobs]),
-        slurm_mem_per_cpu=f"{gb_ram_request}G",
-        slurm_cpus_per_task=cpu_request,
-        slurm_time=60,
-        slurm_partition="cpu",
-        timeout_min=jobs_mgmt.JOBS_TIMEOUT
-        # more slurm_*** resource parameters here
+    executor = get_executor(
+        executor_settings,
+        Path(executor_folder),
+        num_jobs,
+        gb_ram_request,
+        cpu_request,
+        slurm_time,
+        pool,
     )
     
     jobs = []
     with executor.batch():
-        for input_position_dirpath in input_position_dirpaths:            
+        for input_position_dirpath, shard_time_indices in shards:
             job: Final = executor.submit(
                     apply_inverse_transfer_function_single_position,
                     input_position_dirpath,
@@ -369,6 +802,8 @@ def apply_inverse_transfer_function_cli(
                     output_dirpath / Path(*input_position_dirpath.parts[-3:]),
                     num_processes,
                     output_metadata["channel_names"],
+                    shard_time_indices,
+                    resume,
                 )           
             jobs.append(job)
     echo_headline(
@@ -376,20 +811,37 @@ def apply_inverse_transfer_function_cli(
     )
 
     doPrint = True # CLI prints Job status when used as cmd line
+    on_update = None
     if unique_id != "": # no unique_id means no job submission info being listened to
+        # a client per run, runs in `recorder daemon` threads share the process
+        JM = jobs_mgmt.JobsManagement()
         JM.start_client()
         i=0
         for j in jobs:           
             job : submitit.Job = j
             job_idx : str = job.job_id
-            position = input_position_dirpaths[i]
+            position = str(shards[i][0])
+            if shards[i][1] is not None:
+                # the job table shows the time points of sharded jobs
+                position += " " + time_points_label(shards[i][1])
             JM.put_Job_in_list(job, unique_id, str(job_idx), position, str(executor.folder.absolute()))
             i += 1
         JM.send_data_thread()
         JM.set_shorter_timeout()
+        on_update = JM.push_status_transitions # job states are pushed to the GUI
         doPrint = False # CLI printing disabled when using GUI
 
-    monitor_jobs(jobs, input_position_dirpaths, doPrint)
+    report_filepath = None
+    if run_report:
+        report_filepath = Path(output_dirpath).parent / (name_without_ext + "_report.json")
+    monitor_jobs(
+        jobs,
+        [position for position, _ in shards],
+        doPrint,
+        report_filepath,
+        [shard_time_indices for _, shard_time_indices in shards],
+        on_update=on_update,
+    )
 
 
 @click.command()
@@ -399,6 +851,10 @@ def apply_inverse_transfer_function_cli(
 @output_dirpath()
 @processes_option(default=1)
 @ram_multiplier()
+@calibrate()
+@job_minutes()
+@run_report()
+@resume()
 def apply_inv_tf(
     input_position_dirpaths: list[Path],
     transfer_function_dirpath: Path,
@@ -406,6 +862,10 @@ def apply_inv_tf(
     output_dirpath: Path,
     num_processes,
     ram_multiplier: float = 1.0,
+    calibrate: bool = False,
+    job_minutes: float = None,
+    run_report: bool = False,
+    resume: bool = False,
 ) -> None:
     """
     Apply an inverse transfer function to a dataset using a configuration file.
@@ -415,6 +875,10 @@ def apply_inv_tf(
 
     Appends channels to ./output.zarr, so multiple reconstructions can fill a single store.
 
+    With --job-minutes, each position is split into jobs of time points that take about that long.
+
+    With --resume, only the time points that a previous run did not finish are reconstructed.
+
     See /examples for example configuration files.
 
     >> recorder apply-inv-tf -i ./input.zarr/*/*/* -t ./transfer-function.zarr -c /examples/birefringence.yml -o ./output.zarr
@@ -426,4 +890,8 @@ def apply_inv_tf(
         output_dirpath,
         num_processes,
         ram_multiplier,
+        run_report=run_report,
+        calibrate=calibrate,
+        job_minutes=job_minutes,
+        resume=resume,
     )
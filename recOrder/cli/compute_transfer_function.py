@@ -17,9 +17,54 @@ from recOrder.cli.parsing import (
 )
 from recOrder.cli.printing import echo_headline, echo_settings
 from recOrder.cli.settings import ReconstructionSettings
+from recOrder.cli.transfer_function_cache import TRANSFER_FUNCTION_CACHE
 from recOrder.io import utils
 
 
+def use_overlap_tiles(settings: ReconstructionSettings) -> bool:
+    """3D phase and fluorescence reconstructions are deconvolved tile by tile,
+    each tile padded by a halo of its neighbours, when tiling is enabled.
+
+    Tiling is skipped when the birefringence background is estimated from
+    the whole field of view.
+    """
+    if settings.birefringence is not None:
+        if settings.birefringence.apply_inverse.remove_estimated_background:
+            return False
+    return (
+        settings.processing.tile_size > 0
+        and settings.reconstruction_dimension == 3
+        and (settings.phase is not None or settings.fluorescence is not None)
+    )
+
+
+def transfer_function_zyx_shape(
+    settings: ReconstructionSettings, zyx_shape: tuple
+) -> tuple:
+    """ZYX shape that the transfer functions are computed for.
+
+    This is the input shape, or the shape of a tile plus its halo on both
+    sides when overlap tiling is enabled.
+
+    Parameters
+    ----------
+    settings : ReconstructionSettings
+    zyx_shape : tuple
+        Shape of the input data in (Z, Y, X) order
+
+    Returns
+    -------
+    tuple
+    """
+    Z, Y, X = (int(i) for i in zyx_shape)
+    if not use_overlap_tiles(settings):
+        return (Z, Y, X)
+    window_size = (
+        settings.processing.tile_size + 2 * settings.processing.tile_overlap
+    )
+    return (Z, min(window_size, Y), min(window_size, X))
+
+
 def generate_and_save_birefringence_transfer_function(settings, dataset):
     """Generates and saves the birefringence transfer function to the dataset, based on the settings.
 
@@ -173,6 +218,9 @@ def compute_transfer_function_cli(
     zyx_shape = input_dataset.data.shape[
         2:
     ]  # only loads a single position "0"
+    if use_overlap_tiles(settings):
+        zyx_shape = transfer_function_zyx_shape(settings, zyx_shape)
+        click.echo(f"Computing transfer functions for {zyx_shape} tiles")
 
     # Check input channel names
     if not set(settings.input_channel_names).issubset(
@@ -207,6 +255,9 @@ def compute_transfer_function_cli(
     echo_headline(f"Closing {output_dirpath}\n")
     output_dataset.close()
 
+    # Arrays cached from a previous transfer function at this path are stale
+    TRANSFER_FUNCTION_CACHE.invalidate(output_dirpath)
+
     echo_headline(
         f"Recreate this transfer function with:\n$ recorder compute-tf {input_position_dirpaths} -c {config_filepath} -o {output_dirpath}"
     )
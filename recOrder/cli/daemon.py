@@ -0,0 +1,277 @@
+"""
+Long-lived local reconstruction service.
+
+`recorder daemon` keeps a pool of worker processes that import torch and
+waveorder once. For each `reconstruct` request it receives over a localhost
+socket, a thread of the service loads or computes the transfer function
+from the on-disk cache (see `recOrder.cli.tf_cache`) and submits the
+reconstruction jobs, one `apply_inverse_transfer_function_single_position`
+call per position, to that pool, whatever the executor settings. The GUI
+sends its jobs here instead of starting a `recorder reconstruct` subprocess
+per job, so jobs skip the interpreter startup and imports, and reuse the
+transfer functions decoded by earlier jobs in the same worker. The request
+thread, not a worker, waits for the jobs to finish.
+
+Requests and replies are length-prefixed JSON objects keyed by "uID" and
+"jID", framed and keyed like the messages in `recOrder.cli.jobs_mgmt`:
+
+    {"uID": "exp0", "jID": "0", "command": "reconstruct", "args": {...}}
+    {"uID": "exp0", "jID": "0", "status": "accepted"}
+    {"uID": "exp0", "jID": "0", "status": "completed"}
+
+"args" holds the keyword arguments of
+`recOrder.cli.reconstruct.reconstruct_cli`. A failed request replies with
+the status "errored" and an "error" message. The "ping" command replies
+with the status "alive", and "shutdown" stops the service once the running
+requests finish.
+
+>> recorder daemon -j 2
+"""
+
+import multiprocessing as mp
+import socket
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Callable, Iterator
+
+import click
+
+from recOrder.cli.jobs_mgmt import DAEMON_PORT, MessageReader, encode_message
+from recOrder.cli.parsing import processes_option
+from recOrder.cli.printing import echo_headline
+
+HOST = "localhost"
+FINAL_STATUSES = ("completed", "errored", "cancelled")
+
+
+def _read_messages(sock: socket.socket) -> Iterator[dict]:
+    """Yield the JSON messages received on a socket until it closes or
+    sends a corrupt frame."""
+    reader = MessageReader()
+    while True:
+        try:
+            data = sock.recv(65536)
+            messages = reader.feed(data)
+        except (OSError, ValueError):
+            return
+        if not data:
+            return
+        yield from messages
+
+
+def _send_message(
+    sock: socket.socket, lock: threading.Lock, message: dict
+) -> None:
+    with lock:
+        try:
+            sock.sendall(encode_message(message))
+        except OSError:
+            pass  # the client disconnected
+
+
+def _warm_up() -> None:
+    # Import the reconstruction dependencies once per process
+    import recOrder.cli.reconstruct  # noqa: F401
+
+
+def _run_reconstruction(args: dict, pool: ProcessPoolExecutor) -> None:
+    from recOrder.cli.parsing import _validate_and_process_paths
+    from recOrder.cli.reconstruct import reconstruct_cli
+
+    args = dict(args)
+    args["input_position_dirpaths"] = _validate_and_process_paths(
+        None, None, tuple(args["input_position_dirpaths"])
+    )
+    for key in ("config_filepath", "output_dirpath", "tf_cache_dirpath"):
+        if key in args:
+            args[key] = Path(args[key])
+    args.setdefault("use_tf_cache", True)
+    reconstruct_cli(**args, pool=pool)
+
+
+class ReconstructionService:
+    """Accept reconstruction requests on a localhost port and run their
+    jobs in a pool of warm worker processes.
+
+    Parameters
+    ----------
+    port : int, optional
+        Port to listen on, 0 picks a free port, by default DAEMON_PORT
+    max_workers : int, optional
+        Number of worker processes, which is the number of jobs that run at
+        once, by default 1
+    """
+
+    def __init__(self, port: int = DAEMON_PORT, max_workers: int = 1):
+        self.server_socket = socket.create_server((HOST, port))
+        # Poll so that `shutdown` from another thread stops `serve_forever`
+        self.server_socket.settimeout(0.5)
+        self.port = self.server_socket.getsockname()[1]
+        self.pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_warm_up,
+        )
+        # Requests compute transfer functions, submit their jobs to the pool
+        # and wait for them in threads of this process
+        self.requests = ThreadPoolExecutor(thread_name_prefix="request")
+        _warm_up()
+        self._stopped = threading.Event()
+
+    def serve_forever(self) -> None:
+        try:
+            while not self._stopped.is_set():
+                try:
+                    client_socket, _ = self.server_socket.accept()
+                except socket.timeout:
+                    continue
+                threading.Thread(
+                    target=self._handle_client,
+                    args=(client_socket,),
+                    daemon=True,
+                ).start()
+        finally:
+            self.server_socket.close()
+            self.requests.shutdown(wait=True, cancel_futures=True)
+            self.pool.shutdown(wait=True, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        self._stopped.set()
+
+    def _handle_client(self, client_socket: socket.socket) -> None:
+        send = partial(_send_message, client_socket, threading.Lock())
+        for message in _read_messages(client_socket):
+            reply = {
+                "uID": message.get("uID", ""),
+                "jID": str(message.get("jID", "")),
+            }
+            command = message.get("command")
+            if command == "ping":
+                send({**reply, "status": "alive"})
+            elif command == "shutdown":
+                send({**reply, "status": "stopping"})
+                self.shutdown()
+            elif command == "reconstruct":
+                try:
+                    future = self.requests.submit(
+                        _run_reconstruction, message["args"], self.pool
+                    )
+                except (KeyError, RuntimeError) as exc:
+                    send({**reply, "status": "errored", "error": repr(exc)})
+                    continue
+                send({**reply, "status": "accepted"})
+                future.add_done_callback(
+                    partial(self._reply_result, send, reply)
+                )
+            else:
+                send(
+                    {
+                        **reply,
+                        "status": "errored",
+                        "error": f"Unknown command {command!r}",
+                    }
+                )
+
+    @staticmethod
+    def _reply_result(send: Callable, reply: dict, future: Future) -> None:
+        if future.cancelled():
+            send({**reply, "status": "cancelled"})
+        elif future.exception() is not None:
+            send(
+                {
+                    **reply,
+                    "status": "errored",
+                    "error": repr(future.exception()),
+                }
+            )
+        else:
+            send({**reply, "status": "completed"})
+
+
+class ReconstructionClient:
+    """Minimal client of a `ReconstructionService`.
+
+    Parameters
+    ----------
+    port : int, optional
+        Port of the service, by default DAEMON_PORT
+    timeout : float, optional
+        Socket timeout in seconds, by default None (blocking)
+    """
+
+    def __init__(self, port: int = DAEMON_PORT, timeout: float = None):
+        self.socket = socket.create_connection((HOST, port), timeout=timeout)
+        self._lock = threading.Lock()
+        self._messages = _read_messages(self.socket)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self) -> None:
+        self.socket.close()
+
+    def send(self, command: str, uID: str = "", jID: str = "", **fields):
+        _send_message(
+            self.socket,
+            self._lock,
+            {"uID": uID, "jID": str(jID), "command": command, **fields},
+        )
+
+    def receive(self) -> dict:
+        """Next reply from the service, None if the connection closed."""
+        return next(self._messages, None)
+
+    def reconstruct(self, uID: str, jID: str = "0", **args) -> dict:
+        """Submit a reconstruction and return the service's first reply.
+        `args` are the keyword arguments of `reconstruct_cli`."""
+        self.send("reconstruct", uID, jID, args=args)
+        return self.receive()
+
+    def wait(self) -> dict:
+        """Return the next reply with a final status."""
+        while (reply := self.receive()) is not None:
+            if reply["status"] in FINAL_STATUSES:
+                return reply
+
+
+def is_service_running(port: int = DAEMON_PORT, timeout: float = 1) -> bool:
+    try:
+        with ReconstructionClient(port, timeout=timeout) as client:
+            client.send("ping")
+            reply = client.receive()
+    except OSError:
+        return False
+    return reply is not None and reply["status"] == "alive"
+
+
+@click.command()
+@click.option(
+    "--port",
+    default=DAEMON_PORT,
+    type=int,
+    help="Localhost port to listen on.",
+)
+@processes_option(default=1)
+def daemon(port: int, num_processes: int) -> None:
+    """
+    Run a local reconstruction service that keeps reconstruction
+    dependencies loaded between jobs.
+
+    The recOrder GUI submits its jobs to this service when it is running.
+    `num_processes` sets the number of jobs (positions) that run in
+    parallel.
+
+    >> recorder daemon -j 2
+    """
+    service = ReconstructionService(port, num_processes)
+    echo_headline(
+        f"Reconstruction service listening on {HOST}:{service.port} "
+        f"with {num_processes} worker process"
+        f"{'es' if num_processes > 1 else ''}."
+    )
+    service.serve_forever()
@@ -0,0 +1,204 @@
+"""
+Executors that reconstruction jobs are submitted to.
+
+`get_executor` builds the executor selected by the `executor` settings. The
+"auto", "slurm" and "local" backends are submitit executors. The
+"process-pool" backend runs at most `array_parallelism` jobs at a time in a
+pool of local processes, which import torch once and are reused between
+jobs, and returns jobs that answer the status calls of `monitor_jobs` and
+`jobs_mgmt` like submitit jobs. `recorder daemon` passes its own pool of warm
+processes instead, which outlives the reconstructions submitted to it. Its
+jobs write their output to `<folder>/<job_id>_0_log.out` and `.err`, next to
+where submitit writes the logs of local jobs.
+"""
+
+import contextlib
+import itertools
+import multiprocessing as mp
+import os
+import socket
+import sys
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Optional
+
+import submitit
+
+from recOrder.cli.settings import ExecutorSettings
+
+# Job numbers are unique per process, also between executors that share a
+# pool and a log folder
+_JOB_INDICES = itertools.count()
+
+
+def _run_logged(
+    fn: Callable, args: tuple, kwargs: dict, log_prefix: str
+) -> object:
+    with open(f"{log_prefix}.out", "w") as stdout, open(
+        f"{log_prefix}.err", "w"
+    ) as stderr, contextlib.redirect_stdout(
+        stdout
+    ), contextlib.redirect_stderr(
+        stderr
+    ):
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+
+class ProcessPoolJob:
+    """A job of a `ProcessPoolJobExecutor`, with the status calls of a
+    submitit job."""
+
+    def __init__(self, job_id: str, future: Future, log_prefix: str):
+        self.job_id = job_id
+        self._future = future
+        self._log_prefix = log_prefix
+
+    @property
+    def state(self) -> str:
+        if self._future.cancelled():
+            return "CANCELLED"
+        if self._future.done():
+            if self._future.exception() is not None:
+                return "FAILED"
+            return "COMPLETED"
+        # futures count as running while they wait in the call queue of the
+        # pool, jobs start once a worker opened their log
+        if self._future.running() and os.path.exists(
+            f"{self._log_prefix}.out"
+        ):
+            return "RUNNING"
+        return "PENDING"
+
+    def get_info(self, mode: str = "force") -> dict:
+        node = "" if self.state == "PENDING" else socket.gethostname()
+        return {"State": self.state, "NodeList": node}
+
+    def done(self, force_check: bool = False) -> bool:
+        return self._future.done()
+
+    def result(self):
+        return self._future.result()
+
+    def exception(self) -> Optional[BaseException]:
+        return self._future.exception()
+
+    def cancel(self, check: bool = True) -> None:
+        # running jobs finish, the pool only drops pending ones
+        self._future.cancel()
+
+    def _read_log(self, extension: str) -> Optional[str]:
+        try:
+            with open(f"{self._log_prefix}.{extension}", "r") as file:
+                return file.read()
+        except OSError:
+            return None
+
+    def stdout(self) -> Optional[str]:
+        return self._read_log("out")
+
+    def stderr(self) -> Optional[str]:
+        return self._read_log("err")
+
+
+class ProcessPoolJobExecutor:
+    """Run jobs in a pool of `max_workers` local processes, in the order
+    they are submitted.
+
+    Parameters
+    ----------
+    folder : Path
+        Folder of the job logs
+    max_workers : int, optional
+        Number of jobs running at once, by default None (the number of CPUs)
+    pool : ProcessPoolExecutor, optional
+        Running pool to submit jobs to instead of a new one, by default None
+    """
+
+    cluster = "process-pool"
+
+    def __init__(
+        self,
+        folder: Path,
+        max_workers: int = None,
+        pool: ProcessPoolExecutor = None,
+    ):
+        self.folder = Path(folder)
+        self.folder.mkdir(parents=True, exist_ok=True)
+        if pool is None:
+            pool = ProcessPoolExecutor(
+                max_workers=max_workers, mp_context=mp.get_context("spawn")
+            )
+        self.pool = pool
+
+    @contextlib.contextmanager
+    def batch(self):
+        # jobs start as they are submitted
+        yield
+
+    def submit(self, fn: Callable, *args, **kwargs) -> ProcessPoolJob:
+        # fixed-width ids, so that no id is a prefix of another
+        job_id = f"{os.getpid()}.{next(_JOB_INDICES):06d}"
+        log_prefix = str(self.folder / f"{job_id}_0_log")
+        # a log of an earlier process with the same id would mark the job as
+        # started
+        for extension in ("out", "err"):
+            Path(f"{log_prefix}.{extension}").unlink(missing_ok=True)
+        future = self.pool.submit(_run_logged, fn, args, kwargs, log_prefix)
+        return ProcessPoolJob(job_id, future, log_prefix)
+
+
+def get_executor(
+    executor_settings: ExecutorSettings,
+    folder: Path,
+    num_jobs: int,
+    gb_per_cpu: int,
+    cpus_per_task: int,
+    time_limit_min: int,
+    pool: ProcessPoolExecutor = None,
+):
+    """Executor of the selected backend, with the resources of each job.
+
+    Parameters
+    ----------
+    executor_settings : ExecutorSettings
+    folder : Path
+        Folder of the job logs
+    num_jobs : int
+        Number of jobs that will be submitted
+    gb_per_cpu : int
+        Memory per CPU in GB
+    cpus_per_task : int
+        CPUs per job
+    time_limit_min : int
+        SLURM time limit per job in minutes
+    pool : ProcessPoolExecutor, optional
+        Running pool to submit jobs to instead of the selected backend, by
+        default None
+
+    Returns
+    -------
+    submitit.AutoExecutor or ProcessPoolJobExecutor
+    """
+    if pool is not None:
+        return ProcessPoolJobExecutor(folder, pool=pool)
+    parallelism = min(executor_settings.array_parallelism, num_jobs)
+    if executor_settings.backend == "process-pool":
+        return ProcessPoolJobExecutor(folder, max_workers=parallelism)
+
+    cluster = None
+    if executor_settings.backend != "auto":
+        cluster = executor_settings.backend
+    executor = submitit.AutoExecutor(folder=Path(folder), cluster=cluster)
+    executor.update_parameters(
+        slurm_array_parallelism=parallelism,
+        slurm_mem_per_cpu=f"{gb_per_cpu}G",
+        slurm_cpus_per_task=cpus_per_task,
+        slurm_time=time_limit_min,
+        slurm_partition=executor_settings.partition,
+        timeout_min=executor_settings.local_timeout_min,
+    )
+    return executor
@@ -1,22 +1,150 @@
 import os, json
 from pathlib import Path
+import selectors
 import socket
+import struct
 import submitit
-import threading, time
+import threading
+from typing import Callable
 
 DIR_PATH = os.path.dirname(os.path.realpath(__file__))
 FILE_PATH = os.path.join(DIR_PATH, "main.py")
 
 SERVER_PORT = 8089 # Choose an available port
+DAEMON_PORT = 8090 # Port of the `recorder daemon` reconstruction service
 JOBS_TIMEOUT = 5 # 5 mins
 SERVER_uIDsjobIDs = {} # uIDsjobIDs[uid][jid] = job
 
+# Job states pushed by the CLI client to the GUI as they change
+JOB_SUBMITTED = "submitted"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+
+# Messages are JSON objects framed by their length as a 4-byte unsigned int in
+# network byte order, so a message can span any number of socket reads
+HEADER = struct.Struct("!I")
+MAX_MESSAGE_SIZE = 64 * 2**20 # bytes, larger frames are treated as corrupt
+JOBS_PER_MESSAGE = 1000 # job registrations batched in one message
+
+
+def job_status(job: submitit.Job) -> str:
+    """Map the state of a submitit job to one of the pushed job states."""
+    if not job.done():
+        return JOB_RUNNING if job.state == "RUNNING" else JOB_SUBMITTED
+    try:
+        failed = job.exception() is not None
+    except Exception:
+        failed = True  # e.g. cancelled or killed before writing a result
+    return JOB_FAILED if failed else JOB_DONE
+
+
+def encode_message(message: dict) -> bytes:
+    payload = json.dumps(message).encode()
+    return HEADER.pack(len(payload)) + payload
+
+
+class MessageReader():
+    """Buffer a byte stream and split it into length-prefixed JSON messages.
+
+    `feed` returns the messages completed by `data`, partial messages are kept
+    until the rest arrives. Raises ValueError on a frame over MAX_MESSAGE_SIZE.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data: bytes) -> list[dict]:
+        self.buffer += data
+        messages = []
+        start = 0
+        while len(self.buffer) - start >= HEADER.size:
+            (size,) = HEADER.unpack_from(self.buffer, start)
+            if size > MAX_MESSAGE_SIZE:
+                raise ValueError(f"Message of {size} bytes exceeds MAX_MESSAGE_SIZE")
+            end = start + HEADER.size + size
+            if len(self.buffer) < end:
+                break
+            messages.append(json.loads(self.buffer[start + HEADER.size:end]))
+            start = end
+        del self.buffer[:start]
+        return messages
+
+
+class JobEventListener():
+    """Accept CLI clients and dispatch every message they send to
+    `on_message(message, client_socket)`, all from one thread waiting on
+    `selectors` instead of a thread and polling loop per client.
+
+    Parameters
+    ----------
+    on_message : Callable[[dict, socket.socket], None]
+        Called for each message, from the `serve_forever` thread
+    port : int, optional
+        Port to listen on, 0 picks a free port, by default SERVER_PORT
+    """
+
+    def __init__(self, on_message: Callable, port: int = SERVER_PORT, on_disconnect: Callable = None):
+        self.on_message = on_message
+        self.on_disconnect = on_disconnect # called with each closed client socket
+        self.server_socket = socket.create_server(("localhost", port), backlog=50)
+        self.port = self.server_socket.getsockname()[1]
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.server_socket, selectors.EVENT_READ)
+        self.running = True
+
+    def serve_forever(self):
+        try:
+            while self.running:
+                # the timeout only bounds how long `stop` takes
+                for key, _ in self.selector.select(timeout=0.5):
+                    if key.fileobj is self.server_socket:
+                        client_socket, _ = self.server_socket.accept()
+                        self.selector.register(
+                            client_socket, selectors.EVENT_READ, MessageReader()
+                        )
+                        continue
+                    try:
+                        data = key.fileobj.recv(65536)
+                        messages = key.data.feed(data)
+                    except (OSError, ValueError) as exc:
+                        print(exc.args)
+                        data = b""
+                    if not data:
+                        self.selector.unregister(key.fileobj)
+                        key.fileobj.close()
+                        if self.on_disconnect is not None:
+                            try:
+                                self.on_disconnect(key.fileobj)
+                            except Exception as exc:
+                                print(exc.args)
+                        continue
+                    for message in messages:
+                        try:
+                            self.on_message(message, key.fileobj)
+                        except Exception as exc:
+                            print(exc.args)
+        finally:
+            for key in list(self.selector.get_map().values()):
+                key.fileobj.close()
+            self.selector.close()
+
+    def stop(self):
+        self.running = False
+
+
 class JobsManagement():
+    # A client is created per run, e.g. per request of `recorder daemon`, so
+    # no job or state is shared between runs
     
     def __init__(self, *args, **kwargs):
         self.clientsocket = None
         self.uIDsjobIDs = {} # uIDsjobIDs[uid][jid] = job        
         self.DATA_QUEUE = []
+        self.jobStatuses = {} # jobStatuses[(uid, jid)] = last pushed state
+        self.jobsSent = threading.Event()
+        # written to wake up stop_client() once every job is done
+        self.wakeupReceiver, self.wakeupSender = None, None
         
     def check_for_jobID_File(self, jobID, logs_path, extension="out"):
 
@@ -38,76 +166,99 @@ class JobsManagement():
     def set_shorter_timeout(self):
         self.clientsocket.settimeout(30)
     
-    def start_client(self):
+    def start_client(self, port: int = SERVER_PORT):
         try:
+            self.jobsSent.clear()
+            self.wakeupReceiver, self.wakeupSender = socket.socketpair()
             self.clientsocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             self.clientsocket.settimeout(300)
-            self.clientsocket.connect(('localhost', SERVER_PORT))
+            self.clientsocket.connect(('localhost', port))
             self.clientsocket.settimeout(None)
 
             thread = threading.Thread(target=self.stop_client)
             thread.start()
+            return thread
         except Exception as exc:
             print(exc.args)
 
     # The stopClient() is called right with the startClient() but does not stop 
     # and essentially is a wait thread listening and is triggered by either a 
-    # connection or timeout. Based on condition triggered by user, reconstruction 
+    # command from the GUI or the end of the jobs. Commands are handled as soon
+    # as they arrive (cancel, clientRelease). Job state transitions are pushed
+    # to the GUI by push_status_transitions(), from the monitor_jobs() updates
+    # that already query every job, which wakes this thread up once every job
+    # is done. Based on condition triggered by user, reconstruction 
     # completion or errors the end goal is to close the socket connection which 
     # would let the CLI exit. I could break it down to 2 parts but the idea was to 
     # keep the clientsocket.close() call within one method to make it easier to follow.
     def stop_client(self):
+        selector = selectors.DefaultSelector()
+        reader = MessageReader()
         try:
-            time.sleep(2)
+            selector.register(self.clientsocket, selectors.EVENT_READ)
+            selector.register(self.wakeupReceiver, selectors.EVENT_READ)
             while True:
-                time.sleep(1)
-                buf = ""
-                try:
-                    buf = self.clientsocket.recv(1024)
-                except:
-                    pass
-                if len(buf) > 0:
-                    if b"\n" in buf:
-                        dataList = buf.split(b"\n")
-                        for data in dataList:
-                            if len(data)>0:
-                                decoded_string = data.decode()
-                                json_str = str(decoded_string)
-                                json_obj = json.loads(json_str)
-                                u_idx = json_obj["uID"]
-                                job_idx = str(json_obj["jID"])
-                                cmd = json_obj["command"]
-                                if cmd == "clientRelease":
-                                    if self.has_submitted_job(u_idx, job_idx):
-                                        self.clientsocket.close()
-                                        break
-                                if cmd == "cancel":
-                                    if self.has_submitted_job(u_idx, job_idx):
-                                        try:
-                                            job = self.uIDsjobIDs[u_idx][job_idx]
-                                            job.cancel()
-                                        except Exception as exc:
-                                            pass # possibility of throwing an exception based on diff. OS
-                forDeletions = []
-                for uID in self.uIDsjobIDs.keys():
-                    for jID in self.uIDsjobIDs[uID].keys():
-                        job = self.uIDsjobIDs[uID][jID]
-                        if job.done():
-                            forDeletions.append((uID, jID))
-                for idx in range(len(forDeletions)):
-                    del self.uIDsjobIDs[forDeletions[idx][0]][forDeletions[idx][1]]
-                forDeletions = []
-                for uID in self.uIDsjobIDs.keys():
-                    if len(self.uIDsjobIDs[uID].keys()) == 0:                        
-                        forDeletions.append(uID)
-                for idx in range(len(forDeletions)):
-                    del self.uIDsjobIDs[forDeletions[idx]]
-                if len(self.uIDsjobIDs.keys()) == 0:
-                    self.clientsocket.close()
-                    break
+                for key, _ in selector.select():
+                    if key.fileobj is self.wakeupReceiver:
+                        return  # every job is done and its state was pushed
+                    data = self.clientsocket.recv(65536)
+                    if len(data) == 0:
+                        return  # the GUI closed the connection
+                    for json_obj in reader.feed(data):
+                        u_idx = json_obj["uID"]
+                        job_idx = str(json_obj["jID"])
+                        cmd = json_obj["command"]
+                        if cmd == "clientRelease":
+                            if self.has_submitted_job(u_idx, job_idx):
+                                return
+                        if cmd == "cancel":
+                            if self.has_submitted_job(u_idx, job_idx):
+                                try:
+                                    job = self.uIDsjobIDs[u_idx][job_idx]
+                                    job.cancel()
+                                except Exception as exc:
+                                    print(exc.args) # possibility of throwing an exception based on diff. OS
         except Exception as exc:
-            self.clientsocket.close()
             print(exc.args)
+        finally:
+            selector.close()
+            self.clientsocket.close()
+            self.wakeupReceiver.close()
+            self.wakeupSender.close()
+
+    def push_status_transitions(self, job_states, changed):
+        # Called by monitor_jobs() with its JobStates and the indices of the
+        # jobs whose state changed in its last update. Sends their new state
+        # and forgets the finished jobs.
+        self.jobsSent.wait() # the GUI learns about the jobs before their states
+        messages = []
+        for i in changed:
+            job = job_states.jobs[i]
+            jID = str(job.job_id)
+            uIDs = [uID for uID in self.uIDsjobIDs.keys() if jID in self.uIDsjobIDs[uID]]
+            if len(uIDs) == 0:
+                continue # not registered with the GUI
+            uID = uIDs[0]
+            if job_states.done[i]:
+                status = job_status(job)
+            elif job_states.state(i) == "RUNNING":
+                status = JOB_RUNNING
+            else:
+                status = JOB_SUBMITTED
+            if self.jobStatuses.get((uID, jID), JOB_SUBMITTED) != status:
+                self.jobStatuses[(uID, jID)] = status
+                messages.append({"uID": uID, "jID": jID, "status": status})
+            if status in (JOB_DONE, JOB_FAILED):
+                del self.uIDsjobIDs[uID][jID]
+                if len(self.uIDsjobIDs[uID].keys()) == 0:
+                    del self.uIDsjobIDs[uID]
+        try:
+            if len(messages) > 0:
+                self.clientsocket.sendall(b"".join(map(encode_message, messages)))
+            if len(self.uIDsjobIDs.keys()) == 0:
+                self.wakeupSender.send(b"\0")
+        except Exception as exc:
+            print(exc.args) # the GUI released or closed the connection
 
     def check_all_ExpJobs_completion(self, uID):
         if uID in SERVER_uIDsjobIDs.keys():
@@ -133,9 +284,16 @@ class JobsManagement():
         thread.start()
 
     def send_data(self):
-        data = "".join(self.DATA_QUEUE)
-        self.clientsocket.send(data.encode())
-        self.DATA_QUEUE = []
+        # register the queued jobs in batches of JOBS_PER_MESSAGE
+        jobs, self.DATA_QUEUE = self.DATA_QUEUE, []
+        data = b"".join(
+            encode_message({"jobs": jobs[i:i + JOBS_PER_MESSAGE]})
+            for i in range(0, len(jobs), JOBS_PER_MESSAGE)
+        )
+        try:
+            self.clientsocket.sendall(data)
+        finally:
+            self.jobsSent.set() # also on errors, so states are not held back
 
     def put_Job_in_list(self, job, uID: str, jID: str, well:str, log_folder_path:str="", mode="client"):
         try:
@@ -151,9 +309,7 @@ class JobsManagement():
                 else:
                     if jID not in self.uIDsjobIDs[uID].keys():
                         self.uIDsjobIDs[uID][jID] = job
-                json_obj = {uID:{"jID": str(jID), "pos": well, "log": log_folder_path}}
-                json_str = json.dumps(json_obj)+"\n"                
-                self.add_data(json_str)
+                self.add_data({"uID": uID, "jID": jID, "pos": well, "log": log_folder_path})
             else:
                 # from server side jobs object entry is a None object
                 # this will be later checked as completion boolean for a ExpID which might
@@ -0,0 +1,87 @@
+"""
+Per-time-point completion ledger of reconstructed positions.
+
+Once a time point of a position is written, an empty marker file
+`<output_position_dirpath>/.completed/<key>/<t>` is created. Creating a file
+is atomic, and each (position, t) pair has its own file, so parallel jobs and
+worker processes writing the same position never update a shared file. The
+key hashes the reconstruction settings that change the written values,
+together with the output channel names. A rerun with other such settings
+therefore does not count time points written with the old settings as done,
+while a rerun that only changes the I/O, batching, storage or executor
+settings resumes.
+`--resume` reconstructs only the time points without a marker.
+"""
+
+import hashlib
+import json
+from pathlib import Path
+
+from recOrder.cli.settings import ReconstructionSettings
+
+LEDGER_DIRNAME = ".completed"
+
+# Settings that do not change the written values, in the nested `exclude`
+# format of `BaseModel.dict`. Batched time points match single ones up to
+# floating-point rounding, and a resumed run writes into the arrays, chunks
+# and codecs of the first run. Tiles stay in the key, since 3D phase and
+# fluorescence tiles are blended at their seams.
+_KEY_EXCLUDE = {
+    "time_indices": True,
+    "executor": True,
+    "processing": {"prefetch_depth", "time_batch_size"},
+    "output": {
+        "chunks",
+        "target_chunk_mb",
+        "compression",
+        "compression_level",
+    },
+}
+
+
+def ledger_key(
+    settings: ReconstructionSettings, output_channel_names: list[str]
+) -> str:
+    """Hash of everything the written time points depend on, except the
+    input data."""
+    key = {
+        "settings": settings.dict(exclude=_KEY_EXCLUDE),
+        "output_channel_names": list(output_channel_names),
+    }
+    canonical_json = json.dumps(key, sort_keys=True, default=str)
+    return hashlib.sha256(canonical_json.encode()).hexdigest()[:32]
+
+
+class CompletionLedger:
+    """Completed time points of one output position and reconstruction.
+
+    Parameters
+    ----------
+    output_position_dirpath : Path
+        Output position path
+    key : str
+        See `ledger_key`
+    """
+
+    def __init__(self, output_position_dirpath: Path, key: str):
+        self.dirpath = Path(output_position_dirpath) / LEDGER_DIRNAME / key
+
+    def record(self, time_indices: list[int]) -> None:
+        """Mark time points as written."""
+        self.dirpath.mkdir(parents=True, exist_ok=True)
+        for t_idx in time_indices:
+            (self.dirpath / str(int(t_idx))).touch()
+
+    def completed(self) -> set[int]:
+        if not self.dirpath.exists():
+            return set()
+        return {
+            int(path.name)
+            for path in self.dirpath.iterdir()
+            if path.name.isdigit()
+        }
+
+    def remaining(self, time_indices: list[int]) -> list[int]:
+        """The time points of `time_indices` that are not written yet."""
+        completed = self.completed()
+        return [t_idx for t_idx in time_indices if t_idx not in completed]
@@ -1,33 +1,106 @@
+import importlib
+import importlib.util
+
 import click
 
-from recOrder.cli.apply_inverse_transfer_function import apply_inv_tf
-from recOrder.cli.compute_transfer_function import compute_tf
-from recOrder.cli.reconstruct import reconstruct
-try:
-    from recOrder.cli.gui_widget import gui
-except:pass
+CONTEXT = {"help_option_names": ["-h", "--help"]}
+
+# Subcommands are imported only when they run, so that `recorder -h` and
+# the subprocesses started by the GUI do not import torch, waveorder or Qt
+# before they need them. The help text is listed here for `recorder -h`.
+# `recorder -h` will show subcommands in this order.
+LAZY_SUBCOMMANDS = {
+    "reconstruct": (
+        "recOrder.cli.reconstruct",
+        "reconstruct",
+        "Reconstruct a dataset using a configuration file.",
+    ),
+    "compute-tf": (
+        "recOrder.cli.compute_transfer_function",
+        "compute_tf",
+        "Compute a transfer function using a dataset and configuration file.",
+    ),
+    "apply-inv-tf": (
+        "recOrder.cli.apply_inverse_transfer_function",
+        "apply_inv_tf",
+        "Apply an inverse transfer function to a dataset using a "
+        "configuration file.",
+    ),
+    "tf-cache": (
+        "recOrder.cli.tf_cache",
+        "tf_cache",
+        "Inspect and prune the on-disk transfer function cache.",
+    ),
+    "daemon": (
+        "recOrder.cli.daemon",
+        "daemon",
+        "Run a local reconstruction service that keeps reconstruction "
+        "dependencies loaded between jobs.",
+    ),
+    "gui": (
+        "recOrder.cli.gui_widget",
+        "gui",
+        "GUI for recOrder: Computational Toolkit for Label-Free Imaging",
+    ),
+}
 
+QT_BINDINGS = ("PyQt5", "PyQt6", "PySide2", "PySide6")
+GUI_INSTALL_HINT = (
+    "The recOrder GUI needs napari and a Qt binding. Install them with "
+    "`pip install recOrder-napari[all]`."
+)
 
-CONTEXT = {"help_option_names": ["-h", "--help"]}
 
+def _gui_available() -> bool:
+    # find_spec locates the packages without importing them
+    return importlib.util.find_spec("napari") is not None and any(
+        importlib.util.find_spec(name) for name in QT_BINDINGS
+    )
 
-# `recorder -h` will show subcommands in the order they are added
-class NaturalOrderGroup(click.Group):
+
+class LazyGroup(click.Group):
     def list_commands(self, ctx):
-        return self.commands.keys()
+        return [
+            name
+            for name in LAZY_SUBCOMMANDS
+            if name != "gui" or _gui_available()
+        ]
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name == "gui" and not _gui_available():
+            raise click.UsageError(GUI_INSTALL_HINT, ctx)
+        if cmd_name not in self.list_commands(ctx):
+            return None
+        module_name, command_name, _ = LAZY_SUBCOMMANDS[cmd_name]
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError as exc:
+            if cmd_name != "gui":
+                raise
+            raise click.UsageError(f"{exc}. {GUI_INSTALL_HINT}", ctx)
+        return getattr(module, command_name)
 
+    def format_commands(self, ctx, formatter):
+        # Same layout as click.Group, without importing the subcommands
+        names = self.list_commands(ctx)
+        limit = formatter.width - 6 - max(len(name) for name in names)
+        rows = [
+            (
+                name,
+                click.Command(
+                    name, help=LAZY_SUBCOMMANDS[name][2]
+                ).get_short_help_str(limit),
+            )
+            for name in names
+        ]
+        with formatter.section("Commands"):
+            formatter.write_dl(rows)
 
-@click.group(context_settings=CONTEXT, cls=NaturalOrderGroup)
+
+@click.group(context_settings=CONTEXT, cls=LazyGroup)
 def cli():
     """\033[92mrecOrder: Computational Toolkit for Label-Free Imaging\033[0m\n"""
 
 
-cli.add_command(reconstruct)
-cli.add_command(compute_tf)
-cli.add_command(apply_inv_tf)
-try:
-    cli.add_command(gui)
-except:pass
-
 if __name__ == "__main__":
     cli()
@@ -1,144 +1,453 @@
+from collections import Counter
+from datetime import datetime
 from pathlib import Path
+from typing import Callable, Optional
 
+import csv
+import json
 import time
 import numpy as np
 import shutil
 import submitit
 import sys
 
+from recOrder.cli.sharding import shard_label, time_points_label
 
-def _move_cursor_up(n_lines, do_print=True):
-    if do_print:
-        sys.stdout.write("\033[F" * n_lines)
+# Status updates start every MIN_INTERVAL seconds. For jobs queried through a
+# scheduler the interval doubles up to MAX_INTERVAL while no job changes state
+MIN_INTERVAL = 1
+MAX_INTERVAL = 30
 
+NON_JOB_LINES = 3
+COLUMNS = [15, 35, 45, 55]
 
-def _print_status(jobs, position_dirpaths, elapsed_list, print_indices=None, do_print=True):
 
-    columns = [15, 30, 40, 50]
-
-    # header
-    if do_print:
-        sys.stdout.write(
-            "\033[K"  # clear line
-            "\033[96mID"  # cyan
-            f"\033[{columns[0]}G WELL "
-            f"\033[{columns[1]}G STATUS "
-            f"\033[{columns[2]}G NODE "
-            f"\033[{columns[2]}G ELAPSED\n"
-        )
-
-    if print_indices is None:
-        print_indices = range(len(jobs))
-
-    complete_count = 0
-
-    for i, (job, position_dirpath) in enumerate(zip(jobs, position_dirpaths)):
-        try:
-            node_name = job.get_info()["NodeList"]  # slowest, so do this first
-        except:
-            node_name = "SUBMITTED"
-
-        if job.state == "COMPLETED":
-            color = "\033[32m"  # green
-            complete_count += 1
-        elif job.state == "RUNNING":
-            color = "\033[93m"  # yellow
-            elapsed_list[i] += 1  # inexact timing
-        else:
-            color = "\033[91m"  # red
-        
-        if i in print_indices:
-            if do_print:
-                sys.stdout.write(
-                    f"\033[K"  # clear line
-                    f"{color}{job.job_id}"
-                    f"\033[{columns[0]}G {'/'.join(position_dirpath.parts[-3:])}"
-                    f"\033[{columns[1]}G {job.state}"
-                    f"\033[{columns[2]}G {node_name}"
-                    f"\033[{columns[3]}G {elapsed_list[i]} s\n"
-                )
-    sys.stdout.flush()
-    if do_print:
-        print(
-            f"\033[32m{complete_count}/{len(jobs)} jobs complete. " 
-            "<ctrl+z> to move monitor to background. " 
-            "<ctrl+c> twice to cancel jobs."
-        )
-
-    return elapsed_list
+def _batched_watcher(job: submitit.Job):
+    """The watcher that queries the scheduler for all of its registered jobs
+    at once (e.g. one `sacct` call for every slurm job), None for jobs that
+    report their own state like local jobs."""
+    if type(job).get_info is submitit.Job.get_info:
+        return job.watcher
+    return None
 
 
-def _get_jobs_to_print(jobs, num_to_print):
-    job_indices_to_print = []
-
-    # if number of jobs is smaller than termanal size, print all
-    if len(jobs) <= num_to_print:
-        return list(range(len(jobs)))
+def _reported_times(job: submitit.Job) -> Optional[tuple[float, float]]:
+    """Start and end times a finished job returned with its result, None for
+    failed jobs and results without them."""
+    paths = getattr(job, "paths", None)
+    if paths is not None and not paths.result_pickle.exists():
+        # `job.result()` would wait for a result file that may never come
+        return None
+    try:
+        result = job.result()
+    except Exception:
+        return None
+    if isinstance(result, dict) and {"start_time", "end_time"} <= set(result):
+        return result["start_time"], result["end_time"]
+    return None
 
-    # prioritize incomplete jobs
-    for i, job in enumerate(jobs):
-        if not job.done():
-            job_indices_to_print.append(i)
-        if len(job_indices_to_print) == num_to_print:
-            return job_indices_to_print
 
-    # fill in the rest with complete jobs
-    for i, job in enumerate(jobs):
-        job_indices_to_print.append(i)
-        if len(job_indices_to_print) == num_to_print:
-            return job_indices_to_print
+class JobStates:
+    """Compact state of a list of jobs.
 
-    # shouldn't reach here
-    return job_indices_to_print
+    Each update queries each scheduler once for all jobs, instead of calling
+    `job.get_info()` per job, which forces a scheduler call for every job.
+    Finished jobs are not queried again. Start and end times are the
+    wall-clock times a finished job returned with its result, like
+    `apply_inverse_transfer_function_single_position` does. Jobs that failed
+    or return no times fall back to the times of the update that first saw
+    them running and done, which are accurate to one update interval.
 
+    Parameters
+    ----------
+    jobs : list[submitit.Job]
+        List of submitit jobs
+    time_indices : list[Optional[list[int]]], optional
+        Time indices reconstructed by each job, None for whole-position jobs,
+        by default None
+    """
 
-def monitor_jobs(jobs: list[submitit.Job], position_dirpaths: list[Path], do_print=True):
+    def __init__(
+        self,
+        jobs: list[submitit.Job],
+        time_indices: list[Optional[list[int]]] = None,
+    ):
+        self.jobs = jobs
+        if time_indices is None:
+            time_indices = [None] * len(jobs)
+        # time points per job, unknown (NaN) for whole-position jobs
+        self.num_time_points = np.array(
+            [np.nan if t is None else len(t) for t in time_indices]
+        )
+        self.watchers = [_batched_watcher(job) for job in jobs]
+        self.queries_scheduler = any(w is not None for w in self.watchers)
+        # state names, indexed by the per-job `codes`
+        self.names = ["SUBMITTED"]
+        self.codes = np.zeros(len(jobs), dtype=np.uint16)
+        self.nodes = np.full(len(jobs), "", dtype=object)
+        self.done = np.zeros(len(jobs), dtype=bool)
+        # wall-clock times a job started and ended, or was first seen
+        # running and done until it reports them
+        self.start_times = np.full(len(jobs), np.nan)
+        self.end_times = np.full(len(jobs), np.nan)
+        self.monitor_start_time = time.time()
+        self.last_update_time = self.monitor_start_time
+
+    def _code(self, state: str) -> int:
+        if state not in self.names:
+            self.names.append(state)
+        return self.names.index(state)
+
+    def update(self) -> np.ndarray:
+        """Query the state of the unfinished jobs.
+
+        Returns
+        -------
+        np.ndarray
+            Indices of the jobs whose state changed
+        """
+        pending = np.flatnonzero(~self.done)
+        watchers = {
+            id(self.watchers[i]): self.watchers[i]
+            for i in pending
+            if self.watchers[i] is not None
+        }
+        for watcher in watchers.values():
+            watcher.update()
+
+        now = time.time()
+        changed = []
+        for i in pending:
+            job, watcher = self.jobs[i], self.watchers[i]
+            try:
+                if watcher is not None:
+                    info = watcher.get_info(job.job_id, mode="cache")
+                    state = watcher.get_state(job.job_id, mode="cache")
+                    # the result file also marks jobs the scheduler
+                    # failed to report, like `job.done()`
+                    done = (
+                        watcher.is_done(job.job_id, mode="cache")
+                        or job.paths.result_pickle.exists()
+                    )
+                else:
+                    info = job.get_info()
+                    state = job.state
+                    done = job.done()
+            except Exception:
+                continue  # keep the last known state
+            code = self._code(state)
+            node = info.get("NodeList", "")
+            if (code, node, done) == (
+                self.codes[i],
+                self.nodes[i],
+                self.done[i],
+            ):
+                continue
+            if state == "RUNNING" and np.isnan(self.start_times[i]):
+                self.start_times[i] = now
+            if done and np.isnan(self.start_times[i]):
+                # started and finished between two updates
+                self.start_times[i] = self.last_update_time
+            if done:
+                self.done[i] = True
+                self.end_times[i] = now
+                reported_times = _reported_times(job)
+                if reported_times is not None:
+                    self.start_times[i], self.end_times[i] = reported_times
+            self.codes[i] = code
+            self.nodes[i] = node
+            changed.append(i)
+        self.last_update_time = now
+        return np.array(changed, dtype=int)
+
+    def state(self, i: int) -> str:
+        return self.names[self.codes[i]]
+
+    def elapsed(self, i: int, now: float) -> float:
+        """Seconds job `i` has been running, 0 before it starts."""
+        if np.isnan(self.start_times[i]):
+            return 0.0
+        end = self.end_times[i] if self.done[i] else now
+        return end - self.start_times[i]
+
+    def jobs_per_hour(self, now: float, jobs: np.ndarray = None) -> float:
+        """Finished jobs per hour since the monitor started, of all jobs or
+        of the `jobs` mask."""
+        if jobs is None:
+            jobs = np.ones(len(self.jobs), dtype=bool)
+        hours = (now - self.monitor_start_time) / 3600
+        return np.count_nonzero(self.done & jobs) / hours if hours > 0 else 0.0
+
+    def time_points_per_hour(
+        self, now: float, jobs: np.ndarray = None
+    ) -> Optional[float]:
+        """Time points of finished jobs per hour since the monitor started,
+        None unless every job reconstructs a shard of known time points.
+
+        With shards a job is a fraction of a position, so jobs per hour
+        overstate the throughput of positions.
+        """
+        if len(self.jobs) == 0 or np.isnan(self.num_time_points).any():
+            return None
+        if jobs is None:
+            jobs = np.ones(len(self.jobs), dtype=bool)
+        hours = (now - self.monitor_start_time) / 3600
+        num_done = self.num_time_points[self.done & jobs].sum()
+        return float(num_done / hours) if hours > 0 else 0.0
+
+    def eta(self, now: float) -> Optional[float]:
+        """Seconds until the remaining jobs finish at the current
+        throughput, None before the first job finishes."""
+        rate = self.jobs_per_hour(now)
+        if rate == 0:
+            return None
+        return np.count_nonzero(~self.done) / rate * 3600
+
+    def node_throughput(self, now: float) -> dict:
+        """Finished jobs, jobs and time points per hour and mean job
+        duration per node."""
+        nodes = {}
+        for node in sorted(set(self.nodes[self.done])):
+            on_node = self.done & (self.nodes == node)
+            durations = self.end_times[on_node] - self.start_times[on_node]
+            nodes[node or "unknown"] = {
+                "jobs": int(np.count_nonzero(on_node)),
+                "jobs_per_hour": self.jobs_per_hour(now, on_node),
+                "time_points_per_hour": self.time_points_per_hour(
+                    now, on_node
+                ),
+                "mean_job_s": float(np.mean(durations)),
+            }
+        return nodes
+
+
+def _format_header():
+    return (
+        "\033[96mID"  # cyan
+        f"\033[{COLUMNS[0]}G WELL "
+        f"\033[{COLUMNS[1]}G STATUS "
+        f"\033[{COLUMNS[2]}G NODE "
+        f"\033[{COLUMNS[3]}G ELAPSED"
+    )
+
+
+def _format_row(job_states: JobStates, i: int, label: str, now):
+    state = job_states.state(i)
+    if state in ("COMPLETED", "FINISHED"):
+        color = "\033[32m"  # green
+    elif state == "RUNNING":
+        color = "\033[93m"  # yellow
+    else:
+        color = "\033[91m"  # red
+    node_name = job_states.nodes[i] or "-"
+    return (
+        f"{color}{job_states.jobs[i].job_id}"
+        f"\033[{COLUMNS[0]}G {label}"
+        f"\033[{COLUMNS[1]}G {state}"
+        f"\033[{COLUMNS[2]}G {node_name}"
+        f"\033[{COLUMNS[3]}G {job_states.elapsed(i, now):.0f} s"
+    )
+
+
+def _format_duration(seconds: float) -> str:
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def _format_footer(job_states: JobStates, now: float):
+    throughput = ""
+    eta = job_states.eta(now)
+    if eta is not None:
+        throughput = f"{job_states.jobs_per_hour(now):.1f} jobs/h, "
+        time_points_per_hour = job_states.time_points_per_hour(now)
+        if time_points_per_hour is not None:
+            throughput += f"{time_points_per_hour:.1f} time points/h, "
+        throughput += f"ETA {_format_duration(eta)}. "
+    return (
+        f"\033[32m{np.count_nonzero(job_states.done)}/{len(job_states.jobs)} "
+        "jobs complete. "
+        f"{throughput}"
+        "<ctrl+z> to move monitor to background. "
+        "<ctrl+c> twice to cancel jobs."
+    )
+
+
+def _isoformat(timestamp: float) -> Optional[str]:
+    if np.isnan(timestamp):
+        return None
+    return datetime.fromtimestamp(timestamp).isoformat(timespec="seconds")
+
+
+def run_report(
+    job_states: JobStates,
+    position_dirpaths: list[Path],
+    time_indices: list[Optional[list[int]]] = None,
+) -> dict:
+    """Summary of a monitored run with one entry per job."""
+    now = time.time()
+    if time_indices is None:
+        time_indices = [None] * len(position_dirpaths)
+    return {
+        "start": _isoformat(job_states.monitor_start_time),
+        "end": _isoformat(now),
+        "wall_time_s": now - job_states.monitor_start_time,
+        "num_jobs": len(job_states.jobs),
+        "num_done": int(np.count_nonzero(job_states.done)),
+        "states": dict(
+            Counter(job_states.state(i) for i in range(len(job_states.jobs)))
+        ),
+        "jobs_per_hour": job_states.jobs_per_hour(now),
+        "time_points_per_hour": job_states.time_points_per_hour(now),
+        "nodes": job_states.node_throughput(now),
+        "jobs": [
+            {
+                "job_id": str(job.job_id),
+                "position": "/".join(position_dirpath.parts[-3:]),
+                "time_points": (
+                    "all"
+                    if job_time_indices is None
+                    else time_points_label(job_time_indices)
+                ),
+                "state": job_states.state(i),
+                "node": job_states.nodes[i],
+                "start": _isoformat(job_states.start_times[i]),
+                "end": _isoformat(job_states.end_times[i]),
+                "elapsed_s": job_states.elapsed(i, now),
+            }
+            for i, (job, position_dirpath, job_time_indices) in enumerate(
+                zip(job_states.jobs, position_dirpaths, time_indices)
+            )
+        ],
+    }
+
+
+def write_run_report(report: dict, report_filepath: Path):
+    """Write a run report as JSON to `report_filepath`, and its jobs as a CSV
+    table next to it."""
+    report_filepath = Path(report_filepath)
+    with open(report_filepath, "w") as file:
+        json.dump(report, file, indent=4)
+    with open(report_filepath.with_suffix(".csv"), "w", newline="") as file:
+        fieldnames = list(report["jobs"][0]) if report["jobs"] else []
+        writer = csv.DictWriter(file, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(report["jobs"])
+
+
+class _StatusDisplay:
+    """Draws a block of lines and then rewrites only the lines that changed,
+    in a single write per update."""
+
+    def __init__(self):
+        self.lines = []
+
+    def draw(self, lines: list[str]):
+        if len(lines) != len(self.lines):
+            # first draw or the terminal was resized, redraw everything
+            self.lines = []
+        output = []
+        if self.lines:
+            output.append(f"\033[{len(self.lines)}F")  # to the first line
+        for line_idx, line in enumerate(lines):
+            if self.lines and self.lines[line_idx] == line:
+                output.append("\033[1E")  # next line
+            else:
+                output.append(f"\033[K{line}\n")  # clear line and write
+        self.lines = lines
+        sys.stdout.write("".join(output))
+        sys.stdout.flush()
+
+
+def _get_jobs_to_print(job_states: JobStates, num_to_print: int) -> np.ndarray:
+    # prioritize incomplete jobs, then fill in the rest with complete jobs
+    return np.concatenate(
+        [np.flatnonzero(~job_states.done), np.flatnonzero(job_states.done)]
+    )[:num_to_print]
+
+
+def _status_lines(job_states, labels, job_indices, now):
+    return (
+        [_format_header()]
+        + [_format_row(job_states, i, labels[i], now) for i in job_indices]
+        + [_format_footer(job_states, now)]
+    )
+
+
+def monitor_jobs(
+    jobs: list[submitit.Job],
+    position_dirpaths: list[Path],
+    do_print=True,
+    report_filepath: Path = None,
+    time_indices: list[Optional[list[int]]] = None,
+    on_update: Optional[Callable[[JobStates, np.ndarray], None]] = None,
+):
     """Displays the status of a list of submitit jobs with corresponding paths.
 
+    The jobs are queried with one scheduler call per update. Updates run
+    every MIN_INTERVAL seconds, and slow down to MAX_INTERVAL seconds while
+    no scheduler job changes state.
+
     Parameters
     ----------
     jobs : list[submitit.Job]
         List of submitit jobs
     position_dirpaths : list[Path]
         List of corresponding position paths
+    do_print : bool, optional
+        Print the job status, by default True
+    report_filepath : Path, optional
+        Write a JSON run report with job timestamps and throughput per node
+        to this path, and a CSV table of the jobs next to it, by default None
+    time_indices : list[Optional[list[int]]], optional
+        Time indices reconstructed by each job when positions are split into
+        jobs of time points, None for whole-position jobs, by default None
+    on_update : Callable[[JobStates, np.ndarray], None], optional
+        Called with the job states and the indices of the jobs whose state
+        changed, after every update that changed a job, e.g. to push the
+        changes to the GUI, by default None
     """
-    NON_JOB_LINES = 3
-
     if not len(jobs) == len(position_dirpaths):
         raise ValueError(
             "The number of jobs and position_dirpaths should be the same."
         )
 
-    elapsed_list = [0] * len(jobs)  # timer for each job
+    if time_indices is None:
+        time_indices = [None] * len(jobs)
+    labels = [
+        shard_label(position_dirpath, job_time_indices)
+        for position_dirpath, job_time_indices in zip(
+            position_dirpaths, time_indices
+        )
+    ]
 
-    # print all jobs once if terminal is too small
-    if shutil.get_terminal_size().lines - NON_JOB_LINES < len(jobs):
-        _print_status(jobs, position_dirpaths, elapsed_list, do_print)
+    job_states = JobStates(jobs, time_indices)
+    display = _StatusDisplay()
+    interval = MIN_INTERVAL
 
     # main monitor loop
     try:
-        while not all(job.done() for job in jobs):
-            terminal_lines = shutil.get_terminal_size().lines
-            num_jobs_to_print = np.min(
-                [terminal_lines - NON_JOB_LINES, len(jobs)]
-            )
-
-            job_indices_to_print = _get_jobs_to_print(jobs, num_jobs_to_print)
+        while True:
+            changed = job_states.update()
+            if on_update is not None and len(changed) > 0:
+                on_update(job_states, changed)
+            if len(changed) > 0 or not job_states.queries_scheduler:
+                interval = MIN_INTERVAL
+            else:
+                interval = min(2 * interval, MAX_INTERVAL)
 
-            elapsed_list = _print_status(
-                jobs,
-                position_dirpaths,
-                elapsed_list,
-                job_indices_to_print,
-                do_print,
-            )
-
-            time.sleep(1)
-            _move_cursor_up(num_jobs_to_print + 2, do_print)
+            if do_print:
+                num_jobs_to_print = max(
+                    0, shutil.get_terminal_size().lines - NON_JOB_LINES
+                )
+                job_indices = _get_jobs_to_print(job_states, num_jobs_to_print)
+                display.draw(
+                    _status_lines(job_states, labels, job_indices, time.time())
+                )
 
-        # Print final status
-        time.sleep(1)
-        _print_status(jobs, position_dirpaths, elapsed_list, do_print=do_print)
+            if job_states.done.all():
+                break
+            time.sleep(interval)
 
     # cancel jobs if ctrl+c
     except KeyboardInterrupt:
@@ -146,14 +455,19 @@ def monitor_jobs(jobs: list[submitit.Job], position_dirpaths: list[Path], do_pri
             job.cancel()
         print("All jobs cancelled.\033[97m")
 
+    if report_filepath is not None:
+        write_run_report(
+            run_report(job_states, position_dirpaths, time_indices),
+            report_filepath,
+        )
+
     # Print STDOUT and STDERR for first incomplete job
-    incomplete_count = 0
-    for job in jobs:
-        if not job.done():
-            if incomplete_count == 0:
-                print("\033[32mSTDOUT")
-                print(job.stdout())
-                print("\033[91mSTDERR")
-                print(job.stderr())
-
-    print("\033[97m") # print white
+    incomplete = np.flatnonzero(~job_states.done)
+    if len(incomplete) > 0:
+        job = jobs[incomplete[0]]
+        print("\033[32mSTDOUT")
+        print(job.stdout())
+        print("\033[91mSTDERR")
+        print(job.stderr())
+
+    print("\033[97m")  # print white
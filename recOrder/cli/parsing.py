@@ -1,27 +1,82 @@
+import json
+import multiprocessing as mp
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Callable
+from typing import Callable, Optional
 
 import click
-import torch.multiprocessing as mp
-from iohub.ngff import Plate, open_ome_zarr
 from natsort import natsorted
 
 from recOrder.cli.option_eat_all import OptionEatAll
 
 
+def _read_zattrs(path: Path) -> dict:
+    try:
+        with open(path / ".zattrs") as file:
+            return json.load(file)
+    except (FileNotFoundError, NotADirectoryError):
+        return {}
+
+
+def _read_plate_position_paths(plate_path: Path) -> Optional[list[str]]:
+    # Read the plate structure from the plate and well metadata only,
+    # returns None if the path is not a plate
+    zattrs = _read_zattrs(plate_path)
+    if "plate" not in zattrs:
+        return None
+    well_paths = [well["path"] for well in zattrs["plate"]["wells"]]
+    with ThreadPoolExecutor() as executor:
+        well_zattrs = executor.map(
+            lambda well_path: _read_zattrs(plate_path / well_path), well_paths
+        )
+        return [
+            f"{well_path}/{image['path']}"
+            for well_path, zattrs in zip(well_paths, well_zattrs)
+            for image in zattrs.get("well", {}).get("images", [])
+        ]
+
+
 def _validate_and_process_paths(
     ctx: click.Context, opt: click.Option, value: str
 ) -> list[Path]:
-    # Sort and validate the input paths, expanding plates into lists of positions
+    # Sort and validate the input paths, expanding plates into lists of positions.
+    # Only .zattrs metadata is read, concurrently, and the structure of each
+    # plate is read once, so that thousands of positions validate quickly
     input_paths = [Path(path) for path in natsorted(value)]
-    for path in input_paths:
-        with open_ome_zarr(path, mode="r") as dataset:
-            if isinstance(dataset, Plate):
-                plate_path = input_paths.pop()
-                for position in dataset.positions():
-                    input_paths.append(plate_path / position[0])
+    plate_paths = {
+        path.parents[2] for path in input_paths if len(path.parents) > 2
+    }
+
+    with ThreadPoolExecutor() as executor:
+        plate_position_paths = {
+            plate_path: set(position_paths)
+            for plate_path, position_paths in zip(
+                plate_paths,
+                executor.map(_read_plate_position_paths, plate_paths),
+            )
+            if position_paths is not None
+        }
+
+        def expand(path: Path) -> list[Path]:
+            # Positions listed in their plate's metadata are valid
+            if len(path.parents) > 2:
+                plate_path = path.parents[2]
+                if path.relative_to(plate_path).as_posix() in (
+                    plate_position_paths.get(plate_path, ())
+                ):
+                    return [path]
+            position_paths = _read_plate_position_paths(path)
+            if position_paths is not None:
+                return [path / name for name in natsorted(position_paths)]
+            if "multiscales" in _read_zattrs(path):
+                return [path]
+            raise click.BadParameter(
+                f"{path} is not an OME-Zarr plate or position."
+            )
+
+        expanded_paths = list(executor.map(expand, input_paths))
 
-    return input_paths
+    return [path for paths in expanded_paths for path in paths]
 
 
 def _str_to_path(ctx: click.Context, opt: click.Option, value: str) -> Path:
@@ -120,6 +175,67 @@ def ram_multiplier() -> Callable:
 
     return decorator
 
+
+def use_tf_cache() -> Callable:
+    def decorator(f: Callable) -> Callable:
+        return click.option(
+            "--tf-cache/--no-tf-cache",
+            "use_tf_cache",
+            default=False,
+            help="Reuse a transfer function from the on-disk cache when the settings and data shape match. See `recorder tf-cache`.",
+        )(f)
+
+    return decorator
+
+
+def calibrate() -> Callable:
+    def decorator(f: Callable) -> Callable:
+        return click.option(
+            "--calibrate",
+            is_flag=True,
+            default=False,
+            help="Size SLURM memory, CPUs and time from a local reconstruction of the first time point, cached per settings.",
+        )(f)
+
+    return decorator
+
+
+def job_minutes() -> Callable:
+    def decorator(f: Callable) -> Callable:
+        return click.option(
+            "--job-minutes",
+            default=None,
+            type=click.FloatRange(min=0, min_open=True),
+            help="Split each position into jobs of time points that take about this many minutes, timed as with --calibrate. By default each position is one job.",
+        )(f)
+
+    return decorator
+
+
+def run_report() -> Callable:
+    def decorator(f: Callable) -> Callable:
+        return click.option(
+            "--run-report",
+            is_flag=True,
+            default=False,
+            help="Write a JSON and CSV report of job timestamps and throughput per node next to the ./output_logs folder.",
+        )(f)
+
+    return decorator
+
+
+def resume() -> Callable:
+    def decorator(f: Callable) -> Callable:
+        return click.option(
+            "--resume",
+            is_flag=True,
+            default=False,
+            help="Skip the time points that a previous run with the same settings already wrote to ./output.zarr.",
+        )(f)
+
+    return decorator
+
+
 def unique_id() -> Callable:
     def decorator(f: Callable) -> Callable:
         return click.option(
@@ -131,4 +247,4 @@ def unique_id() -> Callable:
             help="Unique ID.",
         )(f)
 
-    return decorator
\ No newline at end of file
+    return decorator
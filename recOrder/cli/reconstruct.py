@@ -1,3 +1,4 @@
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 import click
@@ -9,13 +10,77 @@ from recOrder.cli.compute_transfer_function import (
     compute_transfer_function_cli,
 )
 from recOrder.cli.parsing import (
+    calibrate,
     config_filepath,
     input_position_dirpaths,
+    job_minutes,
     output_dirpath,
     processes_option,
     ram_multiplier,
+    resume,
+    run_report,
     unique_id,
+    use_tf_cache,
 )
+from recOrder.cli.tf_cache import (
+    DEFAULT_CACHE_DIRPATH,
+    get_cached_transfer_function,
+)
+
+
+def reconstruct_cli(
+    input_position_dirpaths: list[Path],
+    config_filepath: Path,
+    output_dirpath: Path,
+    num_processes: int = 1,
+    ram_multiplier: float = 1.0,
+    unique_id: str = "",
+    use_tf_cache: bool = False,
+    tf_cache_dirpath: Path = DEFAULT_CACHE_DIRPATH,
+    run_report: bool = False,
+    calibrate: bool = False,
+    job_minutes: float = None,
+    resume: bool = False,
+    pool: ProcessPoolExecutor = None,
+) -> None:
+    """Compute a transfer function for the first position, then apply its
+    inverse to all positions. See `reconstruct`.
+
+    `pool` runs the reconstruction jobs in running worker processes instead
+    of the executor backend of the settings, see `recorder daemon`."""
+    if use_tf_cache:
+        # Reuse or compute a transfer function in the on-disk cache
+        transfer_function_path = get_cached_transfer_function(
+            input_position_dirpaths[0], config_filepath, tf_cache_dirpath
+        )
+    else:
+        # Handle transfer function path
+        transfer_function_path = output_dirpath.parent / Path(
+            "transfer_function_" + config_filepath.stem + ".zarr"
+        )
+
+        # Compute transfer function
+        compute_transfer_function_cli(
+            input_position_dirpaths[0],
+            config_filepath,
+            transfer_function_path,
+        )
+
+    # Apply inverse transfer function
+    apply_inverse_transfer_function_cli(
+        input_position_dirpaths,
+        transfer_function_path,
+        config_filepath,
+        output_dirpath,
+        num_processes,
+        ram_multiplier,
+        unique_id,
+        run_report,
+        calibrate,
+        job_minutes,
+        resume,
+        pool,
+    )
 
 
 @click.command()
@@ -25,6 +90,11 @@ from recOrder.cli.parsing import (
 @processes_option(default=1)
 @ram_multiplier()
 @unique_id()
+@use_tf_cache()
+@calibrate()
+@job_minutes()
+@run_report()
+@resume()
 def reconstruct(
     input_position_dirpaths,
     config_filepath,
@@ -32,6 +102,11 @@ def reconstruct(
     num_processes,
     ram_multiplier,
     unique_id,
+    use_tf_cache,
+    calibrate,
+    job_minutes,
+    run_report,
+    resume,
 ):
     """
     Reconstruct a dataset using a configuration file. This is a
@@ -48,25 +123,16 @@ def reconstruct(
     >> recorder reconstruct -i ./input.zarr/*/*/* -c ./examples/birefringence.yml -o ./output.zarr
     """
 
-    # Handle transfer function path
-    transfer_function_path = output_dirpath.parent / Path(
-        "transfer_function_" + config_filepath.stem + ".zarr"
-    )
-
-    # Compute transfer function
-    compute_transfer_function_cli(
-        input_position_dirpaths[0],
-        config_filepath,
-        transfer_function_path,
-    )
-
-    # Apply inverse transfer function
-    apply_inverse_transfer_function_cli(
+    reconstruct_cli(
         input_position_dirpaths,
-        transfer_function_path,
         config_filepath,
         output_dirpath,
         num_processes,
         ram_multiplier,
         unique_id,
+        use_tf_cache,
+        run_report=run_report,
+        calibrate=calibrate,
+        job_minutes=job_minutes,
+        resume=resume,
     )
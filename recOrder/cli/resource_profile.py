@@ -0,0 +1,263 @@
+"""
+Measured resource profiles for sizing reconstruction jobs.
+
+Instead of estimating memory from fixed multipliers of the data size,
+`--calibrate` reconstructs the first time point of the first position
+locally, in a child process, while sampling the peak resident memory of that
+process and its workers. The child times its reconstruction loop, without
+the process startup, imports and loading of the transfer functions, which a
+job pays once and not per time point. The real submission is then sized from
+these measurements. Profiles are stored in `<profile_dirpath>/<key>.json`,
+keyed by the reconstruction settings (except the time indices), the CZYX
+shape and dtype of the input, and the recOrder/waveorder versions, so later
+runs with matching settings skip the probe.
+"""
+
+import hashlib
+import json
+import multiprocessing as mp
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import psutil
+from iohub.ngff import open_ome_zarr
+
+from recOrder.cli.printing import echo_headline
+from recOrder.cli.settings import ReconstructionSettings
+from recOrder.cli.tf_cache import _package_version
+from recOrder.io import utils
+
+DEFAULT_PROFILE_DIRPATH = (
+    Path.home() / ".cache" / "recOrder" / "resource_profiles"
+)
+MEMORY_HEADROOM = 1.5  # requested memory / measured peak memory
+TIME_HEADROOM = 2.0  # requested time / measured time
+MIN_SLURM_TIME = 10  # minutes
+MAX_CPUS = 32
+SAMPLE_INTERVAL = 0.05  # seconds between memory samples
+BYTES_PER_GB = 2**30
+
+
+def resource_profile_key(
+    settings: ReconstructionSettings, czyx_shape: tuple, dtype: str
+) -> dict:
+    """Canonical description of everything a resource profile depends on.
+
+    Parameters
+    ----------
+    settings : ReconstructionSettings
+    czyx_shape : tuple
+        Shape of one time point of the input data in (C, Z, Y, X) order
+    dtype : str
+        Input data type
+
+    Returns
+    -------
+    dict
+    """
+    # the profile is measured per time point and does not depend on where
+    # jobs run
+    settings_dict = settings.dict(exclude={"time_indices", "executor"})
+    return {
+        "settings": settings_dict,
+        "czyx_shape": list(czyx_shape),
+        "dtype": str(dtype),
+        "versions": {
+            "recOrder": _package_version("recOrder-napari"),
+            "waveorder": _package_version("waveorder"),
+        },
+    }
+
+
+def resource_profile_hash(profile_key: dict) -> str:
+    canonical_json = json.dumps(profile_key, sort_keys=True, default=str)
+    return hashlib.sha256(canonical_json.encode()).hexdigest()[:32]
+
+
+def _probe_time_indices(settings: ReconstructionSettings, T: int) -> list:
+    from recOrder.cli.apply_inverse_transfer_function import (
+        _use_time_batches,
+    )
+
+    # fixed-size time batches hold that many time points at once
+    num_time_points = 1
+    batch_size = settings.processing.time_batch_size
+    if _use_time_batches(settings) and batch_size != "auto":
+        num_time_points = min(batch_size, T)
+    return list(range(num_time_points))
+
+
+def _run_probe(
+    input_position_dirpath: Path,
+    transfer_function_dirpath: Path,
+    config_filepath: Path,
+    output_dirpath: Path,
+    seconds_connection,
+) -> None:
+    from recOrder.cli.apply_inverse_transfer_function import (
+        apply_inverse_transfer_function_single_position,
+        get_reconstruction_output_metadata,
+    )
+    from recOrder.cli.utils import create_empty_hcs_zarr
+
+    position_key = input_position_dirpath.parts[-3:]
+    output_metadata = get_reconstruction_output_metadata(
+        input_position_dirpath, config_filepath
+    )
+    create_empty_hcs_zarr(
+        store_path=output_dirpath,
+        position_keys=[position_key],
+        **output_metadata,
+    )
+    timing = apply_inverse_transfer_function_single_position(
+        input_position_dirpath,
+        transfer_function_dirpath,
+        config_filepath,
+        output_dirpath / Path(*position_key),
+        1,
+        output_metadata["channel_names"],
+    )
+    seconds_connection.send(timing["reconstruction_seconds"])
+    seconds_connection.close()
+
+
+def _process_tree_rss(process: psutil.Process) -> int:
+    rss = 0
+    for p in [process] + process.children(recursive=True):
+        try:
+            rss += p.memory_info().rss
+        except psutil.Error:
+            pass  # exited between listing and sampling
+    return rss
+
+
+def measure_resource_profile(
+    input_position_dirpath: Path,
+    transfer_function_dirpath: Path,
+    config_filepath: Path,
+) -> dict:
+    """Reconstruct the first time point(s) of a position in a child process
+    and measure its peak memory and the time of its reconstruction loop.
+
+    Returns
+    -------
+    dict
+        "peak_gb", the peak resident memory of the process and its workers,
+        "seconds_per_time_point", which excludes the startup of the process,
+        and "num_time_points" probed
+    """
+    settings = utils.yaml_to_model(config_filepath, ReconstructionSettings)
+    with open_ome_zarr(input_position_dirpath, mode="r") as input_dataset:
+        T = input_dataset.data.shape[0]
+    settings.time_indices = _probe_time_indices(settings, T)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        probe_config_filepath = Path(tmp) / "probe.yml"
+        utils.model_to_yaml(settings, probe_config_filepath)
+
+        context = mp.get_context("spawn")
+        receive_connection, send_connection = context.Pipe(duplex=False)
+        process = context.Process(
+            target=_run_probe,
+            args=(
+                Path(input_position_dirpath),
+                Path(transfer_function_dirpath),
+                probe_config_filepath,
+                Path(tmp) / "probe.zarr",
+                send_connection,
+            ),
+        )
+        process.start()
+        send_connection.close()
+        peak_rss = 0
+        ps_process = psutil.Process(process.pid)
+        while process.is_alive():
+            peak_rss = max(peak_rss, _process_tree_rss(ps_process))
+            time.sleep(SAMPLE_INTERVAL)
+        process.join()
+        seconds = None
+        if receive_connection.poll():
+            seconds = receive_connection.recv()
+        receive_connection.close()
+
+    if process.exitcode != 0 or seconds is None:
+        raise RuntimeError(
+            f"Calibration of {input_position_dirpath} failed with exit code "
+            f"{process.exitcode}."
+        )
+    return {
+        "peak_gb": peak_rss / BYTES_PER_GB,
+        "seconds_per_time_point": seconds / len(settings.time_indices),
+        "num_time_points": len(settings.time_indices),
+    }
+
+
+def get_resource_profile(
+    input_position_dirpath: Path,
+    transfer_function_dirpath: Path,
+    config_filepath: Path,
+    profile_dirpath: Path = DEFAULT_PROFILE_DIRPATH,
+) -> dict:
+    """Return the cached resource profile matching a reconstruction, or
+    measure it with `measure_resource_profile` and cache it."""
+    settings = utils.yaml_to_model(config_filepath, ReconstructionSettings)
+    with open_ome_zarr(input_position_dirpath, mode="r") as input_dataset:
+        _, _, Z, Y, X = input_dataset.data.shape
+        dtype = input_dataset.data.dtype
+    C = len(settings.input_channel_names)
+    profile_key = resource_profile_key(settings, (C, Z, Y, X), dtype)
+    profile_filepath = (
+        Path(profile_dirpath) / f"{resource_profile_hash(profile_key)}.json"
+    )
+
+    if profile_filepath.exists():
+        with open(profile_filepath, "r") as file:
+            return json.load(file)["profile"]
+
+    echo_headline(
+        f"Calibrating resources with the first time point of "
+        f"{input_position_dirpath}"
+    )
+    profile = measure_resource_profile(
+        input_position_dirpath, transfer_function_dirpath, config_filepath
+    )
+    profile_filepath.parent.mkdir(parents=True, exist_ok=True)
+    with open(profile_filepath, "w") as file:
+        json.dump({"profile": profile, "key": profile_key}, file, indent=4)
+    return profile
+
+
+def size_job(
+    profile: dict,
+    num_time_points: int,
+    num_processes: int,
+    ram_multiplier: float = 1.0,
+    max_cpus: int = MAX_CPUS,
+) -> dict:
+    """Slurm resources for one position from a resource profile.
+
+    Each process reconstructs one time point at a time, so it gets the
+    measured peak memory, and the time points are split between processes.
+
+    Returns
+    -------
+    dict
+        "slurm_mem_per_cpu" in GB, "slurm_cpus_per_task" and "slurm_time" in
+        minutes
+    """
+    cpus = int(max(1, min(num_processes, num_time_points, max_cpus)))
+    gb_per_cpu = np.ceil(
+        max(1, ram_multiplier * MEMORY_HEADROOM * profile["peak_gb"])
+    )
+    seconds = (
+        profile["seconds_per_time_point"]
+        * np.ceil(num_time_points / cpus)
+        * TIME_HEADROOM
+    )
+    return {
+        "slurm_mem_per_cpu": int(gb_per_cpu),
+        "slurm_cpus_per_task": cpus,
+        "slurm_time": int(max(MIN_SLURM_TIME, np.ceil(seconds / 60))),
+    }
@@ -8,6 +8,7 @@ from pydantic.v1 import (
     NonNegativeFloat,
     NonNegativeInt,
     PositiveFloat,
+    PositiveInt,
     root_validator,
     validator,
 )
@@ -146,6 +147,91 @@ class FluorescenceSettings(MyBaseModel):
     apply_inverse: FourierApplyInverseSettings = FourierApplyInverseSettings()
 
 
+class ProcessingSettings(MyBaseModel):
+    # Number of time points read ahead of (and written behind) the current
+    # reconstruction in single-process runs. 0 disables the I/O pipeline.
+    prefetch_depth: NonNegativeInt = 0
+    # Edge length in pixels of the YX tiles that birefringence-only and 3D
+    # phase/fluorescence reconstructions are streamed through. 0 reconstructs
+    # whole volumes.
+    tile_size: NonNegativeInt = 0
+    # Halo in pixels added around each 3D phase/fluorescence tile. Adjacent
+    # tiles are blended over a band of up to tile_overlap pixels.
+    tile_overlap: NonNegativeInt = 32
+    # Number of time points inverted together in single-process 2D
+    # birefringence-only reconstructions. "auto" sizes batches to the
+    # available memory.
+    time_batch_size: Union[PositiveInt, Literal["auto"]] = 1
+
+
+class OutputSettings(MyBaseModel):
+    # Chunk shape of the reconstructed arrays in (T, C, Z, Y, X) order, or
+    # "auto" to chunk blocks of Z-slices (or of YX tiles when tiling) that
+    # hold about target_chunk_mb each.
+    chunks: Union[List[PositiveInt], Literal["auto"]] = "auto"
+    target_chunk_mb: PositiveFloat = 16.0
+    # Data type of the reconstructed arrays. uint16 outputs store a per-channel
+    # scale and offset, estimated from the first reconstructed time point.
+    dtype: Literal["float32", "float16", "uint16"] = "float32"
+    # Blosc codec of the reconstructed arrays, or "none"
+    compression: Literal["blosc-zstd", "blosc-lz4", "none"] = "blosc-zstd"
+    compression_level: NonNegativeInt = 1
+    # Decimal digits kept by a lossy quantization filter before compression.
+    # 0 stores values losslessly.
+    quantize_digits: NonNegativeInt = 0
+
+    @validator("compression_level")
+    def compression_level_range(cls, v):
+        if v > 9:
+            raise ValueError(
+                f"compression_level = {v} should be between 0 and 9."
+            )
+        return v
+
+    @validator("quantize_digits")
+    def quantize_floats_only(cls, v, values):
+        if v > 0 and values.get("dtype") == "uint16":
+            raise ValueError(
+                f"quantize_digits = {v} only applies to float32 and float16 outputs."
+            )
+        return v
+
+    @validator("chunks")
+    def chunks_are_tczyx(cls, v):
+        if v != "auto" and len(v) != 5:
+            raise ValueError(
+                f"chunks = {v} must have five entries in (T, C, Z, Y, X) order."
+            )
+        # Jobs and worker processes write one time point of one channel at a
+        # time, so chunks shared by several writers would lose data
+        if v != "auto" and (v[0] != 1 or v[1] != 1):
+            raise ValueError(
+                f"chunks = {v} must hold one time point and one channel (T = C = 1)."
+            )
+        return v
+
+
+class ExecutorSettings(MyBaseModel):
+    # Where jobs run. "slurm" submits them to SLURM, "local" runs every job at
+    # once in its own process as a local stand-in for SLURM, and
+    # "process-pool" runs array_parallelism jobs at a time in a pool of local
+    # processes that are reused between jobs. "auto" uses SLURM when it is
+    # available and "local" otherwise.
+    backend: Literal["auto", "slurm", "local", "process-pool"] = "auto"
+    partition: str = "cpu"
+    # Maximum number of jobs running at once on SLURM or in the process pool
+    array_parallelism: PositiveInt = 50
+    # SLURM time limit per job in minutes. "auto" requests 60 minutes, or
+    # twice the time measured with --calibrate.
+    time_limit_min: Union[PositiveInt, Literal["auto"]] = "auto"
+    # Time after which "local" jobs are killed, in minutes
+    local_timeout_min: PositiveInt = 5
+    # Memory per CPU in GB. "auto" estimates it from the data size, or from
+    # the memory measured with --calibrate, times --ram-multiplier.
+    mem_per_cpu_gb: Union[PositiveInt, Literal["auto"]] = "auto"
+    max_cpus_per_job: PositiveInt = 32
+
+
 # Top level settings
 class ReconstructionSettings(MyBaseModel):
     input_channel_names: List[str] = [f"State{i}" for i in range(4)]
@@ -156,6 +242,9 @@ class ReconstructionSettings(MyBaseModel):
     birefringence: Optional[BirefringenceSettings]
     phase: Optional[PhaseSettings]
     fluorescence: Optional[FluorescenceSettings]
+    processing: ProcessingSettings = ProcessingSettings()
+    output: OutputSettings = OutputSettings()
+    executor: ExecutorSettings = ExecutorSettings()
 
     @root_validator(pre=False)
     def validate_reconstruction_types(cls, values):
@@ -0,0 +1,86 @@
+"""
+Split reconstructions into jobs of time points.
+
+By default each position is reconstructed by one job that loops over all of
+its time points, so a long time-lapse of a few positions runs on a few nodes
+while the rest of the cluster idles. `plan_shards` instead splits every
+position's time points into chunks that take about `job_minutes` each, given
+a measured time per time point, and balances the chunks of a position so
+their sizes differ by at most one time point.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+Shard = tuple[Path, Optional[list[int]]]
+
+
+def shard_size(
+    seconds_per_time_point: float, job_minutes: float, num_processes: int = 1
+) -> int:
+    """Number of time points a job with `num_processes` processes
+    reconstructs in about `job_minutes`, at least one per process."""
+    time_points_per_process = int(
+        job_minutes * 60 // max(seconds_per_time_point, 1e-6)
+    )
+    return max(1, time_points_per_process) * max(1, num_processes)
+
+
+def plan_shards(
+    position_dirpaths: list[Path],
+    time_indices: list[int],
+    time_points_per_shard: Optional[int] = None,
+) -> list[Shard]:
+    """Split each position into jobs of at most `time_points_per_shard` time
+    points.
+
+    Parameters
+    ----------
+    position_dirpaths : list[Path]
+        Input positions
+    time_indices : list[int]
+        Time indices reconstructed at every position
+    time_points_per_shard : int, optional
+        Maximum number of time points per job, by default None reconstructs
+        each position in one job
+
+    Returns
+    -------
+    list[Shard]
+        (position_dirpath, time_indices) per job, position by position.
+        time_indices is None for whole-position jobs, which reconstruct the
+        time indices of the configuration file.
+    """
+    if time_points_per_shard is None or time_points_per_shard >= len(
+        time_indices
+    ):
+        return [(Path(p), None) for p in position_dirpaths]
+
+    num_shards = int(np.ceil(len(time_indices) / time_points_per_shard))
+    # array_split balances the chunks instead of leaving a short last chunk
+    chunks = [
+        [int(t) for t in chunk]
+        for chunk in np.array_split(np.asarray(time_indices), num_shards)
+    ]
+    return [(Path(p), chunk) for p in position_dirpaths for chunk in chunks]
+
+
+def time_points_label(time_indices: list[int]) -> str:
+    """Short name of the time points of a shard, e.g. "t100-199"."""
+    first, last = time_indices[0], time_indices[-1]
+    if len(time_indices) == 1:
+        return f"t{first}"
+    if list(time_indices) == list(range(first, last + 1)):
+        return f"t{first}-{last}"
+    return f"t{first}..{last} ({len(time_indices)})"
+
+
+def shard_label(position_dirpath: Path, time_indices: list[int] = None) -> str:
+    """Position name of a job, followed by its time points for shards, e.g.
+    "A/1/0" or "A/1/0 t100-199"."""
+    label = "/".join(Path(position_dirpath).parts[-3:])
+    if time_indices is None:
+        return label
+    return f"{label} {time_points_label(time_indices)}"
@@ -0,0 +1,277 @@
+"""
+Content-addressed on-disk cache of transfer functions.
+
+A transfer function only depends on the transfer function settings, the
+reconstruction dimension, the number of input channels, the ZYX shape it is
+computed for (the data or, with overlap tiling, one tile), and the
+recOrder/waveorder versions that computed it. This module hashes those inputs
+into a key and stores each transfer function in
+`<cache_dirpath>/<key>.zarr`, so repeated reconstructions with matching
+settings skip `compute-tf` entirely. Entries are evicted least-recently-used
+once the cache exceeds a size cap.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+import click
+from iohub.ngff import open_ome_zarr
+
+from recOrder.cli.compute_transfer_function import (
+    compute_transfer_function_cli,
+    transfer_function_zyx_shape,
+)
+from recOrder.cli.settings import ReconstructionSettings
+from recOrder.io import utils
+
+DEFAULT_CACHE_DIRPATH = (
+    Path.home() / ".cache" / "recOrder" / "transfer_functions"
+)
+DEFAULT_MAX_GB = 20.0
+BYTES_PER_GB = 2**30
+
+
+def _package_version(package_name: str) -> str:
+    try:
+        return version(package_name)
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def transfer_function_cache_key(
+    settings: ReconstructionSettings, zyx_shape: tuple
+) -> dict:
+    """Canonical description of everything a transfer function depends on.
+
+    Parameters
+    ----------
+    settings : ReconstructionSettings
+    zyx_shape : tuple
+        Shape of the input data in (Z, Y, X) order
+
+    Returns
+    -------
+    dict
+    """
+    transfer_function_settings = {}
+    for modality in ("birefringence", "phase", "fluorescence"):
+        modality_settings = getattr(settings, modality)
+        if modality_settings is not None:
+            transfer_function_settings[modality] = (
+                modality_settings.transfer_function.dict()
+            )
+
+    return {
+        "transfer_function": transfer_function_settings,
+        "reconstruction_dimension": settings.reconstruction_dimension,
+        "num_input_channels": len(settings.input_channel_names),
+        "zyx_shape": list(transfer_function_zyx_shape(settings, zyx_shape)),
+        "versions": {
+            "recOrder": _package_version("recOrder-napari"),
+            "waveorder": _package_version("waveorder"),
+        },
+    }
+
+
+def transfer_function_cache_hash(cache_key: dict) -> str:
+    canonical_json = json.dumps(cache_key, sort_keys=True, default=str)
+    return hashlib.sha256(canonical_json.encode()).hexdigest()[:32]
+
+
+def _dirpath_bytes(dirpath: Path) -> int:
+    total_bytes = 0
+    for root, _, file_names in os.walk(dirpath):
+        for file_name in file_names:
+            total_bytes += os.path.getsize(os.path.join(root, file_name))
+    return total_bytes
+
+
+def list_cached_transfer_functions(
+    cache_dirpath: Path = DEFAULT_CACHE_DIRPATH,
+) -> list[dict]:
+    """List cache entries, most recently used first.
+
+    Returns
+    -------
+    list[dict]
+        One dict per entry with keys "path", "hash", "bytes", "last_used"
+        and "cache_key".
+    """
+    cache_dirpath = Path(cache_dirpath)
+    if not cache_dirpath.exists():
+        return []
+
+    entries = []
+    for entry_path in cache_dirpath.glob("*.zarr"):
+        if entry_path.name.startswith("."):
+            continue  # entry still being computed
+        try:
+            with open(entry_path / ".zattrs", "r") as file:
+                cache_key = json.load(file).get("tf_cache", {})
+        except (OSError, ValueError):
+            cache_key = {}
+        entries.append(
+            {
+                "path": entry_path,
+                "hash": entry_path.stem,
+                "bytes": _dirpath_bytes(entry_path),
+                "last_used": entry_path.stat().st_mtime,
+                "cache_key": cache_key,
+            }
+        )
+    return sorted(entries, key=lambda entry: entry["last_used"], reverse=True)
+
+
+def prune_transfer_function_cache(
+    cache_dirpath: Path = DEFAULT_CACHE_DIRPATH,
+    max_gb: float = DEFAULT_MAX_GB,
+) -> list[Path]:
+    """Evict least-recently-used entries until the cache fits in `max_gb`.
+
+    Returns
+    -------
+    list[Path]
+        Paths of the removed entries
+    """
+    max_bytes = max_gb * BYTES_PER_GB
+    entries = list_cached_transfer_functions(cache_dirpath)
+    total_bytes = sum(entry["bytes"] for entry in entries)
+
+    removed_paths = []
+    while entries and total_bytes > max_bytes:
+        entry = entries.pop()  # least recently used
+        shutil.rmtree(entry["path"], ignore_errors=True)
+        total_bytes -= entry["bytes"]
+        removed_paths.append(entry["path"])
+    return removed_paths
+
+
+def get_cached_transfer_function(
+    input_position_dirpath: Path,
+    config_filepath: Path,
+    cache_dirpath: Path = DEFAULT_CACHE_DIRPATH,
+    max_gb: float = DEFAULT_MAX_GB,
+) -> Path:
+    """Return the path of a transfer function for this dataset and config,
+    computing and caching it only if no matching entry exists.
+
+    Parameters
+    ----------
+    input_position_dirpath : Path
+        Position whose ZYX shape the transfer function is computed for
+    config_filepath : Path
+        Path to the reconstruction configuration file
+    cache_dirpath : Path, optional
+        Cache directory, by default ~/.cache/recOrder/transfer_functions
+    max_gb : float, optional
+        Size cap of the cache, by default 20 GB
+
+    Returns
+    -------
+    Path
+        Path to the cached transfer function .zarr
+    """
+    settings = utils.yaml_to_model(config_filepath, ReconstructionSettings)
+    with open_ome_zarr(input_position_dirpath, mode="r") as input_dataset:
+        zyx_shape = input_dataset.data.shape[2:]
+
+    cache_key = transfer_function_cache_key(settings, zyx_shape)
+    cache_dirpath = Path(cache_dirpath)
+    entry_path = (
+        cache_dirpath / f"{transfer_function_cache_hash(cache_key)}.zarr"
+    )
+
+    if entry_path.exists():
+        click.echo(f"Using cached transfer function {entry_path}")
+        os.utime(entry_path)  # mark as recently used
+        return entry_path
+
+    # Compute into a path private to this process and thread (requests of
+    # `recorder daemon` run in threads), then publish it with an atomic
+    # rename so that concurrent reconstructions never see a partial entry
+    cache_dirpath.mkdir(parents=True, exist_ok=True)
+    tmp_path = (
+        cache_dirpath
+        / f".{entry_path.stem}-{os.getpid()}-{threading.get_ident()}.zarr"
+    )
+    compute_transfer_function_cli(
+        input_position_dirpath, config_filepath, tmp_path
+    )
+    with open_ome_zarr(tmp_path, layout="fov", mode="r+") as dataset:
+        dataset.zattrs["tf_cache"] = cache_key
+
+    # Make room before publishing so the new entry is never evicted
+    prune_transfer_function_cache(cache_dirpath, max_gb)
+    try:
+        os.rename(tmp_path, entry_path)
+    except OSError:
+        # another process published the same entry first
+        shutil.rmtree(tmp_path, ignore_errors=True)
+
+    return entry_path
+
+
+def _cache_dirpath_option():
+    return click.option(
+        "--cache-dirpath",
+        type=click.Path(file_okay=False),
+        default=str(DEFAULT_CACHE_DIRPATH),
+        show_default=True,
+        callback=lambda ctx, opt, value: Path(value),
+        help="Path to the transfer function cache.",
+    )
+
+
+@click.group("tf-cache")
+def tf_cache():
+    """Inspect and prune the on-disk transfer function cache."""
+
+
+@tf_cache.command("ls")
+@_cache_dirpath_option()
+def ls(cache_dirpath: Path):
+    """
+    List cached transfer functions, most recently used first.
+
+    >> recorder tf-cache ls
+    """
+    entries = list_cached_transfer_functions(cache_dirpath)
+    for entry in entries:
+        cache_key = entry["cache_key"]
+        modalities = "+".join(cache_key.get("transfer_function", {}).keys())
+        last_used = time.strftime(
+            "%Y-%m-%d %H:%M", time.localtime(entry["last_used"])
+        )
+        click.echo(
+            f"{entry['hash']}  {entry['bytes'] / BYTES_PER_GB:8.3f} GB  "
+            f"{last_used}  {modalities or '?'}  "
+            f"{cache_key.get('reconstruction_dimension', '?')}D  "
+            f"zyx_shape={cache_key.get('zyx_shape', '?')}"
+        )
+    total_gb = sum(entry["bytes"] for entry in entries) / BYTES_PER_GB
+    click.echo(f"{len(entries)} entries, {total_gb:.3f} GB in {cache_dirpath}")
+
+
+@tf_cache.command("prune")
+@_cache_dirpath_option()
+@click.option(
+    "--max-gb",
+    type=float,
+    default=DEFAULT_MAX_GB,
+    show_default=True,
+    help="Evict least-recently-used entries until the cache fits.",
+)
+def prune(cache_dirpath: Path, max_gb: float):
+    """
+    Evict least-recently-used cached transfer functions.
+
+    >> recorder tf-cache prune --max-gb 0  # empty the cache
+    """
+    removed_paths = prune_transfer_function_cache(cache_dirpath, max_gb)
+    click.echo(f"Removed {len(removed_paths)} entries from {cache_dirpath}")
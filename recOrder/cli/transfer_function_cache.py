@@ -0,0 +1,204 @@
+"""
+Per-process cache of transfer functions read from a transfer function zarr.
+
+The inverse models in `apply_inverse_models` are called once per time point,
+and every call used to re-read and decompress the same transfer function
+arrays. This module keeps each decoded array resident as a tensor, keyed by
+the transfer function store path and the array name, and evicts the least
+recently used arrays when a memory budget is exceeded.
+
+Multiprocessing pools share one copy of the transfer functions: the parent
+loads them into shared memory with `TransferFunctionCache.share`, and each
+worker attaches to them in its pool initializer with
+`attach_shared_transfer_functions`.
+"""
+
+import os
+from collections import OrderedDict
+
+import numpy as np
+import torch
+from iohub.ngff import Position
+
+DEFAULT_BUDGET_BYTES = 8 * 2**30  # 8 GB
+
+
+def _store_path(transfer_function_dataset: Position) -> str:
+    zgroup = transfer_function_dataset.zgroup
+    store_path = getattr(zgroup.store, "path", None)
+    if store_path is None:
+        # non-filesystem stores are keyed by identity
+        store_path = f"<{type(zgroup.store).__name__} {id(zgroup.store)}>"
+    return os.path.join(str(store_path), zgroup.path)
+
+
+class TransferFunctionCache:
+    """Least-recently-used cache of transfer function tensors.
+
+    Parameters
+    ----------
+    budget_bytes : int
+        Maximum number of bytes kept resident. Arrays larger than the budget
+        are loaded and returned but not cached.
+    """
+
+    def __init__(self, budget_bytes: int = DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self._tensors = OrderedDict()
+        self._shared = {}
+        self.hits = 0
+        self.misses = 0
+        self.bytes_loaded = 0
+
+    @property
+    def bytes_resident(self) -> int:
+        return sum(
+            tensor.element_size() * tensor.nelement()
+            for tensor in self._tensors.values()
+        )
+
+    @property
+    def bytes_shared(self) -> int:
+        return sum(
+            tensor.element_size() * tensor.nelement()
+            for tensor in self._shared.values()
+        )
+
+    def get(
+        self,
+        transfer_function_dataset: Position,
+        name: str,
+        index: tuple = (0, 0),
+    ) -> torch.Tensor:
+        """Return `transfer_function_dataset[name][index]` as a tensor,
+        reading it from disk only on the first request.
+
+        Parameters
+        ----------
+        transfer_function_dataset : Position
+            Transfer function dataset written by `recorder compute-tf`
+        name : str
+            Array name, e.g. "real_potential_transfer_function"
+        index : tuple, optional
+            Leading indices to drop, by default (0, 0)
+
+        Returns
+        -------
+        torch.Tensor
+        """
+        key = (_store_path(transfer_function_dataset), name, index)
+        if key in self._tensors:
+            self.hits += 1
+            self._tensors.move_to_end(key)
+            return self._tensors[key]
+
+        shared_tensor = self._shared.get(key[:2])
+        if shared_tensor is not None:
+            # views of shared memory are free, so they are not cached
+            self.hits += 1
+            return shared_tensor[index]
+
+        self.misses += 1
+        array = np.asarray(transfer_function_dataset[name][index])
+        tensor = torch.from_numpy(array)
+        tensor_bytes = tensor.element_size() * tensor.nelement()
+        self.bytes_loaded += tensor_bytes
+
+        if tensor_bytes <= self.budget_bytes:
+            self._tensors[key] = tensor
+            self._evict()
+
+        return tensor
+
+    def share(self, transfer_function_dataset: Position) -> dict:
+        """Load every array of `transfer_function_dataset` into shared memory.
+
+        Shared arrays are served to `get` without counting against the budget.
+
+        Parameters
+        ----------
+        transfer_function_dataset : Position
+            Transfer function dataset written by `recorder compute-tf`
+
+        Returns
+        -------
+        dict
+            Shared tensors to pass to `attach` in worker processes.
+            `torch.multiprocessing` pickles them as handles to the same
+            memory, so workers attach without copying.
+        """
+        store_path = _store_path(transfer_function_dataset)
+        for name in transfer_function_dataset.array_keys():
+            key = (store_path, name)
+            if key in self._shared:
+                continue
+            array = np.asarray(transfer_function_dataset[name][:])
+            tensor = torch.from_numpy(array).share_memory_()
+            self.bytes_loaded += tensor.element_size() * tensor.nelement()
+            self._shared[key] = tensor
+        return {
+            key: tensor
+            for key, tensor in self._shared.items()
+            if key[0] == store_path
+        }
+
+    def attach(self, shared_tensors: dict):
+        """Serve the shared tensors returned by `share` in this process."""
+        self._shared.update(shared_tensors)
+
+    def _evict(self):
+        while self.bytes_resident > self.budget_bytes:
+            self._tensors.popitem(last=False)
+
+    def invalidate(self, store_path):
+        """Drop every cached array read from the store at `store_path`, e.g.
+        after the transfer function has been regenerated in place."""
+        store_path = os.path.abspath(store_path)
+        for tensors in (self._tensors, self._shared):
+            for key in list(tensors.keys()):
+                key_path = os.path.abspath(key[0])
+                if key_path == store_path or key_path.startswith(
+                    store_path + os.sep
+                ):
+                    del tensors[key]
+
+    def set_budget(self, budget_bytes: int):
+        self.budget_bytes = budget_bytes
+        self._evict()
+
+    def clear(self):
+        self._tensors.clear()
+        self._shared.clear()
+
+    def reset_stats(self):
+        """Restart the hit, miss and load counters, e.g. per position."""
+        self.hits = 0
+        self.misses = 0
+        self.bytes_loaded = 0
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "bytes_loaded": self.bytes_loaded,
+            "bytes_resident": self.bytes_resident,
+            "bytes_shared": self.bytes_shared,
+            "num_arrays": len(self._tensors),
+        }
+
+
+# One cache per process, shared by all apply_inverse_models calls
+TRANSFER_FUNCTION_CACHE = TransferFunctionCache()
+
+
+def load_transfer_function(
+    transfer_function_dataset: Position, name: str, index: tuple = (0, 0)
+) -> torch.Tensor:
+    """Load a transfer function through the per-process cache."""
+    return TRANSFER_FUNCTION_CACHE.get(transfer_function_dataset, name, index)
+
+
+def attach_shared_transfer_functions(shared_tensors: dict):
+    """Pool initializer that attaches a worker to the parent's shared
+    transfer functions, see `TransferFunctionCache.share`."""
+    TRANSFER_FUNCTION_CACHE.attach(shared_tensors)
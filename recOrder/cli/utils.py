@@ -1,14 +1,78 @@
+import os
+import queue
+import threading
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Tuple
+from typing import Callable, Optional, Tuple
 
 import click
 import numpy as np
+import psutil
 import torch
 from iohub.ngff import Position, open_ome_zarr
 from iohub.ngff_meta import TransformationMeta
+from numcodecs import Blosc, Quantize
 from numpy.typing import DTypeLike
 
 
+@contextmanager
+def _deferred_dump_meta(node):
+    """Write the metadata of an iohub plate or well once on exit, instead of
+    after every child that is created."""
+    dump_meta = node.dump_meta
+    requested = []
+    node.dump_meta = lambda *args, **kwargs: requested.append(True)
+    try:
+        yield node
+    finally:
+        del node.dump_meta
+        if requested:
+            dump_meta()
+
+
+def _initialize_position(
+    position: Position,
+    new: bool,
+    shape: Tuple[int],
+    chunks: Tuple[int],
+    scale: Tuple[float],
+    channel_names: list[str],
+    dtype: DTypeLike,
+    storage_options: dict,
+) -> None:
+    if new:
+        _ = position.create_zeros(
+            name="0",
+            shape=shape,
+            chunks=chunks,
+            dtype=dtype,
+            transform=[TransformationMeta(type="scale", scale=scale)],
+        )
+        if storage_options:
+            # iohub fixes the compressor, so recreate the (still empty)
+            # array with the requested storage options
+            position.zgroup.zeros(
+                name="0",
+                shape=shape,
+                chunks=chunks,
+                dtype=dtype,
+                overwrite=True,
+                **storage_options,
+            )
+
+    # Check if channel_names are already in the store, if not append them.
+    # Read channel names directly from metadata to avoid race conditions
+    metadata_channel_names = [
+        channel.label for channel in position.metadata.omero.channels
+    ]
+    for channel_name in channel_names:
+        if channel_name not in metadata_channel_names:
+            position.append_channel(channel_name, resize_arrays=True)
+            metadata_channel_names.append(channel_name)
+
+
 def create_empty_hcs_zarr(
     store_path: Path,
     position_keys: list[Tuple[str]],
@@ -18,12 +82,18 @@ def create_empty_hcs_zarr(
     channel_names: list[str],
     dtype: DTypeLike,
     plate_metadata: dict = {},
+    storage_options: dict = {},
+    max_workers: int = None,
 ) -> None:
     """If the plate does not exist, create an empty zarr plate.
 
     If the plate exists, append positions and channels if they are not
     already in the plate.
 
+    Missing wells are created first and the plate metadata is written once.
+    Positions, their arrays and channels are then created in parallel
+    threads, one well at a time per thread.
+
     Parameters
     ----------
     store_path : Path
@@ -38,6 +108,12 @@ def create_empty_hcs_zarr(
         Channel names, will append if not present in metadata.
     dtype : DTypeLike
     plate_metadata : dict
+    storage_options : dict
+        zarr array options, e.g. "compressor" and "filters", that replace
+        iohub's defaults for new positions. See `get_storage_options`.
+    max_workers : int, optional
+        Number of threads that initialize wells,
+        by default the `ThreadPoolExecutor` default
     """
 
     # Create plate
@@ -48,31 +124,327 @@ def create_empty_hcs_zarr(
     # Pass metadata
     output_plate.zattrs.update(plate_metadata)
 
-    # Create positions
-    for position_key in position_keys:
-        position_key_string = "/".join(position_key)
-        # Check if position is already in the store, if not create it
-        if position_key_string not in output_plate.zgroup:
-            position = output_plate.create_position(*position_key)
+    # Group positions by well
+    well_position_names = {}
+    for row_name, col_name, position_name in position_keys:
+        position_names = well_position_names.setdefault(
+            f"{row_name}/{col_name}", []
+        )
+        if position_name not in position_names:
+            position_names.append(position_name)
 
-            _ = position.create_zeros(
-                name="0",
-                shape=shape,
-                chunks=chunks,
-                dtype=dtype,
-                transform=[TransformationMeta(type="scale", scale=scale)],
-            )
+    # Create missing wells, writing the plate metadata once
+    new_wells = {}
+    with _deferred_dump_meta(output_plate):
+        for well_path in well_position_names:
+            if well_path not in output_plate.zgroup:
+                new_wells[well_path] = output_plate.create_well(
+                    *well_path.split("/")
+                )
+
+    def initialize_well(well_path):
+        if well_path in new_wells:
+            well = new_wells[well_path]
         else:
-            position = output_plate[position_key_string]
+            well = output_plate[well_path]
+        # Create missing positions, writing the well metadata once
+        with _deferred_dump_meta(well):
+            for position_name in well_position_names[well_path]:
+                # Check if position is already in the store, if not create it
+                new = position_name not in well.zgroup
+                _initialize_position(
+                    (
+                        well.create_position(position_name)
+                        if new
+                        else well[position_name]
+                    ),
+                    new,
+                    shape,
+                    chunks,
+                    scale,
+                    channel_names,
+                    dtype,
+                    storage_options,
+                )
 
-        # Check if channel_names are already in the store, if not append them
-        for channel_name in channel_names:
-            # Read channel names directly from metadata to avoid race conditions
-            metadata_channel_names = [
-                channel.label for channel in position.metadata.omero.channels
-            ]
-            if channel_name not in metadata_channel_names:
-                position.append_channel(channel_name, resize_arrays=True)
+    # Wells are independent groups, so they are written concurrently
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # list() re-raises the first error raised in a thread
+        list(executor.map(initialize_well, well_position_names))
+
+
+def get_storage_options(
+    compression: str,
+    compression_level: int = 1,
+    quantize_digits: int = 0,
+    dtype: DTypeLike = np.float32,
+) -> dict:
+    """zarr compressor and filters for reconstructed arrays.
+
+    Parameters
+    ----------
+    compression : str
+        "blosc-zstd", "blosc-lz4", or "none"
+    compression_level : int, optional
+        Blosc compression level from 0 to 9, by default 1
+    quantize_digits : int, optional
+        Decimal digits kept by a lossy quantization filter applied before
+        compression, by default 0 (lossless)
+    dtype : DTypeLike, optional
+        Data type of the array, by default np.float32
+
+    Returns
+    -------
+    dict
+        Keyword arguments for `zarr.create`
+    """
+    if compression == "none":
+        compressor = None
+    else:
+        compressor = Blosc(
+            cname=compression.removeprefix("blosc-"),
+            clevel=compression_level,
+            shuffle=Blosc.BITSHUFFLE,
+        )
+
+    filters = None
+    if quantize_digits > 0:
+        if not np.issubdtype(dtype, np.floating):
+            raise ValueError(
+                f"quantize_digits = {quantize_digits} requires a floating "
+                f"point dtype, not {np.dtype(dtype)}."
+            )
+        filters = [Quantize(digits=quantize_digits, dtype=np.dtype(dtype))]
+
+    return {"compressor": compressor, "filters": filters}
+
+
+# Output positions opened by this process, keyed by (pid, path) so that
+# forked pool workers never reuse a handle opened by their parent
+_OUTPUT_POSITIONS = {}
+
+
+def get_output_position(output_path: Path) -> Position:
+    """Open an output position once per process and reuse the handle.
+
+    Reopening the position for every time point reparses its metadata, which
+    is slow on network filesystems.
+
+    Parameters
+    ----------
+    output_path : Path
+        Path to the output position
+
+    Returns
+    -------
+    Position
+    """
+    key = (os.getpid(), str(output_path))
+    if key not in _OUTPUT_POSITIONS:
+        _OUTPUT_POSITIONS[key] = open_ome_zarr(output_path, mode="r+")
+    return _OUTPUT_POSITIONS[key]
+
+
+def close_output_positions(output_path: Path = None) -> None:
+    """Close the output positions opened by this process.
+
+    Parameters
+    ----------
+    output_path : Path, optional
+        Only close this position, by default None closes all positions
+    """
+    for key in list(_OUTPUT_POSITIONS.keys()):
+        pid, path = key
+        if pid != os.getpid():
+            # stale entry inherited from a parent process
+            del _OUTPUT_POSITIONS[key]
+        elif output_path is None or path == str(output_path):
+            _OUTPUT_POSITIONS.pop(key).close()
+
+
+# Reusable float32 ingest buffers, one per thread
+_INGEST_BUFFERS = threading.local()
+
+
+def _czyx_to_tensor(czyx_uint16_numpy: np.ndarray) -> torch.Tensor:
+    """Convert raw CZYX data to a float32 tensor.
+
+    The data is cast directly into a float32 buffer that is reused across
+    calls with the same shape, so no intermediate copies are made and the
+    steady-state allocation per time point is zero. The buffer only grows,
+    so smaller inputs (e.g. edge tiles) reuse it too. The returned tensor is
+    overwritten by the next call in the same thread.
+    """
+    buffer = getattr(_INGEST_BUFFERS, "buffer", None)
+    if buffer is None or buffer.size < czyx_uint16_numpy.size:
+        buffer = np.empty(czyx_uint16_numpy.size, dtype=np.float32)
+        _INGEST_BUFFERS.buffer = buffer
+    czyx_float32_numpy = buffer[: czyx_uint16_numpy.size].reshape(
+        czyx_uint16_numpy.shape
+    )
+    np.copyto(czyx_float32_numpy, czyx_uint16_numpy, casting="unsafe")
+    return torch.from_numpy(czyx_float32_numpy)
+
+
+def _shares_memory(tensor_a: torch.Tensor, tensor_b: torch.Tensor) -> bool:
+    return (
+        tensor_a.untyped_storage().data_ptr()
+        == tensor_b.untyped_storage().data_ptr()
+    )
+
+
+# Position attribute holding, per channel name, the "scale" and "offset"
+# that decode integer outputs: value = stored * scale + offset
+# OME-NGFF has no field for intensity scaling: coordinateTransformations only
+# apply to the spatial and time axes, and the omero channel "window" holds
+# display contrast limits that viewers and users overwrite. Readers that do
+# not know this attribute see the stored integers.
+OUTPUT_SCALING_KEY = "output_scaling"
+
+
+def estimate_output_scaling(
+    reconstruction_czyx, dtype: DTypeLike = np.uint16, margin: float = 0.25
+) -> list[dict]:
+    """Per-channel scale and offset that map a sample reconstruction, with a
+    `margin` of its range on either side, onto the range of `dtype`.
+
+    Parameters
+    ----------
+    reconstruction_czyx : array-like
+        Sample reconstruction, e.g. of the first time point
+    dtype : DTypeLike, optional
+        Integer output dtype, by default np.uint16
+    margin : float, optional
+        Fraction of each channel's range added below and above it,
+        by default 0.25. Values outside the range are clipped.
+
+    Returns
+    -------
+    list[dict]
+        One {"scale", "offset"} dict per channel
+    """
+    dtype_max = np.iinfo(dtype).max
+    scaling = []
+    for zyx_data in np.asarray(reconstruction_czyx, dtype=np.float64):
+        low, high = np.nanmin(zyx_data), np.nanmax(zyx_data)
+        span = high - low if high > low else 1.0
+        low, high = low - margin * span, high + margin * span
+        scaling.append(
+            {"scale": float((high - low) / dtype_max), "offset": float(low)}
+        )
+    return scaling
+
+
+def set_output_scaling(
+    output_dataset: Position, channel_names: list[str], scaling: list[dict]
+) -> None:
+    """Store the decoding scale and offset of integer output channels."""
+    output_scaling = dict(output_dataset.zattrs.get(OUTPUT_SCALING_KEY, {}))
+    output_scaling.update(dict(zip(channel_names, scaling)))
+    output_dataset.zattrs[OUTPUT_SCALING_KEY] = output_scaling
+
+
+def _output_scaling(output_dataset: Position, output_channel_indices):
+    # (scale, offset) arrays of integer outputs, None for float outputs
+    if not np.issubdtype(output_dataset[0].dtype, np.integer):
+        return None
+    output_scaling = output_dataset.zattrs.get(OUTPUT_SCALING_KEY, {})
+    channel_names = [
+        output_dataset.channel_names[i] for i in output_channel_indices
+    ]
+    missing_names = set(channel_names) - set(output_scaling)
+    if missing_names:
+        raise ValueError(
+            f"Integer output channels {sorted(missing_names)} have no "
+            f"{OUTPUT_SCALING_KEY} metadata, see set_output_scaling."
+        )
+    return tuple(
+        np.array(
+            [output_scaling[name][key] for name in channel_names],
+            dtype=np.float32,
+        )
+        for key in ("scale", "offset")
+    )
+
+
+def _expand_channel_axis(values: np.ndarray, ndim: int, channel_axis: int):
+    return values.reshape(values.shape + (1,) * (ndim - channel_axis - 1))
+
+
+def _encode_output(
+    output_dataset: Position,
+    output_channel_indices: list[int],
+    reconstruction,
+    channel_axis: int = 0,
+) -> np.ndarray:
+    """Convert a float reconstruction to the output dtype, quantizing
+    integer outputs with their per-channel scale and offset."""
+    reconstruction = np.asarray(reconstruction)
+    scaling = _output_scaling(output_dataset, output_channel_indices)
+    if scaling is None:
+        return reconstruction
+
+    scale, offset = (
+        _expand_channel_axis(values, reconstruction.ndim, channel_axis)
+        for values in scaling
+    )
+    dtype = output_dataset[0].dtype
+    dtype_max = np.iinfo(dtype).max
+    encoded = np.nan_to_num((reconstruction - offset) / scale)
+    np.rint(encoded, out=encoded)
+    num_clipped = np.count_nonzero((encoded < 0) | (encoded > dtype_max))
+    if num_clipped:
+        warnings.warn(
+            f"{num_clipped} of {encoded.size} voxels are outside the "
+            f"{dtype} output range estimated from the first time point and "
+            "are clipped. Use a float output dtype to keep them."
+        )
+    np.clip(encoded, 0, dtype_max, out=encoded)
+    return encoded.astype(dtype)
+
+
+def _decode_output(
+    output_dataset: Position,
+    output_channel_indices: list[int],
+    stored,
+    channel_axis: int = 0,
+) -> np.ndarray:
+    """Inverse of `_encode_output`, returns float32."""
+    stored = np.asarray(stored)
+    scaling = _output_scaling(output_dataset, output_channel_indices)
+    if scaling is None:
+        return stored.astype(np.float32, copy=False)
+
+    scale, offset = (
+        _expand_channel_axis(values, stored.ndim, channel_axis)
+        for values in scaling
+    )
+    return stored * scale + offset
+
+
+def _write_czyx(
+    output_path: Path,
+    t_idx: int,
+    output_channel_indices: list[int],
+    reconstruction_czyx,
+    reuse_output_handle: bool = True,
+) -> None:
+    if reuse_output_handle:
+        output_dataset = get_output_position(output_path)
+        output_dataset[0].oindex[t_idx, output_channel_indices] = (
+            _encode_output(
+                output_dataset, output_channel_indices, reconstruction_czyx
+            )
+        )
+    else:
+        with open_ome_zarr(output_path, mode="r+") as output_dataset:
+            output_dataset[0].oindex[t_idx, output_channel_indices] = (
+                _encode_output(
+                    output_dataset,
+                    output_channel_indices,
+                    reconstruction_czyx,
+                )
+            )
 
 
 def apply_inverse_to_zyx_and_save(
@@ -82,25 +454,514 @@ def apply_inverse_to_zyx_and_save(
     input_channel_indices: list[int],
     output_channel_indices: list[int],
     t_idx: int = 0,
+    reuse_output_handle: bool = True,
     **kwargs,
 ) -> None:
-    """Load a zyx array from a Position object, apply a transformation and save the result to file"""
+    """Load a zyx array from a Position object, apply a transformation and save the result to file
+
+    With `reuse_output_handle` the output position is opened once per process
+    (see `get_output_position`) and must be closed with
+    `close_output_positions`, otherwise it is opened and closed per call.
+    """
     click.echo(f"Reconstructing t={t_idx}")
 
     # Load data
     czyx_uint16_numpy = position.data.oindex[t_idx, input_channel_indices]
-
-    # convert to np.int32 (torch doesn't accept np.uint16), then convert to tensor float32
-    czyx_data = torch.tensor(np.int32(czyx_uint16_numpy), dtype=torch.float32)
+    czyx_data = _czyx_to_tensor(czyx_uint16_numpy)
 
     # Apply transformation
     reconstruction_czyx = func(czyx_data, **kwargs)
 
     # Write to file
-    # for c, recon_zyx in enumerate(reconstruction_zyx):
-    with open_ome_zarr(output_path, mode="r+") as output_dataset:
-        output_dataset[0].oindex[
-            t_idx, output_channel_indices
-        ] = reconstruction_czyx
+    _write_czyx(
+        output_path,
+        t_idx,
+        output_channel_indices,
+        reconstruction_czyx,
+        reuse_output_handle,
+    )
+    click.echo(f"Finished Writing.. t={t_idx}")
+
+
+def _yx_tiles(Y: int, X: int, tile_size: int):
+    for y in range(0, Y, tile_size):
+        for x in range(0, X, tile_size):
+            yield (
+                slice(y, min(y + tile_size, Y)),
+                slice(x, min(x + tile_size, X)),
+            )
+
+
+def apply_inverse_to_zyx_and_save_tiled(
+    func,
+    position: Position,
+    output_path: Path,
+    input_channel_indices: list[int],
+    output_channel_indices: list[int],
+    t_idx: int = 0,
+    tile_size: int = 512,
+    z_local: bool = False,
+    yx_sliced_kwargs: Tuple[str] = ("cyx_no_sample_data",),
+    **kwargs,
+) -> None:
+    """Apply a pixel-local reconstruction tile by tile and write each tile
+    directly to the output, so peak memory is one tile instead of one volume.
+
+    Only valid for reconstructions where each output pixel depends on the
+    input pixels at the same YX position (and, with `z_local`, the same Z).
+
+    Parameters
+    ----------
+    func : Callable
+        Pixel-local reconstruction function applied to each CZYX tile
+    position : Position
+        Input position
+    output_path : Path
+        Output position path
+    input_channel_indices : list[int]
+    output_channel_indices : list[int]
+    t_idx : int, optional
+        Time index, by default 0
+    tile_size : int, optional
+        Edge length of the YX tiles in pixels, by default 512
+    z_local : bool, optional
+        Also stream single Z-slices, by default False.
+        Use False for reconstructions that project along Z.
+    yx_sliced_kwargs : Tuple[str], optional
+        Keyword arguments of `func` holding (..., Y, X) arrays that are cropped
+        to each tile, by default ("cyx_no_sample_data",)
+    """
+    click.echo(f"Reconstructing t={t_idx} in {tile_size}px tiles")
+
+    _, _, Z, Y, X = position.data.shape
+    output_dataset = get_output_position(output_path)
+    z_slices = (
+        [slice(z, z + 1) for z in range(Z)] if z_local else [slice(None)]
+    )
+
+    for z_slice in z_slices:
+        for y_slice, x_slice in _yx_tiles(Y, X, tile_size):
+            czyx_uint16_numpy = position.data.oindex[
+                t_idx, input_channel_indices, z_slice, y_slice, x_slice
+            ]
+            tile_kwargs = {
+                key: (
+                    value[..., y_slice, x_slice]
+                    if key in yx_sliced_kwargs and value is not None
+                    else value
+                )
+                for key, value in kwargs.items()
+            }
+            reconstruction_czyx = func(
+                _czyx_to_tensor(czyx_uint16_numpy), **tile_kwargs
+            )
+            output_dataset[0].oindex[
+                t_idx, output_channel_indices, z_slice, y_slice, x_slice
+            ] = _encode_output(
+                output_dataset, output_channel_indices, reconstruction_czyx
+            )
+
+    click.echo(f"Finished Writing.. t={t_idx}")
+
+
+def _overlap_tiles_along_axis(
+    length: int, tile_size: int, window_size: int, tile_overlap: int
+):
+    """Yield (window slice, write slice, blend weights over the write slice)
+    for each tile along one axis.
+
+    Every window has the same `window_size`, so one transfer function fits
+    all tiles; windows at the borders are shifted inwards instead of shrunk.
+    Each tile writes its core plus half the blend band on both sides, and
+    ramps in linearly over the band it shares with the previous tile.
+    """
+    half_blend = min(tile_overlap, tile_size) // 2
+    blend_ramp = (np.arange(2 * half_blend, dtype=np.float32) + 0.5) / max(
+        2 * half_blend, 1
+    )
+    for start in range(0, length, tile_size):
+        stop = min(start + tile_size, length)
+        window_start = min(max(start - tile_overlap, 0), length - window_size)
+        write_start = max(start - half_blend, 0)
+        write_stop = min(stop + half_blend, length)
+
+        weights = np.ones(write_stop - write_start, dtype=np.float32)
+        if start > 0:
+            num_ramp = min(len(blend_ramp), len(weights))
+            weights[:num_ramp] = blend_ramp[:num_ramp]
+
+        yield (
+            slice(window_start, window_start + window_size),
+            slice(write_start, write_stop),
+            weights,
+        )
+
+
+def apply_inverse_to_zyx_and_save_overlap_tiled(
+    func,
+    position: Position,
+    output_path: Path,
+    input_channel_indices: list[int],
+    output_channel_indices: list[int],
+    t_idx: int = 0,
+    tile_size: int = 512,
+    tile_overlap: int = 32,
+    yx_sliced_kwargs: Tuple[str] = ("cyx_no_sample_data",),
+    **kwargs,
+) -> None:
+    """Apply a deconvolution to overlapping YX tiles and blend them into the
+    output, so peak memory is set by the tile size instead of the volume.
+
+    Each tile is reconstructed from a window extended by `tile_overlap`
+    pixels of its neighbours, which absorbs the edge artifacts of the
+    Fourier-space inverse. The transfer functions passed in `kwargs` must be
+    computed for the window shape, see
+    `recOrder.cli.compute_transfer_function.transfer_function_zyx_shape`.
+
+    Parameters
+    ----------
+    func : Callable
+        Reconstruction function applied to each CZYX window
+    position : Position
+        Input position
+    output_path : Path
+        Output position path
+    input_channel_indices : list[int]
+    output_channel_indices : list[int]
+    t_idx : int, optional
+        Time index, by default 0
+    tile_size : int, optional
+        Edge length of the YX tiles in pixels, by default 512
+    tile_overlap : int, optional
+        Halo around each tile in pixels, by default 32.
+        Adjacent tiles are blended over a band of this width, capped at
+        `tile_size`.
+    yx_sliced_kwargs : Tuple[str], optional
+        Keyword arguments of `func` holding (..., Y, X) arrays that are cropped
+        to each window, by default ("cyx_no_sample_data",)
+    """
+    click.echo(
+        f"Reconstructing t={t_idx} in {tile_size}px tiles "
+        f"with {tile_overlap}px overlap"
+    )
+
+    _, _, _, Y, X = position.data.shape
+    output_dataset = get_output_position(output_path)
+    window_size = tile_size + 2 * tile_overlap
+    x_tiles = list(
+        _overlap_tiles_along_axis(
+            X, tile_size, min(window_size, X), tile_overlap
+        )
+    )
+
+    for y_window, y_write, y_weights in _overlap_tiles_along_axis(
+        Y, tile_size, min(window_size, Y), tile_overlap
+    ):
+        for x_window, x_write, x_weights in x_tiles:
+            czyx_uint16_numpy = position.data.oindex[
+                t_idx, input_channel_indices, :, y_window, x_window
+            ]
+            window_kwargs = {
+                key: (
+                    value[..., y_window, x_window]
+                    if key in yx_sliced_kwargs and value is not None
+                    else value
+                )
+                for key, value in kwargs.items()
+            }
+            reconstruction_czyx = np.asarray(
+                func(_czyx_to_tensor(czyx_uint16_numpy), **window_kwargs)
+            )[
+                ...,
+                y_write.start - y_window.start : y_write.stop - y_window.start,
+                x_write.start - x_window.start : x_write.stop - x_window.start,
+            ]
+
+            # Blend with the overlapping tiles that were already written
+            weights = y_weights[:, None] * x_weights[None, :]
+            if np.any(weights < 1):
+                written_czyx = _decode_output(
+                    output_dataset,
+                    output_channel_indices,
+                    output_dataset[0].oindex[
+                        t_idx, output_channel_indices, :, y_write, x_write
+                    ],
+                )
+                reconstruction_czyx = written_czyx + weights * (
+                    reconstruction_czyx - written_czyx
+                )
+
+            output_dataset[0].oindex[
+                t_idx, output_channel_indices, :, y_write, x_write
+            ] = _encode_output(
+                output_dataset, output_channel_indices, reconstruction_czyx
+            )
+
     click.echo(f"Finished Writing.. t={t_idx}")
 
+
+def available_memory_bytes() -> int:
+    """Memory available to this job: the SLURM allocation when running in a
+    SLURM job, otherwise the free memory of the machine."""
+    if "SLURM_MEM_PER_NODE" in os.environ:
+        return int(os.environ["SLURM_MEM_PER_NODE"]) * 2**20
+    if "SLURM_MEM_PER_CPU" in os.environ:
+        num_cpus = int(os.environ.get("SLURM_CPUS_PER_TASK", 1))
+        return int(os.environ["SLURM_MEM_PER_CPU"]) * num_cpus * 2**20
+    return psutil.virtual_memory().available
+
+
+def auto_time_batch_size(
+    czyx_shape: tuple,
+    num_time_points: int,
+    resource_multiplier: int = 4,
+    memory_fraction: float = 0.25,
+) -> int:
+    """Number of time points to reconstruct per batch so that a batch uses
+    at most `memory_fraction` of the available memory.
+
+    Parameters
+    ----------
+    czyx_shape : tuple
+        Shape of one time point of the input data
+    num_time_points : int
+        Number of time points to reconstruct
+    resource_multiplier : int, optional
+        Working memory of the reconstruction in multiples of the float32
+        input, by default 4
+    memory_fraction : float, optional
+        Fraction of the available memory a batch may use, by default 0.25
+
+    Returns
+    -------
+    int
+    """
+    bytes_per_time_point = np.prod(czyx_shape) * 4 * resource_multiplier
+    batch_size = int(
+        memory_fraction * available_memory_bytes() // bytes_per_time_point
+    )
+    return int(np.clip(batch_size, 1, max(num_time_points, 1)))
+
+
+def apply_inverse_to_zyx_and_save_batched(
+    func,
+    position: Position,
+    output_path: Path,
+    input_channel_indices: list[int],
+    output_channel_indices: list[int],
+    time_indices: list[int],
+    batch_size: int = 1,
+    yx_sliced_kwargs: Tuple[str] = ("cyx_no_sample_data",),
+    on_written: Optional[Callable[[list[int]], None]] = None,
+    **kwargs,
+) -> None:
+    """Reconstruct batches of time points with one call of `func` each, and
+    write each batch with a single write.
+
+    The CZYX volumes of a batch are concatenated along Y, so this is only
+    valid for reconstructions where each output pixel depends on the input
+    pixels at the same YX position, e.g. 2D birefringence.
+
+    Parameters
+    ----------
+    func : Callable
+        Pixel-local reconstruction function applied to each batch
+    position : Position
+        Input position
+    output_path : Path
+        Output position path
+    input_channel_indices : list[int]
+    output_channel_indices : list[int]
+    time_indices : list[int]
+        Time indices to reconstruct
+    batch_size : int, optional
+        Number of time points per batch, by default 1
+    yx_sliced_kwargs : Tuple[str], optional
+        Keyword arguments of `func` holding (..., Y, X) arrays that are
+        repeated along Y for each time point in the batch,
+        by default ("cyx_no_sample_data",)
+    on_written : Callable[[list[int]], None], optional
+        Called with the time indices of each batch once it is written,
+        by default None
+    """
+    _, _, Z, Y, X = position.data.shape
+    output_dataset = get_output_position(output_path)
+    time_indices = list(time_indices)
+
+    for batch_start in range(0, len(time_indices), batch_size):
+        batch_time_indices = time_indices[
+            batch_start : batch_start + batch_size
+        ]
+        K = len(batch_time_indices)
+        click.echo(
+            f"Reconstructing t={batch_time_indices[0]}..."
+            f"{batch_time_indices[-1]} ({K} time points)"
+        )
+
+        # (K, C, Z, Y, X) -> (C, Z, K * Y, X), cast and transposed in one copy
+        tczyx_uint16_numpy = position.data.oindex[
+            batch_time_indices, input_channel_indices
+        ]
+        czyx_data = _czyx_to_tensor(
+            tczyx_uint16_numpy.transpose(1, 2, 0, 3, 4)
+        ).reshape(len(input_channel_indices), Z, K * Y, X)
+        batch_kwargs = {
+            key: (
+                torch.cat([torch.as_tensor(value)] * K, dim=-2)
+                if key in yx_sliced_kwargs and value is not None
+                else value
+            )
+            for key, value in kwargs.items()
+        }
+        reconstruction_czyx = func(czyx_data, **batch_kwargs)
+
+        # (C, Z, K * Y, X) -> (K, C, Z, Y, X)
+        C_out, Z_out = reconstruction_czyx.shape[:2]
+        reconstruction_tczyx = reconstruction_czyx.reshape(
+            C_out, Z_out, K, Y, X
+        ).permute(2, 0, 1, 3, 4)
+        output_dataset[0].oindex[
+            batch_time_indices, output_channel_indices
+        ] = _encode_output(
+            output_dataset,
+            output_channel_indices,
+            reconstruction_tczyx,
+            channel_axis=1,
+        )
+
+        if on_written is not None:
+            on_written(batch_time_indices)
+        click.echo(f"Finished Writing.. t={batch_time_indices}")
+
+
+# Marks the end of a pipeline queue
+_END_OF_QUEUE = object()
+
+
+def _put_unless_stopped(q: queue.Queue, item, stop: threading.Event) -> bool:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get_unless_stopped(q: queue.Queue, stop: threading.Event):
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            pass
+    return _END_OF_QUEUE
+
+
+def apply_inverse_to_zyx_and_save_pipelined(
+    func,
+    position: Position,
+    output_path: Path,
+    input_channel_indices: list[int],
+    output_channel_indices: list[int],
+    time_indices: list[int],
+    queue_depth: int = 2,
+    on_written: Optional[Callable[[list[int]], None]] = None,
+    **kwargs,
+) -> None:
+    """Apply `apply_inverse_to_zyx_and_save` to many time points while
+    overlapping disk I/O with compute.
+
+    A background reader prefetches up to `queue_depth` time points while the
+    current one is reconstructed, and a background writer drains up to
+    `queue_depth` finished reconstructions to the output position. Peak
+    memory grows by roughly `queue_depth` input and output volumes.
+
+    Parameters
+    ----------
+    func : Callable
+        Reconstruction function applied to each CZYX tensor
+    position : Position
+        Input position
+    output_path : Path
+        Output position path
+    input_channel_indices : list[int]
+    output_channel_indices : list[int]
+    time_indices : list[int]
+    queue_depth : int, optional
+        Maximum number of prefetched inputs and pending outputs, by default 2
+    on_written : Callable[[list[int]], None], optional
+        Called with `[t_idx]` once each time point is written, from the
+        writer thread, by default None
+    """
+    read_queue = queue.Queue(maxsize=queue_depth)
+    write_queue = queue.Queue(maxsize=queue_depth)
+    stop = threading.Event()
+    errors = []
+
+    def read():
+        try:
+            for t_idx in time_indices:
+                czyx_uint16_numpy = position.data.oindex[
+                    t_idx, input_channel_indices
+                ]
+                if not _put_unless_stopped(
+                    read_queue, (t_idx, czyx_uint16_numpy), stop
+                ):
+                    return
+            _put_unless_stopped(read_queue, _END_OF_QUEUE, stop)
+        except BaseException as exc:
+            errors.append(exc)
+            stop.set()
+
+    def write():
+        try:
+            while True:
+                item = _get_unless_stopped(write_queue, stop)
+                if item is _END_OF_QUEUE:
+                    return
+                t_idx, reconstruction_czyx = item
+                _write_czyx(
+                    output_path,
+                    t_idx,
+                    output_channel_indices,
+                    reconstruction_czyx,
+                )
+                if on_written is not None:
+                    on_written([t_idx])
+                click.echo(f"Finished Writing.. t={t_idx}")
+        except BaseException as exc:
+            errors.append(exc)
+            stop.set()
+
+    reader = threading.Thread(target=read, daemon=True)
+    writer = threading.Thread(target=write, daemon=True)
+    reader.start()
+    writer.start()
+    try:
+        while True:
+            item = _get_unless_stopped(read_queue, stop)
+            if item is _END_OF_QUEUE:
+                break
+            t_idx, czyx_uint16_numpy = item
+            click.echo(f"Reconstructing t={t_idx}")
+            czyx_data = _czyx_to_tensor(czyx_uint16_numpy)
+            reconstruction_czyx = func(czyx_data, **kwargs)
+            # the ingest buffer is reused for the next time point
+            if torch.is_tensor(reconstruction_czyx) and _shares_memory(
+                reconstruction_czyx, czyx_data
+            ):
+                reconstruction_czyx = reconstruction_czyx.clone()
+            if not _put_unless_stopped(
+                write_queue, (t_idx, reconstruction_czyx), stop
+            ):
+                break
+        _put_unless_stopped(write_queue, _END_OF_QUEUE, stop)
+    except BaseException as exc:
+        errors.append(exc)
+        stop.set()
+    finally:
+        reader.join()
+        writer.join()
+
+    if errors:
+        raise errors[0]
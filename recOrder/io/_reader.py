@@ -1,5 +1,6 @@
-from typing import Dict, List, Tuple, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
+import numpy as np
 import zarr
 from iohub import read_micromanager
 from napari_ome_zarr._reader import napari_get_reader as fallback_reader
@@ -12,13 +13,88 @@ def napari_get_reader(path):
                 if "plate" in root.attrs:
                     return hcs_zarr_reader
                 else:
-                    return fallback_reader(path)
+                    return _rescaled_reader(
+                        fallback_reader(path), root.attrs.asdict()
+                    )
         else:
             return ome_tif_reader
     else:
         return None
 
 
+def _is_reduced_precision(array: zarr.Array, position_attrs: dict) -> bool:
+    is_integer = np.issubdtype(array.dtype, np.integer)
+    return array.dtype == np.float16 or (
+        is_integer and bool(position_attrs.get("output_scaling"))
+    )
+
+
+def _rescale_output(array: zarr.Array, position_attrs: dict):
+    """Lazily decode reduced-precision reconstructions to float32.
+
+    Integer channels listed in the "output_scaling" position attribute are
+    decoded as stored * scale + offset, and float16 arrays are cast.
+    """
+    if not _is_reduced_precision(array, position_attrs):
+        return array
+    output_scaling = position_attrs["output_scaling"]
+    is_integer = np.issubdtype(array.dtype, np.integer)
+
+    import dask.array as da
+
+    if not isinstance(array, da.Array):
+        array = da.from_zarr(array)
+    data = array.astype(np.float32)
+    if is_integer:
+        channel_names = [
+            channel["label"] for channel in position_attrs["omero"]["channels"]
+        ]
+        scale, offset = (
+            np.array(
+                [
+                    output_scaling.get(name, {}).get(key, default)
+                    for name in channel_names
+                ],
+                dtype=np.float32,
+            )[:, None, None, None]
+            for key, default in (("scale", 1.0), ("offset", 0.0))
+        )
+        data = data * scale + offset
+    return data
+
+
+def _rescaled_reader(
+    reader: Optional[Callable], position_attrs: dict
+) -> Optional[Callable]:
+    """Wrap the napari-ome-zarr reader of a single position, to decode its
+    reduced-precision reconstructions like `hcs_zarr_reader`."""
+    if reader is None:
+        return None
+
+    def read(path):
+        layers = []
+        for data, kwargs, *layer_type in reader(path):
+            # multiscale images are a list of levels
+            levels = data if isinstance(data, (list, tuple)) else [data]
+            if layer_type in ([], ["image"]) and _is_reduced_precision(
+                levels[0], position_attrs
+            ):
+                levels = [
+                    _rescale_output(level, position_attrs) for level in levels
+                ]
+                data = levels if isinstance(data, (list, tuple)) else levels[0]
+                # the stored contrast limits are in stored values
+                kwargs = {
+                    key: value
+                    for key, value in kwargs.items()
+                    if key != "contrast_limits"
+                }
+            layers.append((data, kwargs, *layer_type))
+        return layers
+
+    return read
+
+
 def hcs_zarr_reader(
     path: Union[str, List[str]]
 ) -> List[Tuple[zarr.Array, Dict]]:
@@ -27,6 +103,7 @@ def hcs_zarr_reader(
 
     zs = zarr.open(path, "r")
     names = []
+    position_paths = []
 
     dict_ = zs.attrs.asdict()
     wells = dict_["plate"]["wells"]
@@ -35,11 +112,15 @@ def hcs_zarr_reader(
         well_dict = zs[path].attrs.asdict()
         for name in well_dict["well"]["images"]:
             names.append(name["path"])
+            position_paths.append(f"{path}/{name['path']}")
     for pos in range(reader.get_num_positions()):
         meta = dict()
         name = names[pos]
         meta["name"] = name
-        results.append((reader.get_zarr(pos), meta))
+        position_attrs = zs[position_paths[pos]].attrs.asdict()
+        results.append(
+            (_rescale_output(reader.get_zarr(pos), position_attrs), meta)
+        )
     return results
 
 
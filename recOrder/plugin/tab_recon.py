@@ -1,5 +1,5 @@
 import os, json, subprocess, time, datetime, uuid
-import socket, threading
+import threading, queue
 from pathlib import Path
 
 from qtpy import QtCore
@@ -20,7 +20,7 @@ try:
 except:pass
 
 from recOrder.io import utils
-from recOrder.cli import settings, jobs_mgmt
+from recOrder.cli import daemon, settings, jobs_mgmt
 
 import concurrent.futures
 
@@ -83,6 +83,11 @@ JOB_COMPLETION_STR = "Job completed successfully"
 JOB_RUNNING_STR = "Starting with JobEnvironment"
 JOB_TRIGGERED_EXC = "Submitted job triggered an exception"
 JOB_OOM_EVENT = "oom_kill event"
+# One shared timer refreshes the log text of the running jobs between their
+# pushed states. Jobs without new log output are checked for errors after
+# JOB_SILENT_CHECK seconds and end after jobs_mgmt.JOBS_TIMEOUT minutes.
+JOB_LOG_REFRESH = 2  # seconds
+JOB_SILENT_CHECK = 10  # seconds
 
 _validate_alert = "⚠"
 _validate_ok = "✔️"
@@ -106,7 +111,6 @@ HAS_INSTANCE = {"val": False, "instance": None}
 
 # Components Queue list for new Jobs spanned from single processing
 NEW_WIDGETS_QUEUE = []
-NEW_WIDGETS_QUEUE_THREADS = []
 MULTI_JOBS_REFS = {}
 ROW_POP_QUEUE = []
 
@@ -1072,6 +1076,7 @@ class Ui_ReconTab_Form(QWidget):
         if self.confirm_dialog():
             btn.enabled = False
             btn.text = btn.text + " (cancel called)"
+            self.worker.post_job_event("cancel")
 
     def add_widget(
         self, parentLayout: QVBoxLayout, expID, jID, table_entry_ID="", pos=""
@@ -1135,6 +1140,7 @@ class Ui_ReconTab_Form(QWidget):
             "infobox"
         ] = _scrollAreaCollapsibleBoxDisplayWidget
         NEW_WIDGETS_QUEUE.remove(expID + jID)
+        self.worker.post_job_event("widgets", expID + jID)
 
     def add_table_entry_job(self, proc_params):
 
@@ -2761,14 +2767,41 @@ class MyWorker:
         # jobs_mgmt.shared_var_jobs = self.JobsManager.shared_var_jobs
         self.JobsMgmt = jobs_mgmt.JobsManagement()
         self.useServer = True
-        self.serverRunning = True
-        self.server_socket = None
+        self.listener = None
+        # Jobs registered by the CLI clients, keyed by the client's
+        # (uID, jID). One dispatcher thread updates them from the events in
+        # job_events, there is no thread or polling loop per job.
+        self.jobs = {}
+        self.job_events = queue.Queue()
+        # jobs waiting for the table entry of their experiment, by expID
+        self.pending_entries = {}
+        # jobs waiting for their widgets, by expID + jID
+        self.pending_widgets = {}
+        # primary jobs waiting for the other jobs of their experiment
+        self.pending_releases = {}
+        # worker threads are kept referenced until they finish
+        self.qthreads = []
+        self.log_refresh_timer = QtCore.QTimer()
+        self.log_refresh_timer.setInterval(JOB_LOG_REFRESH * 1000)
+        self.log_refresh_timer.timeout.connect(self.refresh_job_logs)
+        self.log_refresh_timer.start()
+        # Jobs are sent to a `recorder daemon` reconstruction service when
+        # one is running, instead of a `recorder reconstruct` subprocess
+        self.useDaemon = True
+        self.daemon_process = None
         self.isInitialized = False
 
     def initialize(self):
         if not self.isInitialized:
             thread = threading.Thread(target=self.start_server)
             thread.start()
+            thread = threading.Thread(
+                target=self.dispatch_job_events, daemon=True
+            )
+            thread.start()
+            if self.useDaemon:
+                thread = threading.Thread(target=self.start_daemon)
+                thread.start()
             self.workerThreadRowDeletion = RowDeletionWorkerThread(
                 self.formLayout
             )
@@ -2800,41 +2833,133 @@ class MyWorker:
             if not self.useServer:
                 return
 
-            self.server_socket = socket.socket(
-                socket.AF_INET, socket.SOCK_STREAM
+            # a single thread waits on all client sockets and dispatches
+            # their messages to on_client_message()
+            self.listener = jobs_mgmt.JobEventListener(
+                self.on_client_message,
+                on_disconnect=self.on_client_disconnect,
             )
-            self.server_socket.bind(("localhost", jobs_mgmt.SERVER_PORT))
-            self.server_socket.listen(
-                50
-            )  # become a server socket, maximum 50 connections
-
-            while self.serverRunning:
-                client_socket, address = self.server_socket.accept()
-                if self.ui is not None and not self.ui.isVisible():
-                    break
-                try:
-                    # dont block the server thread
-                    thread = threading.Thread(
-                        target=self.decode_client_data,
-                        args=("", "", "", "", client_socket),
-                    )
-                    thread.start()
-                except Exception as exc:
-                    print(exc.args)
-                    time.sleep(1)
-
-            self.server_socket.close()
+            self.listener.serve_forever()
         except Exception as exc:
-            if not self.serverRunning:
-                self.serverRunning = True
-                return  # ignore - will cause an exception on napari close but that is fine and does the job
             print(exc.args)
 
     def stop_server(self):
         try:
-            if self.server_socket is not None:
-                self.serverRunning = False
-                self.server_socket.close()
+            if self.listener is not None:
+                self.listener.stop()
+        except Exception as exc:
+            print(exc.args)
+        self.stop_daemon()
+
+    def on_client_message(self, message, client_socket):
+        if self.ui is not None and not self.ui.isVisible():
+            self.listener.stop()
+            return
+        # dont block the listener thread
+        self.post_job_event("message", message, client_socket)
+
+    def refresh_job_logs(self):
+        # on the main thread, the dispatcher reads the logs
+        if len(self.jobs) > 0:
+            self.post_job_event("refresh")
+
+    def on_client_disconnect(self, client_socket):
+        self.post_job_event("disconnected", client_socket)
+
+    def post_job_event(self, event, *args):
+        self.job_events.put((event, args))
+
+    # The only thread that updates the jobs of the CLI clients. It sleeps until
+    # one of these events arrives:
+    # "message" - a message of a client: job registrations, which add the job
+    #   to the table, or a job state pushed by the client
+    # "table_entry" - the table entry of an experiment started outside this
+    #   GUI was added on the main thread
+    # "widgets" - the widgets of a job after the first of its experiment were
+    #   added on the main thread
+    # "cancel" - the user cancelled a job
+    # "refresh" - the log refresh timer fired while jobs are running
+    # "disconnected" - a client closed its connection
+    def dispatch_job_events(self):
+        while True:
+            event, args = self.job_events.get()
+            try:
+                if event == "message":
+                    self.on_job_message(*args)
+                elif event == "table_entry":
+                    for job in self.pending_entries.pop(args[0], []):
+                        self.add_job(job, external=True)
+                elif event == "widgets":
+                    job = self.pending_widgets.pop(args[0], None)
+                    if job is not None:
+                        self.show_job(job)
+                elif event in ("cancel", "refresh"):
+                    for job in list(self.jobs.values()):
+                        self.update_job(job)
+                elif event == "disconnected":
+                    for job in list(self.jobs.values()):
+                        if job["client_socket"] is args[0]:
+                            job["client_gone"] = True
+                            self.update_job(job)
+            except Exception as exc:
+                print(exc.args)
+
+    def on_job_message(self, message, client_socket):
+        if "status" in message:
+            # a job state pushed by the client
+            job = self.jobs.get((message["uID"], str(message["jID"])))
+            if job is not None:
+                job["status"] = message["status"]
+                # the time-out for log output restarts with the new state
+                job["last_output_time"] = time.monotonic()
+                self.update_job(job)
+            return
+        if "jobs" in message:
+            # a batch of job registrations, decoded one job at a time
+            messages = [{job["uID"]: job} for job in message["jobs"]]
+        else:
+            messages = [message]
+        for message in messages:
+            if "CoNvErTeR" in message:
+                # waits for its table entry, keep the events moving
+                thread = threading.Thread(
+                    target=self.decode_client_data,
+                    args=("", "", "", "", client_socket, message),
+                )
+                thread.start()
+                continue
+            self.decode_client_data("", "", "", "", client_socket, message)
+
+    def start_qthread(self, thread: QThread):
+        self.qthreads = [t for t in self.qthreads if t.isRunning()]
+        self.qthreads.append(thread)
+        thread.start()
+
+    def start_daemon(self):
+        # Start a reconstruction service unless one is already running, jobs
+        # use subprocesses until it accepts connections. It runs as many jobs
+        # at once as the GUI submits.
+        try:
+            if not daemon.is_service_running():
+                self.daemon_process = subprocess.Popen(
+                    [
+                        "python",
+                        str(jobs_mgmt.FILE_PATH),
+                        "daemon",
+                        "-j",
+                        str(max(1, self.threadPool)),
+                    ]
+                )
+        except Exception as exc:
+            print(exc.args)
+
+    def stop_daemon(self):
+        # Only stop the service started by this GUI
+        try:
+            if self.daemon_process is not None:
+                with daemon.ReconstructionClient(timeout=5) as client:
+                    client.send("shutdown")
+                self.daemon_process = None
         except Exception as exc:
             print(exc.args)
 
@@ -2858,628 +2983,540 @@ class MyWorker:
     # and is responsible for parsing each well/pos Job if the case may be and starting individual update threads 
     # using the tableUpdateAndCleaupThread() method
     # This is also handling an unused "CoNvErTeR" functioning that can be implemented on 3rd party apps
+    # which need to frame their messages like jobs_mgmt.encode_message()
     def decode_client_data(self,
         expIdx="",
         jobIdx="",
         wellName="",
         logs_folder_path="",
-        client_socket=None,):
+        client_socket=None,
+        message=None,):
         
         if client_socket is not None and expIdx == "" and jobIdx == "":
             try:
-                buf = client_socket.recv(10240)
-                if len(buf) > 0:
-                    if b"\n" in buf:
-                        dataList = buf.split(b"\n")
+                json_obj = message
+                if (
+                    "CoNvErTeR" in json_obj
+                ):  # this request came from an agnostic route - requires processing
+                    converter_params = json_obj["CoNvErTeR"]
+                    input_data = converter_params["input"]
+                    output_data = converter_params["output"]
+                    recon_params = converter_params["params"]
+                    expID = recon_params["expID"]
+                    mode = recon_params["mode"]
+                    if "config_path" in recon_params.keys():
+                        config_path = recon_params["config_path"]
                     else:
-                        dataList = [buf]
-                    for data in dataList:
-                        if len(data) > 0:
-                            decoded_string = data.decode()
-                            if (
-                                "CoNvErTeR" in decoded_string
-                            ):  # this request came from an agnostic route - requires processing
-                                json_str = str(decoded_string)
-                                json_obj = json.loads(json_str)
-                                converter_params = json_obj["CoNvErTeR"]
-                                input_data = converter_params["input"]
-                                output_data = converter_params["output"]
-                                recon_params = converter_params["params"]
-                                expID = recon_params["expID"]
-                                mode = recon_params["mode"]
-                                if "config_path" in recon_params.keys():
-                                    config_path = recon_params["config_path"]
-                                else:
-                                    config_path = ""
-
-                                proc_params = {}
-                                proc_params["exp_id"] = expID
-                                proc_params["desc"] = expID
-                                proc_params["input_path"] = str(input_data)
-                                proc_params["output_path"] = str(output_data)
-                                proc_params["output_path_parent"] = str(
-                                    Path(output_data).parent.absolute()
-                                )
-                                proc_params["show"] = False
-                                proc_params["rx"] = 1
+                        config_path = ""
+
+                    proc_params = {}
+                    proc_params["exp_id"] = expID
+                    proc_params["desc"] = expID
+                    proc_params["input_path"] = str(input_data)
+                    proc_params["output_path"] = str(output_data)
+                    proc_params["output_path_parent"] = str(
+                        Path(output_data).parent.absolute()
+                    )
+                    proc_params["show"] = False
+                    proc_params["rx"] = 1
+
+                    if config_path == "":
+                        model = None
+                        if (
+                            len(self.tab_recon.pydantic_classes)
+                            > 0
+                        ):
+                            for (
+                                item
+                            ) in self.tab_recon.pydantic_classes:
+                                if mode == item["selected_modes"]:
+                                    cls = item["class"]
+                                    cls_container = item[
+                                        "container"
+                                    ]
+                                    exclude_modes = item[
+                                        "exclude_modes"
+                                    ]
+                                    output_LineEdit = item[
+                                        "output_LineEdit"
+                                    ]
+                                    output_parent_dir = item[
+                                        "output_parent_dir"
+                                    ]
+                                    full_out_path = os.path.join(
+                                        output_parent_dir,
+                                        output_LineEdit.value,
+                                    )
+
+                                    # gather input/out locations
+                                    output_dir = full_out_path
+                                    if output_data == "":
+                                        output_data = output_dir
+                                        proc_params[
+                                            "output_path"
+                                        ] = str(output_data)
+
+                                    # build up the arguments for the pydantic model given the current container
+                                    if cls is None:
+                                        self.tab_recon.message_box(
+                                            "No model defined !"
+                                        )
+                                        return
+
+                                    pydantic_kwargs = {}
+                                    pydantic_kwargs, ret_msg = (
+                                        self.tab_recon.get_and_validate_pydantic_args(
+                                            cls_container,
+                                            cls,
+                                            pydantic_kwargs,
+                                            exclude_modes,
+                                        )
+                                    )
+                                    if pydantic_kwargs is None:
+                                        self.tab_recon.message_box(
+                                            ret_msg
+                                        )
+                                        return
+
+                                    (
+                                        input_channel_names,
+                                        ret_msg,
+                                    ) = self.tab_recon.clean_string_for_list(
+                                        "input_channel_names",
+                                        pydantic_kwargs[
+                                            "input_channel_names"
+                                        ],
+                                    )
+                                    if input_channel_names is None:
+                                        self.tab_recon.message_box(
+                                            ret_msg
+                                        )
+                                        return
+                                    pydantic_kwargs[
+                                        "input_channel_names"
+                                    ] = input_channel_names
+
+                                    time_indices, ret_msg = (
+                                        self.tab_recon.clean_string_int_for_list(
+                                            "time_indices",
+                                            pydantic_kwargs[
+                                                "time_indices"
+                                            ],
+                                        )
+                                    )
+                                    if time_indices is None:
+                                        self.tab_recon.message_box(
+                                            ret_msg
+                                        )
+                                        return
+                                    pydantic_kwargs[
+                                        "time_indices"
+                                    ] = time_indices
+
+                                    time_indices, ret_msg = (
+                                        self.tab_recon.clean_string_int_for_list(
+                                            "time_indices",
+                                            pydantic_kwargs[
+                                                "time_indices"
+                                            ],
+                                        )
+                                    )
+                                    if time_indices is None:
+                                        self.tab_recon.message_box(
+                                            ret_msg
+                                        )
+                                        return
+                                    pydantic_kwargs[
+                                        "time_indices"
+                                    ] = time_indices
 
-                                if config_path == "":
-                                    model = None
                                     if (
-                                        len(self.tab_recon.pydantic_classes)
-                                        > 0
+                                        "birefringence"
+                                        in pydantic_kwargs.keys()
                                     ):
-                                        for (
-                                            item
-                                        ) in self.tab_recon.pydantic_classes:
-                                            if mode == item["selected_modes"]:
-                                                cls = item["class"]
-                                                cls_container = item[
-                                                    "container"
-                                                ]
-                                                exclude_modes = item[
-                                                    "exclude_modes"
-                                                ]
-                                                output_LineEdit = item[
-                                                    "output_LineEdit"
-                                                ]
-                                                output_parent_dir = item[
-                                                    "output_parent_dir"
-                                                ]
-                                                full_out_path = os.path.join(
-                                                    output_parent_dir,
-                                                    output_LineEdit.value,
-                                                )
-
-                                                # gather input/out locations
-                                                output_dir = full_out_path
-                                                if output_data == "":
-                                                    output_data = output_dir
-                                                    proc_params[
-                                                        "output_path"
-                                                    ] = str(output_data)
-
-                                                # build up the arguments for the pydantic model given the current container
-                                                if cls is None:
-                                                    self.tab_recon.message_box(
-                                                        "No model defined !"
-                                                    )
-                                                    return
-
-                                                pydantic_kwargs = {}
-                                                pydantic_kwargs, ret_msg = (
-                                                    self.tab_recon.get_and_validate_pydantic_args(
-                                                        cls_container,
-                                                        cls,
-                                                        pydantic_kwargs,
-                                                        exclude_modes,
-                                                    )
-                                                )
-                                                if pydantic_kwargs is None:
-                                                    self.tab_recon.message_box(
-                                                        ret_msg
-                                                    )
-                                                    return
-
-                                                (
-                                                    input_channel_names,
-                                                    ret_msg,
-                                                ) = self.tab_recon.clean_string_for_list(
-                                                    "input_channel_names",
-                                                    pydantic_kwargs[
-                                                        "input_channel_names"
-                                                    ],
-                                                )
-                                                if input_channel_names is None:
-                                                    self.tab_recon.message_box(
-                                                        ret_msg
-                                                    )
-                                                    return
-                                                pydantic_kwargs[
-                                                    "input_channel_names"
-                                                ] = input_channel_names
-
-                                                time_indices, ret_msg = (
-                                                    self.tab_recon.clean_string_int_for_list(
-                                                        "time_indices",
-                                                        pydantic_kwargs[
-                                                            "time_indices"
-                                                        ],
-                                                    )
-                                                )
-                                                if time_indices is None:
-                                                    self.tab_recon.message_box(
-                                                        ret_msg
-                                                    )
-                                                    return
-                                                pydantic_kwargs[
-                                                    "time_indices"
-                                                ] = time_indices
-
-                                                time_indices, ret_msg = (
-                                                    self.tab_recon.clean_string_int_for_list(
-                                                        "time_indices",
-                                                        pydantic_kwargs[
-                                                            "time_indices"
-                                                        ],
-                                                    )
-                                                )
-                                                if time_indices is None:
-                                                    self.tab_recon.message_box(
-                                                        ret_msg
-                                                    )
-                                                    return
-                                                pydantic_kwargs[
-                                                    "time_indices"
-                                                ] = time_indices
-
-                                                if (
-                                                    "birefringence"
-                                                    in pydantic_kwargs.keys()
-                                                ):
-                                                    (
-                                                        background_path,
-                                                        ret_msg,
-                                                    ) = self.tab_recon.clean_path_string_when_empty(
-                                                        "background_path",
-                                                        pydantic_kwargs[
-                                                            "birefringence"
-                                                        ]["apply_inverse"][
-                                                            "background_path"
-                                                        ],
-                                                    )
-                                                    if background_path is None:
-                                                        self.tab_recon.message_box(
-                                                            ret_msg
-                                                        )
-                                                        return
-                                                    pydantic_kwargs[
-                                                        "birefringence"
-                                                    ]["apply_inverse"][
-                                                        "background_path"
-                                                    ] = background_path
-
-                                                # validate and return errors if None
-                                                pydantic_model, ret_msg = (
-                                                    self.tab_recon.validate_pydantic_model(
-                                                        cls, pydantic_kwargs
-                                                    )
-                                                )
-                                                if pydantic_model is None:
-                                                    self.tab_recon.message_box(
-                                                        ret_msg
-                                                    )
-                                                    return
-                                                model = pydantic_model
-                                                break
-                                    if model is None:
-                                        model, msg = self.tab_recon.build_model(
-                                            mode
+                                        (
+                                            background_path,
+                                            ret_msg,
+                                        ) = self.tab_recon.clean_path_string_when_empty(
+                                            "background_path",
+                                            pydantic_kwargs[
+                                                "birefringence"
+                                            ]["apply_inverse"][
+                                                "background_path"
+                                            ],
+                                        )
+                                        if background_path is None:
+                                            self.tab_recon.message_box(
+                                                ret_msg
+                                            )
+                                            return
+                                        pydantic_kwargs[
+                                            "birefringence"
+                                        ]["apply_inverse"][
+                                            "background_path"
+                                        ] = background_path
+
+                                    # validate and return errors if None
+                                    pydantic_model, ret_msg = (
+                                        self.tab_recon.validate_pydantic_model(
+                                            cls, pydantic_kwargs
                                         )
-                                    yaml_path = os.path.join(
-                                        str(
-                                            Path(output_data).parent.absolute()
-                                        ),
-                                        expID + ".yml",
                                     )
-                                    utils.model_to_yaml(model, yaml_path)
-                                proc_params["config_path"] = str(yaml_path)
+                                    if pydantic_model is None:
+                                        self.tab_recon.message_box(
+                                            ret_msg
+                                        )
+                                        return
+                                    model = pydantic_model
+                                    break
+                        if model is None:
+                            model, msg = self.tab_recon.build_model(
+                                mode
+                            )
+                        yaml_path = os.path.join(
+                            str(
+                                Path(output_data).parent.absolute()
+                            ),
+                            expID + ".yml",
+                        )
+                        utils.model_to_yaml(model, yaml_path)
+                    proc_params["config_path"] = str(yaml_path)
 
-                                tableEntryWorker = AddTableEntryWorkerThread(
-                                    expID, expID, proc_params
-                                )
-                                tableEntryWorker.add_tableentry_signal.connect(
-                                    self.tab_recon.addTableEntry
-                                )
-                                tableEntryWorker.start()
-                                time.sleep(10)
-                                return
-                            else:
-                                json_str = str(decoded_string)
-                                json_obj = json.loads(json_str)
-                                for k in json_obj:
-                                    expIdx = k
-                                    jobIdx = json_obj[k]["jID"]
-                                    wellName = json_obj[k]["pos"]
-                                    logs_folder_path = json_obj[k]["log"]
-                                if (
-                                    expIdx not in self.results.keys()
-                                ):  # this job came from agnostic CLI route - no processing
-                                    now = datetime.datetime.now()
-                                    ms = now.strftime("%f")[:3]
-                                    unique_id = (
-                                        now.strftime("%Y_%m_%d_%H_%M_%S_") + ms
-                                    )
-                                    expIdx = expIdx + "-" + unique_id
-                                self.JobsMgmt.put_Job_in_list(
-                                    None,
-                                    expIdx,
-                                    str(jobIdx),
-                                    wellName,
-                                    mode="server",
-                                )
-                                # print("Submitting Job: {job} expIdx: {expIdx}".format(job=jobIdx, expIdx=expIdx))
-                                thread = threading.Thread(
-                                    target=self.table_update_and_cleaup_thread,
-                                    args=(
-                                        expIdx,
-                                        jobIdx,
-                                        wellName,
-                                        logs_folder_path,
-                                        client_socket,
-                                    ),
-                                )
-                                thread.start()
+                    tableEntryWorker = AddTableEntryWorkerThread(
+                        expID, expID, proc_params
+                    )
+                    tableEntryWorker.add_tableentry_signal.connect(
+                        self.tab_recon.addTableEntry
+                    )
+                    tableEntryWorker.start()
+                    time.sleep(10)
+                    return
+                else:
+                    for k in json_obj:
+                        clientIdx = k
+                        expIdx = k
+                        jobIdx = json_obj[k]["jID"]
+                        wellName = json_obj[k]["pos"]
+                        logs_folder_path = json_obj[k]["log"]
+                    if (
+                        expIdx not in self.results.keys()
+                    ):  # this job came from agnostic CLI route - no processing
+                        now = datetime.datetime.now()
+                        ms = now.strftime("%f")[:3]
+                        unique_id = (
+                            now.strftime("%Y_%m_%d_%H_%M_%S_") + ms
+                        )
+                        expIdx = expIdx + "-" + unique_id
+                    self.JobsMgmt.put_Job_in_list(
+                        None,
+                        expIdx,
+                        str(jobIdx),
+                        wellName,
+                        mode="server",
+                    )
+                    # print("Submitting Job: {job} expIdx: {expIdx}".format(job=jobIdx, expIdx=expIdx))
+                    self.register_job(
+                        expIdx,
+                        jobIdx,
+                        wellName,
+                        logs_folder_path,
+                        client_socket,
+                        (clientIdx, str(jobIdx)),
+                    )
                 return
             except Exception as exc:
                 print(exc.args)
 
-    # the table update thread can be called from multiple points/threads
-    # on errors - table row item is updated but there is no row deletion
-    # on successful processing - the row item is expected to be deleted
-    # row is being deleted from a seperate thread for which we need to connect using signal
-
-    # This is handling essentially each job thread. Points of entry are on a failed job submission 
-    # which then calls this to update based on the expID (used for .yml naming). On successful job 
-    # submissions jobID, the point of entry is via the socket connection the GUI is listening and 
-    # then spawns a new thread to avoid blocking of other connections.
-    # If a job submission spawns more jobs then this also calls other methods via signal to create 
-    # the required GUI components in the main thread.
-    # Once we have expID and jobID this thread periodically loops and updates each job status and/or
-    # the job error by reading the log files. Using certain keywords 
-    # eg JOB_COMPLETION_STR = "Job completed successfully" we determine the progress. We also create 
-    # a map for expID which might have multiple jobs to determine when a reconstruction is 
-    # finished vs a single job finishing.
-    # The loop ends based on user, time-out, job(s) completion and errors and handles removal of 
-    # processing GUI table items (on main thread).
-    # Based on the conditions the loop will end calling clientRelease()
-    def table_update_and_cleaup_thread(
+    # Jobs of the CLI clients go through these steps, each run by the
+    # dispatcher thread when an event arrives:
+    # register_job() - on the job registration from the client. A job from a
+    # CLI started outside this GUI first waits for its table entry.
+    # add_job() - the first job of an experiment uses the table entry, the
+    # other jobs wait for their widgets, which are created on the main thread.
+    # show_job() - the job is shown in its widgets.
+    # update_job() - on every job state pushed by the client, a cancel, a
+    # disconnected client, or the log refresh timer. Using the pushed state and certain keywords in the
+    # log files, eg JOB_COMPLETION_STR = "Job completed successfully", it
+    # updates the table entry, and finished jobs end with client_release(),
+    # which also handles removal of processing GUI table items (on main
+    # thread). We keep a map for expID which might have multiple jobs to
+    # determine when a reconstruction is finished vs a single job finishing.
+    def register_job(
         self,
-        expIdx="",
-        jobIdx="",
-        wellName="",
-        logs_folder_path="",
-        client_socket=None,
+        expIdx,
+        jobIdx,
+        wellName,
+        logs_folder_path,
+        client_socket,
+        event_key,
     ):
-        jobIdx = str(jobIdx)
-        
-        # ToDo: Another approach to this could be to implement a status thread on the client side
-        # Since the client is already running till the job is completed, the client could ping status
-        # at regular intervals and also provide results and exceptions we currently read from the file
-        # Currently we only send JobID/UniqueID pair from Client to Server. This would reduce multiple threads
-        # server side.
-
-        if expIdx != "" and jobIdx != "":
-            # this request came from server listening so we wait for the Job to finish and update progress
-            if (
-                expIdx not in self.results.keys()
-            ):  
-                proc_params = {}
-                tableID = "{exp} - {job} ({pos})".format(
-                    exp=expIdx, job=jobIdx, pos=wellName
-                )
-                proc_params["exp_id"] = expIdx
-                proc_params["desc"] = tableID
-                proc_params["config_path"] = ""
-                proc_params["input_path"] = ""
-                proc_params["output_path"] = ""
-                proc_params["output_path_parent"] = ""
-                proc_params["show"] = False
-                proc_params["rx"] = 1
-
-                tableEntryWorker = AddTableEntryWorkerThread(
-                    tableID, tableID, proc_params
-                )
-                tableEntryWorker.add_tableentry_signal.connect(
-                    self.tab_recon.addTableEntry
-                )
-                tableEntryWorker.start()
+        job = {
+            "key": event_key,
+            "expIdx": expIdx,
+            "jobIdx": str(jobIdx),
+            "wellName": wellName,
+            "logs_folder_path": logs_folder_path,
+            "client_socket": client_socket,
+            "status": jobs_mgmt.JOB_SUBMITTED,
+            "params": None,
+            "shown": False,
+            "client_gone": False,
+            "last_output": "",
+            "last_output_time": time.monotonic(),
+        }
+        self.jobs[event_key] = job
+        if expIdx in self.results.keys():
+            self.add_job(job)
+            return
 
-                while expIdx not in self.results.keys():
-                    time.sleep(1)
+        # this request came from a CLI outside this GUI, add a table entry
+        # first, run_in_pool() reports it with a "table_entry" event
+        if expIdx not in self.pending_entries:
+            self.pending_entries[expIdx] = []
+            proc_params = {}
+            tableID = "{exp} - {job} ({pos})".format(
+                exp=expIdx, job=job["jobIdx"], pos=wellName
+            )
+            proc_params["exp_id"] = expIdx
+            proc_params["desc"] = tableID
+            proc_params["config_path"] = ""
+            proc_params["input_path"] = ""
+            proc_params["output_path"] = ""
+            proc_params["output_path_parent"] = ""
+            proc_params["show"] = False
+            proc_params["rx"] = 1
+
+            tableEntryWorker = AddTableEntryWorkerThread(
+                tableID, tableID, proc_params
+            )
+            tableEntryWorker.add_tableentry_signal.connect(
+                self.tab_recon.addTableEntry
+            )
+            self.start_qthread(tableEntryWorker)
+        self.pending_entries[expIdx].append(job)
+
+    def add_job(self, job, external=False):
+        expIdx, jobIdx = job["expIdx"], job["jobIdx"]
+        params = self.results[expIdx]["JobUNK"].copy()
+        if external:
+            params["status"] = STATUS_running_job
+
+        if jobIdx in self.results[expIdx].keys():
+            # registered again, keep its widgets
+            job["params"] = self.results[expIdx][jobIdx]
+            self.show_job(job)
+        elif len(self.results[expIdx].keys()) == 1:
+            # this is the first job
+            params["primary"] = True
+            self.results[expIdx][jobIdx] = params
+            job["params"] = params
+            self.show_job(job)
+        else:
+            # this is a new job
+            # we need to create cancel and job status windows and add to parent container
+            params["primary"] = False
+            self.results[expIdx][jobIdx] = params
+            job["params"] = params
+            self.pending_widgets[expIdx + jobIdx] = job
+            NEW_WIDGETS_QUEUE.append(expIdx + jobIdx)
+            parentLayout: QVBoxLayout = params["parent_layout"]
+            worker_thread = AddWidgetWorkerThread(
+                parentLayout, expIdx, jobIdx, params["desc"], job["wellName"]
+            )
+            worker_thread.add_widget_signal.connect(self.tab_recon.add_widget)
+            self.start_qthread(worker_thread)
+
+    def show_job(self, job):
+        expIdx, jobIdx, params = job["expIdx"], job["jobIdx"], job["params"]
+        if not params["primary"]:
+            params["table_entry_infoBox"] = MULTI_JOBS_REFS[expIdx + jobIdx][
+                "infobox"
+            ]
+            params["cancelJobButton"] = MULTI_JOBS_REFS[expIdx + jobIdx][
+                "cancelBtn"
+            ]
+
+        _infoBox: ScrollableLabel = params["table_entry_infoBox"]
+        _cancelJobBtn: PushButton = params["cancelJobButton"]
 
-                params = self.results[expIdx]["JobUNK"].copy()
-                params["status"] = STATUS_running_job
-            else:
-                params = self.results[expIdx]["JobUNK"].copy()
+        _txtForInfoBox = "Updating {id}-{pos}: Please wait... \nJobID assigned: {jID} ".format(
+            id=params["desc"], pos=job["wellName"], jID=jobIdx
+        )
+        try:
+            _cancelJobBtn.text = "Cancel Job {jID} ({posName})".format(
+                jID=jobIdx, posName=job["wellName"]
+            )
+            _cancelJobBtn.enabled = True
+            _infoBox.setText(_txtForInfoBox)
+        except:
+            # deleted by user - no longer needs updating
+            params["status"] = STATUS_user_cleared_job
+            self.jobs.pop(job["key"], None)
+            return
+        job["shown"] = True
+        # states pushed before the widgets existed
+        self.update_job(job)
 
-            if (
-                jobIdx not in self.results[expIdx].keys()
-                and len(self.results[expIdx].keys()) == 1
-            ):
-                # this is the first job
-                params["primary"] = True
-                self.results[expIdx][jobIdx] = params
-            elif (
-                jobIdx not in self.results[expIdx].keys()
-                and len(self.results[expIdx].keys()) > 1
-            ):
-                # this is a new job
-                # we need to create cancel and job status windows and add to parent container
-                params["primary"] = False
-                NEW_WIDGETS_QUEUE.append(expIdx + jobIdx)
-                parentLayout: QVBoxLayout = params["parent_layout"]
-                worker_thread = AddWidgetWorkerThread(
-                    parentLayout, expIdx, jobIdx, params["desc"], wellName
-                )
-                worker_thread.add_widget_signal.connect(
-                    self.tab_recon.add_widget
+    def update_job(self, job):
+        if not job["shown"]:
+            return
+        expIdx, jobIdx, params = job["expIdx"], job["jobIdx"], job["params"]
+        client_socket = job["client_socket"]
+        logs_folder_path = job["logs_folder_path"]
+        pushed_status = job["status"]
+        _infoBox: ScrollableLabel = params["table_entry_infoBox"]
+        _cancelJobBtn: PushButton = params["cancelJobButton"]
+        try:
+            if "cancel called" in _cancelJobBtn.text:
+                json_obj = {
+                    "uID": expIdx,
+                    "jID": jobIdx,
+                    "command": "cancel",
+                }
+                try:
+                    client_socket.sendall(jobs_mgmt.encode_message(json_obj))
+                except OSError:
+                    pass  # the client already exited
+                params["status"] = STATUS_user_cancelled_job
+                _infoBox.setText(
+                    "User called for Cancel Job Request\n"
+                    + "Please check terminal output for Job status..\n\n"
                 )
-                NEW_WIDGETS_QUEUE_THREADS.append(worker_thread)
-
-                while len(NEW_WIDGETS_QUEUE_THREADS) > 0:
-                    s_worker_thread = NEW_WIDGETS_QUEUE_THREADS.pop(0)
-                    s_worker_thread.start()
-                    time.sleep(1)
-
-                # wait for new components reference
-                while expIdx + jobIdx in NEW_WIDGETS_QUEUE:
-                    time.sleep(1)
-
-                _cancelJobBtn = MULTI_JOBS_REFS[expIdx + jobIdx]["cancelBtn"]
-                _infoBox = MULTI_JOBS_REFS[expIdx + jobIdx]["infobox"]
-                params["table_entry_infoBox"] = _infoBox
-                params["cancelJobButton"] = _cancelJobBtn
-
-                self.results[expIdx][jobIdx] = params
-
-            _infoBox: ScrollableLabel = params["table_entry_infoBox"]
-            _cancelJobBtn: PushButton = params["cancelJobButton"]
+                self.finish_job(job, reason=1)
+                return  # cancel called by user
+            if _infoBox == None:
+                params["status"] = STATUS_user_cleared_job
+                self.finish_job(job, reason=2)
+                return  # deleted by user - no longer needs updating
+        except Exception as exc:
+            print(exc.args)
+            params["status"] = STATUS_user_cleared_job
+            self.finish_job(job, reason=3)
+            return  # deleted by user - no longer needs updating
+        if not self.JobsMgmt.has_submitted_job(expIdx, jobIdx, mode="server"):
+            self.finish_job(job, reason=0)
+            return
 
-            _txtForInfoBox = "Updating {id}-{pos}: Please wait... \nJobID assigned: {jID} ".format(
-                id=params["desc"], pos=wellName, jID=jobIdx
+        try:
+            jobTXT = self.JobsMgmt.check_for_jobID_File(
+                jobIdx, logs_folder_path, extension="out"
             )
-            try:
-                _cancelJobBtn.text = "Cancel Job {jID} ({posName})".format(
-                    jID=jobIdx, posName=wellName
+            if (
+                pushed_status == jobs_mgmt.JOB_FAILED
+                or JOB_TRIGGERED_EXC in jobTXT
+                or (
+                    job["client_gone"]
+                    and pushed_status != jobs_mgmt.JOB_DONE
                 )
-                _cancelJobBtn.enabled = True
-                _infoBox.setText(_txtForInfoBox)
-            except:
-                # deleted by user - no longer needs updating
-                params["status"] = STATUS_user_cleared_job
-                return
-            _tUpdateCount = 0
-            _tUpdateCountTimeout = (
-                jobs_mgmt.JOBS_TIMEOUT * 60
-            )  # 5 mins - match executor time-out
-            _lastUpdate_jobTXT = ""
-            jobTXT = ""
-            # print("Updating Job: {job} expIdx: {expIdx}".format(job=jobIdx, expIdx=expIdx))
-            while True:
-                time.sleep(1)  # update every sec and exit on break
-                try:
-                    if "cancel called" in _cancelJobBtn.text:
-                        json_obj = {
-                            "uID": expIdx,
-                            "jID": jobIdx,
-                            "command": "cancel",
-                        }
-                        json_str = json.dumps(json_obj) + "\n"
-                        client_socket.send(json_str.encode())
-                        params["status"] = STATUS_user_cancelled_job
-                        _infoBox.setText(
-                            "User called for Cancel Job Request\n"
-                            + "Please check terminal output for Job status..\n\n"
-                            + jobTXT
-                        )
-                        self.client_release(
-                            expIdx, jobIdx, client_socket, params, reason=1
-                        )
-                        break  # cancel called by user
-                    if _infoBox == None:
-                        params["status"] = STATUS_user_cleared_job
-                        self.client_release(
-                            expIdx, jobIdx, client_socket, params, reason=2
-                        )
-                        break  # deleted by user - no longer needs updating
-                    if _infoBox:
-                        pass
-                except Exception as exc:
-                    print(exc.args)
-                    params["status"] = STATUS_user_cleared_job
-                    self.client_release(
-                        expIdx, jobIdx, client_socket, params, reason=3
-                    )
-                    break  # deleted by user - no longer needs updating
-                if self.JobsMgmt.has_submitted_job(
-                    expIdx, jobIdx, mode="server"
-                ):
-                    if params["status"] in [STATUS_finished_job]:
-                        self.client_release(
-                            expIdx, jobIdx, client_socket, params, reason=4
-                        )
-                        break
-                    elif params["status"] in [STATUS_errored_job]:
-                        jobERR = self.JobsMgmt.check_for_jobID_File(
-                            jobIdx, logs_folder_path, extension="err"
-                        )
-                        _infoBox.setText(
-                            jobIdx + "\n" + params["desc"] + "\n\n" + jobERR
-                        )
-                        self.client_release(
-                            expIdx, jobIdx, client_socket, params, reason=5
-                        )
-                        break
-                    else:
-                        jobTXT = self.JobsMgmt.check_for_jobID_File(
-                            jobIdx, logs_folder_path, extension="out"
-                        )
-                        try:
-                            if jobTXT == "":  # job file not created yet
-                                # print(jobIdx + " not started yet")
-                                time.sleep(2)
-                                _tUpdateCount += 2
-                                if (
-                                    _tUpdateCount > 10
-                                ):  # if out file is empty for 10s, check the err file to update user
-                                    jobERR = self.JobsMgmt.check_for_jobID_File(
-                                        jobIdx,
-                                        logs_folder_path,
-                                        extension="err",
-                                    )
-                                    if JOB_OOM_EVENT in jobERR:
-                                        params["status"] = STATUS_errored_job
-                                        _infoBox.setText(
-                                            jobERR +
-                                            "\n\n"
-                                            + jobTXT
-                                        )
-                                        self.client_release(
-                                            expIdx,
-                                            jobIdx,
-                                            client_socket,
-                                            params,
-                                            reason=0,
-                                        )
-                                        break
-                                    _infoBox.setText(
-                                        jobIdx
-                                        + "\n"
-                                        + params["desc"]
-                                        + "\n\n"
-                                        + jobERR
-                                    )
-                                    if _tUpdateCount > _tUpdateCountTimeout:
-                                        self.client_release(
-                                            expIdx,
-                                            jobIdx,
-                                            client_socket,
-                                            params,
-                                            reason=0,
-                                        )
-                                        break
-                            elif params["status"] == STATUS_finished_job:
-                                rowIdx = self.find_widget_row_in_layout(expIdx)
-                                # check to ensure row deletion due to shrinking table
-                                # if not deleted try to delete again
-                                if rowIdx < 0:
-                                    self.client_release(
-                                        expIdx,
-                                        jobIdx,
-                                        client_socket,
-                                        params,
-                                        reason=6,
-                                    )
-                                    break
-                                else:
-                                    break
-                            elif JOB_COMPLETION_STR in jobTXT:
-                                params["status"] = STATUS_finished_job
-                                _infoBox.setText(jobTXT)
-                                # this is the only case where row deleting occurs
-                                # we cant delete the row directly from this thread
-                                # we will use the exp_id to identify and delete the row
-                                # using Signal
-                                # break - based on status
-                            elif JOB_TRIGGERED_EXC in jobTXT:
-                                params["status"] = STATUS_errored_job
-                                jobERR = self.JobsMgmt.check_for_jobID_File(
-                                    jobIdx, logs_folder_path, extension="err"
-                                )
-                                _infoBox.setText(
-                                    jobIdx
-                                    + "\n"
-                                    + params["desc"]
-                                    + "\n\n"
-                                    + jobTXT
-                                    + "\n\n"
-                                    + jobERR
-                                )
-                                self.client_release(
-                                    expIdx,
-                                    jobIdx,
-                                    client_socket,
-                                    params,
-                                    reason=0,
-                                )
-                                break
-                            elif JOB_RUNNING_STR in jobTXT:
-                                params["status"] = STATUS_running_job
-                                _infoBox.setText(jobTXT)
-                                _tUpdateCount += 1
-                                if _tUpdateCount > 60:
-                                    jobERR = self.JobsMgmt.check_for_jobID_File(
-                                        jobIdx,
-                                        logs_folder_path,
-                                        extension="err",
-                                    )
-                                    if JOB_OOM_EVENT in jobERR:
-                                        params["status"] = STATUS_errored_job
-                                        _infoBox.setText(
-                                            jobERR +
-                                            "\n\n"
-                                            + jobTXT
-                                        )
-                                        self.client_release(
-                                            expIdx,
-                                            jobIdx,
-                                            client_socket,
-                                            params,
-                                            reason=0,
-                                        )
-                                        break
-                                    elif _lastUpdate_jobTXT != jobTXT:
-                                        # if there is an update reset counter
-                                        _tUpdateCount = 0
-                                        _lastUpdate_jobTXT = jobTXT
-                                    else:
-                                        _infoBox.setText(
-                                            "Please check terminal output for Job status..\n\n"
-                                            + jobTXT
-                                        )
-                                if _tUpdateCount > _tUpdateCountTimeout:
-                                    self.client_release(
-                                        expIdx,
-                                        jobIdx,
-                                        client_socket,
-                                        params,
-                                        reason=0,
-                                    )
-                                    break
-                            else:
-                                jobERR = self.JobsMgmt.check_for_jobID_File(
-                                    jobIdx, logs_folder_path, extension="err"
-                                )
-                                _infoBox.setText(
-                                    jobIdx
-                                    + "\n"
-                                    + params["desc"]
-                                    + "\n\n"
-                                    + jobERR
-                                )
-                                self.client_release(
-                                    expIdx,
-                                    jobIdx,
-                                    client_socket,
-                                    params,
-                                    reason=0,
-                                )
-                                break
-                        except Exception as exc:
-                            print(exc.args)
+            ):
+                # failed, or the client exited before the job finished
+                params["status"] = STATUS_errored_job
+                jobERR = self.JobsMgmt.check_for_jobID_File(
+                    jobIdx, logs_folder_path, extension="err"
+                )
+                if JOB_OOM_EVENT in jobERR:
+                    _infoBox.setText(jobERR + "\n\n" + jobTXT)
                 else:
-                    self.client_release(
-                        expIdx, jobIdx, client_socket, params, reason=0
+                    _infoBox.setText(
+                        jobIdx
+                        + "\n"
+                        + params["desc"]
+                        + "\n\n"
+                        + jobTXT
+                        + "\n\n"
+                        + jobERR
                     )
-                    break
-        else:
-            # this would occur when an exception happens on the pool side before or during job submission
-            # we dont have a job ID and will update based on exp_ID/uID
-            # if job submission was not successful we can assume the client is not listening
-            # and does not require a clientRelease cmd
-            for uID in self.results.keys():
-                params = self.results[uID]["JobUNK"]
-                if params["status"] in [STATUS_errored_pool]:
-                    _infoBox = params["table_entry_infoBox"]
-                    poolERR = params["error"]
-                    _infoBox.setText(poolERR)
+                self.finish_job(job, reason=0)
+            elif (
+                pushed_status == jobs_mgmt.JOB_DONE
+                or JOB_COMPLETION_STR in jobTXT
+            ):
+                # this is the only case where row deleting occurs
+                # we cant delete the row directly from this thread
+                # we will use the exp_id to identify and delete the row
+                # using Signal
+                params["status"] = STATUS_finished_job
+                _infoBox.setText(jobTXT)
+                self.finish_job(job, reason=4)
+            elif (
+                pushed_status == jobs_mgmt.JOB_RUNNING
+                or JOB_RUNNING_STR in jobTXT
+            ):
+                params["status"] = STATUS_running_job
+                if jobTXT != "":
+                    _infoBox.setText(jobTXT)
+            if job["key"] in self.jobs:
+                self.check_job_output(job, jobTXT)
+        except Exception as exc:
+            print(exc.args)
+
+    def check_job_output(self, job, jobTXT):
+        # a job that writes no log output since its last pushed state, e.g.
+        # when it was killed or never starts writing, ends after a time-out
+        now = time.monotonic()
+        if jobTXT != job["last_output"]:
+            job["last_output"] = jobTXT
+            job["last_output_time"] = now
+            return
+        silent_seconds = now - job["last_output_time"]
+        if silent_seconds < JOB_SILENT_CHECK:
+            return
+        jobIdx, params = job["jobIdx"], job["params"]
+        _infoBox: ScrollableLabel = params["table_entry_infoBox"]
+        jobERR = self.JobsMgmt.check_for_jobID_File(
+            jobIdx, job["logs_folder_path"], extension="err"
+        )
+        if JOB_OOM_EVENT in jobERR:
+            params["status"] = STATUS_errored_job
+            _infoBox.setText(jobERR + "\n\n" + jobTXT)
+            self.finish_job(job, reason=0)
+        elif (
+            silent_seconds > jobs_mgmt.JOBS_TIMEOUT * 60
+            # queued jobs wait for the scheduler, not for their output
+            and job["status"] != jobs_mgmt.JOB_SUBMITTED
+        ):
+            params["status"] = STATUS_errored_job
+            _infoBox.setText(
+                "No job output for {min} minutes\n".format(
+                    min=jobs_mgmt.JOBS_TIMEOUT
+                )
+                + "Please check terminal output for Job status..\n\n"
+                + jobTXT
+                + "\n\n"
+                + jobERR
+            )
+            self.finish_job(job, reason=0)
+        elif jobTXT == "":  # job file not created yet
+            _infoBox.setText(
+                jobIdx + "\n" + params["desc"] + "\n\n" + jobERR
+            )
+
+    def finish_job(self, job, reason=0):
+        self.jobs.pop(job["key"], None)
+        self.client_release(
+            job["expIdx"],
+            job["jobIdx"],
+            job["client_socket"],
+            job["params"],
+            reason=reason,
+        )
+
+    def show_pool_errors(self):
+        # this would occur when an exception happens on the pool side before or during job submission
+        # we dont have a job ID and will update based on exp_ID/uID
+        # if job submission was not successful we can assume the client is not listening
+        # and does not require a clientRelease cmd
+        for uID in self.results.keys():
+            params = self.results[uID]["JobUNK"]
+            if params["status"] in [STATUS_errored_pool]:
+                _infoBox = params["table_entry_infoBox"]
+                poolERR = params["error"]
+                _infoBox.setText(poolERR)
 
     def client_release(self, expIdx, jobIdx, client_socket, params, reason=0):
         # only need to release client from primary job
         # print("clientRelease Job: {job} expIdx: {expIdx} reason:{reason}".format(job=jobIdx, expIdx=expIdx, reason=reason))
         self.JobsMgmt.put_Job_completion_in_list(True, expIdx, jobIdx)
-        showData_thread = None
         if params["primary"]:
             if "show" in params:
                 if params["show"]:
@@ -3490,19 +3527,24 @@ class MyWorker:
                     showData_thread.show_data_signal.connect(
                         self.tab_recon.show_dataset
                     )
-                    showData_thread.start()
-
-            # for multi-job expID we need to check completion for all of them
-            while not self.JobsMgmt.check_all_ExpJobs_completion(expIdx):
-                time.sleep(1)
+                    self.start_qthread(showData_thread)
+            self.pending_releases[expIdx] = (jobIdx, client_socket, reason)
 
+        # for multi-job expID the client is released with the last job
+        if (
+            expIdx in self.pending_releases
+            and self.JobsMgmt.check_all_ExpJobs_completion(expIdx)
+        ):
+            jobIdx, client_socket, reason = self.pending_releases.pop(expIdx)
             json_obj = {
                 "uID": expIdx,
                 "jID": jobIdx,
                 "command": "clientRelease",
             }
-            json_str = json.dumps(json_obj) + "\n"
-            client_socket.send(json_str.encode())
+            try:
+                client_socket.sendall(jobs_mgmt.encode_message(json_obj))
+            except OSError:
+                pass  # the client already exited
 
             if reason != 0: # remove processing entry when exiting without error
                 ROW_POP_QUEUE.append(expIdx)
@@ -3513,10 +3555,6 @@ class MyWorker:
                 self.pool.shutdown()
                 self.pool = None
 
-        if showData_thread is not None:
-            while showData_thread.isRunning():
-                time.sleep(3)
-
     def run_in_pool(self, params):
         if not self.isInitialized:
             self.initialize()
@@ -3528,6 +3566,8 @@ class MyWorker:
             "status"
         ] = STATUS_running_pool
         self.results[params["exp_id"]]["JobUNK"]["error"] = ""
+        # jobs of an experiment started outside this GUI wait for this entry
+        self.post_job_event("table_entry", params["exp_id"])
 
         try:
             # when a request on the listening port arrives with an empty path
@@ -3543,7 +3583,7 @@ class MyWorker:
             self.results[params["exp_id"]]["JobUNK"]["error"] = str(
                 "\n".join(exc.args)
             )
-            self.table_update_and_cleaup_thread()
+            self.show_pool_errors()
 
     def run_multi_in_pool(self, multi_params_as_list):
         self.start_pool()
@@ -3564,7 +3604,7 @@ class MyWorker:
                 self.results[params["exp_id"]]["JobUNK"]["error"] = str(
                     "\n".join(exc.args)
                 )
-            self.table_update_and_cleaup_thread()
+            self.show_pool_errors()
 
     def get_results(self):
         return self.results
@@ -3597,7 +3637,7 @@ class MyWorker:
             self.results[params["exp_id"]]["JobUNK"]["error"] = str(
                 "\n".join(exc.args)
             )
-            self.table_update_and_cleaup_thread()
+            self.show_pool_errors()
 
     def run_in_subprocess(self, params):
         """function that initiates the processing on the CLI"""
@@ -3613,6 +3653,10 @@ class MyWorker:
                 "status"
             ] = STATUS_submitted_job
 
+            if self.useDaemon and daemon.is_service_running():
+                self.run_in_daemon(params)
+                return
+
             proc = subprocess.run(
                 [
                     "python",
@@ -3643,7 +3687,26 @@ class MyWorker:
             self.results[params["exp_id"]]["JobUNK"]["error"] = str(
                 "\n".join(exc.args)
             )
-            self.table_update_and_cleaup_thread()
+            self.show_pool_errors()
+
+    def run_in_daemon(self, params):
+        """function that sends the processing to the reconstruction service,
+        blocking until it is done like `run_in_subprocess`"""
+        with daemon.ReconstructionClient() as client:
+            client.reconstruct(
+                str(params["exp_id"]),
+                input_position_dirpaths=[str(params["input_path"])],
+                config_filepath=str(params["config_path"]),
+                output_dirpath=str(params["output_path"]),
+                ram_multiplier=float(params["rx"]),
+                unique_id=str(params["exp_id"]),
+            )
+            reply = client.wait()
+        if reply is None or reply["status"] != "completed":
+            raise Exception(
+                "An error occurred in processing ! "
+                + (reply or {}).get("error", "Check terminal output.")
+            )
 
 
 class ShowDataWorkerThread(QThread):
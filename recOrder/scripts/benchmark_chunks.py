@@ -0,0 +1,122 @@
+"""
+Benchmark write and read throughput of reconstruction outputs for several
+chunk layouts.
+
+Each time point is written as one CZYX volume, like
+`recOrder.cli.utils.apply_inverse_to_zyx_and_save`, then read back as whole
+volumes, single XY planes, and single XZ slices. Point `--tmp-dir` at the
+filesystem you want to measure, where the number of chunk files matters most.
+
+>> python benchmark_chunks.py --tmp-dir /hpc/scratch/me -z 64 -yx 1024
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from iohub.ngff import open_ome_zarr
+
+from recOrder.cli.utils import create_empty_hcs_zarr
+
+
+def layouts(shape: tuple, target_chunk_mb: float) -> dict:
+    _, _, Z, Y, X = shape
+    z_block = int(np.clip(target_chunk_mb * 2**20 // (Y * X * 4), 1, Z))
+    tile = min(256, Y, X)
+    return {
+        "XY planes": (1, 1, 1, Y, X),
+        f"auto ({z_block} Z-slices)": (1, 1, z_block, Y, X),
+        "whole volumes": (1, 1, Z, Y, X),
+        f"{tile}px tiles": (1, 1, 1, tile, tile),
+    }
+
+
+def count_files(path: Path) -> int:
+    return sum(len(file_names) for _, _, file_names in os.walk(path))
+
+
+def benchmark_layout(root: Path, shape: tuple, chunks: tuple) -> dict:
+    T, C, Z, Y, X = shape
+    store_path = root / f"{'-'.join(map(str, chunks))}.zarr"
+    create_empty_hcs_zarr(
+        store_path,
+        [("0", "0", "0")],
+        shape,
+        chunks,
+        (1,) * 5,
+        [f"Out{i}" for i in range(C)],
+        np.float32,
+    )
+    czyx_data = np.random.default_rng(0).random((C, Z, Y, X), dtype=np.float32)
+    volume_bytes = czyx_data.nbytes
+
+    results = {}
+    with open_ome_zarr(store_path / "0" / "0" / "0", mode="r+") as position:
+        array = position["0"]
+
+        start = time.perf_counter()
+        for t_idx in range(T):
+            array[t_idx] = czyx_data
+        results["write MB/s"] = (
+            T * volume_bytes / 2**20 / (time.perf_counter() - start)
+        )
+
+        start = time.perf_counter()
+        for t_idx in range(T):
+            array[t_idx]
+        results["read MB/s"] = (
+            T * volume_bytes / 2**20 / (time.perf_counter() - start)
+        )
+
+        start = time.perf_counter()
+        for t_idx in range(T):
+            array[t_idx, 0, Z // 2]
+        results["XY plane ms"] = 1e3 * (time.perf_counter() - start) / T
+
+        start = time.perf_counter()
+        for t_idx in range(T):
+            array[t_idx, 0, :, Y // 2]
+        results["XZ slice ms"] = 1e3 * (time.perf_counter() - start) / T
+
+    results["files"] = count_files(store_path)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tmp-dir", default=None)
+    parser.add_argument("-t", "--time-points", type=int, default=4)
+    parser.add_argument("-c", "--channels", type=int, default=4)
+    parser.add_argument("-z", "--z-slices", type=int, default=32)
+    parser.add_argument("-yx", "--yx-size", type=int, default=512)
+    parser.add_argument("--target-chunk-mb", type=float, default=16.0)
+    args = parser.parse_args()
+
+    shape = (
+        args.time_points,
+        args.channels,
+        args.z_slices,
+        args.yx_size,
+        args.yx_size,
+    )
+    with tempfile.TemporaryDirectory(dir=args.tmp_dir) as tmp:
+        results = {
+            name: benchmark_layout(Path(tmp), shape, chunks)
+            for name, chunks in layouts(shape, args.target_chunk_mb).items()
+        }
+
+    print(f"\nTCZYX shape {shape}, float32")
+    columns = list(next(iter(results.values())).keys())
+    print(f"{'layout':>24}" + "".join(f"{column:>14}" for column in columns))
+    for name, result in results.items():
+        print(
+            f"{name:>24}"
+            + "".join(f"{result[column]:>14.1f}" for column in columns)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Benchmark write throughput and compression ratio of reconstruction outputs
+for each `output: compression` setting.
+
+Pass a reconstructed position to measure real data, otherwise a smooth
+synthetic float32 volume with noise is used. Point `--tmp-dir` at the
+filesystem you want to measure.
+
+>> python benchmark_compression.py -i ./reconstruction.zarr/0/0/0
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from iohub.ngff import open_ome_zarr
+
+from recOrder.cli.utils import create_empty_hcs_zarr, get_storage_options
+
+CODECS = {
+    "blosc-zstd": {"compression": "blosc-zstd"},
+    "blosc-zstd level 5": {
+        "compression": "blosc-zstd",
+        "compression_level": 5,
+    },
+    "blosc-lz4": {"compression": "blosc-lz4"},
+    "none": {"compression": "none"},
+    "blosc-zstd, 3 digits": {
+        "compression": "blosc-zstd",
+        "quantize_digits": 3,
+    },
+    "blosc-zstd, 1 digit": {
+        "compression": "blosc-zstd",
+        "quantize_digits": 1,
+    },
+}
+
+
+def synthetic_tczyx(shape: tuple) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    smooth = np.cumsum(rng.standard_normal(shape, dtype=np.float32), axis=-1)
+    noise = 0.1 * rng.standard_normal(shape, dtype=np.float32)
+    return (smooth / np.sqrt(shape[-1]) + noise).astype(np.float32)
+
+
+def stored_bytes(path: Path) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, file_name))
+        for root, _, file_names in os.walk(path)
+        for file_name in file_names
+        if not file_name.startswith(".")
+    )
+
+
+def benchmark_codec(root: Path, tczyx_data: np.ndarray, codec: dict) -> dict:
+    T, C, Z, Y, X = tczyx_data.shape
+    store_path = root / f"{time.perf_counter_ns()}.zarr"
+    create_empty_hcs_zarr(
+        store_path,
+        [("0", "0", "0")],
+        tczyx_data.shape,
+        (1, 1, Z, Y, X),
+        (1,) * 5,
+        [f"Out{i}" for i in range(C)],
+        np.float32,
+        storage_options=get_storage_options(**codec),
+    )
+    with open_ome_zarr(store_path / "0" / "0" / "0", mode="r+") as position:
+        array = position["0"]
+        start = time.perf_counter()
+        for t_idx in range(T):
+            array[t_idx] = tczyx_data[t_idx]
+        elapsed = time.perf_counter() - start
+        max_error = float(np.max(np.abs(array[:] - tczyx_data)))
+        return {
+            "write MB/s": tczyx_data.nbytes / 2**20 / elapsed,
+            "ratio": tczyx_data.nbytes
+            / stored_bytes(store_path / "0" / "0" / "0" / "0"),
+            "max error": max_error,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("-i", "--input-position-dirpath", default=None)
+    parser.add_argument("--tmp-dir", default=None)
+    parser.add_argument("-t", "--time-points", type=int, default=4)
+    parser.add_argument("-z", "--z-slices", type=int, default=16)
+    parser.add_argument("-yx", "--yx-size", type=int, default=512)
+    args = parser.parse_args()
+
+    if args.input_position_dirpath is None:
+        tczyx_data = synthetic_tczyx(
+            (args.time_points, 4, args.z_slices, args.yx_size, args.yx_size)
+        )
+    else:
+        with open_ome_zarr(args.input_position_dirpath) as position:
+            tczyx_data = position["0"][: args.time_points].astype(np.float32)
+
+    with tempfile.TemporaryDirectory(dir=args.tmp_dir) as tmp:
+        results = {
+            name: benchmark_codec(Path(tmp), tczyx_data, codec)
+            for name, codec in CODECS.items()
+        }
+
+    print(f"\nTCZYX shape {tczyx_data.shape}, float32")
+    columns = list(next(iter(results.values())).keys())
+    print(f"{'codec':>24}" + "".join(f"{column:>14}" for column in columns))
+    for name, result in results.items():
+        print(
+            f"{name:>24}"
+            + "".join(f"{result[column]:>14.3g}" for column in columns)
+        )
+
+
+if __name__ == "__main__":
+    main()
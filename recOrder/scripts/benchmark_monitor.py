@@ -0,0 +1,142 @@
+"""
+Benchmark `monitor_jobs` with thousands of jobs on a fake slurm executor.
+
+Fake jobs answer like `sacct` from a simulated timeline, where jobs run in
+waves of `--parallelism` jobs, and every scheduler query waits `--latency`
+seconds. The per-job polling of the previous monitor is timed on a sample of
+jobs and extrapolated. Point `--tmp-dir` at the filesystem of the job logs,
+since `job.done()` checks the result file of every job.
+
+>> python benchmark_monitor.py --tmp-dir /hpc/scratch/me -n 10000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import submitit
+from submitit.slurm.slurm import SlurmInfoWatcher
+
+from recOrder.cli.monitor import JobStates, monitor_jobs
+
+
+class FakeWatcher(SlurmInfoWatcher):
+    """Slurm watcher that reads job states from a simulated timeline instead
+    of calling `sacct`."""
+
+    def __init__(self, latency: float = 0.0):
+        super().__init__(delay_s=600)
+        self.latency = latency
+        self.schedule = {}  # schedule[job_id] = (start, end) in seconds
+        self.start = time.time()
+
+    def update(self) -> None:
+        self._num_calls += 1
+        time.sleep(self.latency)
+        now = time.time() - self.start
+        for job_id in self._registered - self._finished:
+            start, end = self.schedule[job_id]
+            if now < start:
+                state, node = "PENDING", "None assigned"
+            elif now < end:
+                state, node = "RUNNING", f"node{hash(job_id) % 64}"
+            else:
+                state, node = "COMPLETED", f"node{hash(job_id) % 64}"
+            self._info_dict[job_id] = {
+                "JobID": job_id,
+                "State": state,
+                "NodeList": node,
+            }
+            if state == "COMPLETED":
+                self._finished.add(job_id)
+        self._last_status_check = time.time()
+
+
+def fake_jobs(
+    folder: Path,
+    num_jobs: int,
+    parallelism: int,
+    duration: float,
+    latency: float = 0.0,
+) -> tuple[list[submitit.Job], FakeWatcher]:
+    watcher = FakeWatcher(latency)
+    job_class = type("FakeJob", (submitit.Job,), {"watcher": watcher})
+    jobs = []
+    for job_idx in range(num_jobs):
+        job_id = str(job_idx)
+        start = (job_idx // parallelism) * duration
+        watcher.schedule[job_id] = (start, start + duration)
+        jobs.append(job_class(folder, job_id))
+    return jobs, watcher
+
+
+def legacy_update(jobs: list[submitit.Job]) -> None:
+    # What the previous monitor queried per job and per update. Forced
+    # `get_info` calls less than 1 ms apart share one scheduler query.
+    all(job.done() for job in jobs)
+    for job in jobs:
+        job.get_info()
+        job.state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tmp-dir", default=None)
+    parser.add_argument("-n", "--num-jobs", type=int, default=10000)
+    parser.add_argument("-p", "--parallelism", type=int, default=2000)
+    parser.add_argument("-d", "--duration", type=float, default=2.0)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--legacy-sample", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.tmp_dir) as tmp:
+        folder = Path(tmp)
+
+        jobs, watcher = fake_jobs(
+            folder, args.legacy_sample, args.parallelism, 1e6, args.latency
+        )
+        start = time.perf_counter()
+        legacy_update(jobs)
+        legacy_s = (time.perf_counter() - start) * args.num_jobs / len(jobs)
+        legacy_calls = watcher.num_calls * args.num_jobs / len(jobs)
+
+        jobs, watcher = fake_jobs(
+            folder, args.num_jobs, args.parallelism, 1e6, args.latency
+        )
+        start = time.perf_counter()
+        JobStates(jobs).update()
+        update_s = time.perf_counter() - start
+        update_calls = watcher.num_calls
+
+        jobs, watcher = fake_jobs(
+            folder,
+            args.num_jobs,
+            args.parallelism,
+            args.duration,
+            args.latency,
+        )
+        positions = [Path(f"plate.zarr/A/1/{i}") for i in range(len(jobs))]
+        start = time.perf_counter()
+        monitor_jobs(jobs, positions, do_print=False)
+        monitor_s = time.perf_counter() - start
+        simulated_s = max(end for _, end in watcher.schedule.values())
+
+    print(f"\n{args.num_jobs} jobs, {args.latency * 1000:.0f} ms per query")
+    print(
+        f"{'per-job update (extrapolated)':>32} {legacy_s:>10.2f} s, "
+        f"{legacy_calls:.0f} queries"
+    )
+    print(
+        f"{'batched update':>32} {update_s:>10.2f} s, "
+        f"{update_calls} queries"
+    )
+    print(
+        f"{'monitor until done':>32} {monitor_s:>10.2f} s "
+        f"(jobs finish after {simulated_s:.1f} s)"
+    )
+    print(f"{'queries until done':>32} {watcher.num_calls:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark per-frame output opening against a persistent output handle in
+`recOrder.cli.utils.apply_inverse_to_zyx_and_save`.
+
+The reconstruction is replaced by an identity so that only the read/write
+path is timed. Point `--tmp-dir` at the filesystem you want to measure
+(e.g. an NFS or Lustre mount), where metadata round-trips dominate.
+
+>> python benchmark_output_handle.py --tmp-dir /hpc/scratch/me -t 100
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from iohub.ngff import open_ome_zarr
+
+from recOrder.cli.utils import (
+    apply_inverse_to_zyx_and_save,
+    close_output_positions,
+    create_empty_hcs_zarr,
+)
+
+
+def identity(czyx_data):
+    return czyx_data
+
+
+def make_stores(root: Path, shape: tuple):
+    input_path = root / "input.zarr"
+    output_path = root / "output.zarr"
+    channel_names = [f"State{i}" for i in range(shape[1])]
+    with open_ome_zarr(
+        input_path, layout="hcs", mode="w", channel_names=channel_names
+    ) as dataset:
+        position = dataset.create_position("0", "0", "0")
+        position.create_zeros(
+            "0", shape, chunks=(1, 1, 1) + shape[3:], dtype=np.uint16
+        )
+    create_empty_hcs_zarr(
+        output_path,
+        [("0", "0", "0")],
+        shape,
+        (1, 1, 1) + shape[3:],
+        (1,) * 5,
+        channel_names,
+        np.float32,
+    )
+    return input_path / "0" / "0" / "0", output_path / "0" / "0" / "0"
+
+
+def time_writes(input_position_path, output_position_path, reuse):
+    input_dataset = open_ome_zarr(input_position_path)
+    T, C = input_dataset.data.shape[:2]
+    start = time.perf_counter()
+    for t_idx in range(T):
+        apply_inverse_to_zyx_and_save(
+            identity,
+            input_dataset,
+            output_position_path,
+            list(range(C)),
+            list(range(C)),
+            t_idx=t_idx,
+            reuse_output_handle=reuse,
+        )
+    close_output_positions(output_position_path)
+    elapsed = time.perf_counter() - start
+    input_dataset.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tmp-dir", default=None)
+    parser.add_argument("-t", "--time-points", type=int, default=50)
+    parser.add_argument("-z", "--z-slices", type=int, default=8)
+    parser.add_argument("-yx", "--yx-size", type=int, default=256)
+    args = parser.parse_args()
+
+    shape = (args.time_points, 4, args.z_slices, args.yx_size, args.yx_size)
+    with tempfile.TemporaryDirectory(dir=args.tmp_dir) as tmp:
+        input_path, output_path = make_stores(Path(tmp), shape)
+        results = {
+            "per-frame open": time_writes(input_path, output_path, False),
+            "persistent handle": time_writes(input_path, output_path, True),
+        }
+
+    print(f"\nTCZYX shape {shape}")
+    for name, elapsed in results.items():
+        print(
+            f"{name:>20}: {elapsed:.2f} s "
+            f"({1e3 * elapsed / args.time_points:.1f} ms/frame)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark how `create_empty_hcs_zarr` scales with the number of positions.
+
+Plates with an increasing number of wells are created from scratch, then
+re-initialized with one more channel, like a second reconstruction written
+to the same store. Point `--tmp-dir` at the filesystem you want to measure,
+where metadata round-trips matter most.
+
+>> python benchmark_plate_creation.py --tmp-dir /hpc/scratch/me -p 4
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from recOrder.cli.utils import create_empty_hcs_zarr
+
+ROWS = "ABCDEFGHIJKLMNOP"
+
+
+def plate_keys(num_wells: int, positions_per_well: int) -> list:
+    return [
+        (ROWS[well_idx // 24], str(well_idx % 24 + 1), str(position_idx))
+        for well_idx in range(num_wells)
+        for position_idx in range(positions_per_well)
+    ]
+
+
+def benchmark_plate(
+    root: Path, position_keys: list, max_workers: int = None
+) -> dict:
+    store_path = root / f"{time.perf_counter_ns()}.zarr"
+    shape = (1, 1, 8, 256, 256)
+    results = {}
+    for name, channel_names in (
+        ("create s", ["Channel0"]),
+        ("append s", ["Channel0", "Channel1"]),
+    ):
+        start = time.perf_counter()
+        create_empty_hcs_zarr(
+            store_path,
+            position_keys,
+            shape[:1] + (len(channel_names),) + shape[2:],
+            (1, 1, 8, 256, 256),
+            (1,) * 5,
+            channel_names,
+            np.float32,
+            max_workers=max_workers,
+        )
+        results[name] = time.perf_counter() - start
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tmp-dir", default=None)
+    parser.add_argument("-p", "--positions-per-well", type=int, default=4)
+    parser.add_argument("-j", "--max-workers", type=int, default=None)
+    args = parser.parse_args()
+
+    results = {}
+    with tempfile.TemporaryDirectory(dir=args.tmp_dir) as tmp:
+        for num_wells in (6, 24, 96, 384):
+            position_keys = plate_keys(num_wells, args.positions_per_well)
+            results[len(position_keys)] = benchmark_plate(
+                Path(tmp), position_keys, args.max_workers
+            )
+
+    columns = list(next(iter(results.values())).keys())
+    print(f"\n{'positions':>10}" + "".join(f"{c:>12}" for c in columns))
+    for num_positions, result in results.items():
+        print(
+            f"{num_positions:>10}"
+            + "".join(f"{result[column]:>12.2f}" for column in columns)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+import pytest
+import torch
+from iohub.ngff import open_ome_zarr
+from waveorder.models import inplane_oriented_thick_pol3d, isotropic_thin_3d
+
+from recOrder.cli import apply_inverse_models, settings
+from recOrder.cli.compute_transfer_function import (
+    generate_and_save_birefringence_transfer_function,
+    generate_and_save_phase_transfer_function,
+)
+
+
+@pytest.mark.parametrize("remove_estimated_background", [False, True])
+@pytest.mark.parametrize("use_background", [False, True])
+def test_birefringence_and_phase_2d_matches_two_pass(
+    tmp_path, remove_estimated_background, use_background
+):
+    recon_settings = settings.ReconstructionSettings(
+        reconstruction_dimension=2,
+        birefringence=settings.BirefringenceSettings(),
+        phase=settings.PhaseSettings(),
+    )
+    zyx_shape = (4, 96, 97)
+    tf_dataset = open_ome_zarr(
+        tmp_path / "tf.zarr", layout="fov", mode="w", channel_names=["None"]
+    )
+    generate_and_save_birefringence_transfer_function(
+        recon_settings, tf_dataset
+    )
+    generate_and_save_phase_transfer_function(
+        recon_settings, tf_dataset, zyx_shape
+    )
+
+    torch.manual_seed(0)
+    czyx_data = 100 + 10 * torch.rand((4,) + zyx_shape)
+    cyx_no_sample_data = (
+        100 + torch.rand((4,) + zyx_shape[1:]) if use_background else None
+    )
+    biref_inverse_dict = {
+        "remove_estimated_background": remove_estimated_background,
+        "flip_orientation": True,
+        "rotate_orientation": False,
+    }
+
+    output = apply_inverse_models.birefringence_and_phase(
+        czyx_data.clone(),
+        cyx_no_sample_data,
+        0.532,
+        2,
+        biref_inverse_dict,
+        recon_settings.phase,
+        tf_dataset,
+    )
+
+    # Reference: separate 2D and 3D birefringence inversions
+    intensity_to_stokes_matrix = torch.tensor(
+        tf_dataset["intensity_to_stokes_matrix"][0, 0, 0]
+    )
+    parameters_2d = (
+        inplane_oriented_thick_pol3d.apply_inverse_transfer_function(
+            czyx_data.clone(),
+            intensity_to_stokes_matrix,
+            cyx_no_sample_data=cyx_no_sample_data,
+            project_stokes_to_2d=True,
+            **biref_inverse_dict,
+        )
+    )
+    parameters_3d = (
+        inplane_oriented_thick_pol3d.apply_inverse_transfer_function(
+            czyx_data.clone(),
+            intensity_to_stokes_matrix,
+            cyx_no_sample_data=cyx_no_sample_data,
+            project_stokes_to_2d=False,
+            **biref_inverse_dict,
+        )
+    )
+    _, yx_phase = isotropic_thin_3d.apply_inverse_transfer_function(
+        parameters_3d[2],
+        torch.tensor(tf_dataset["absorption_transfer_function"][0, 0]),
+        torch.tensor(tf_dataset["phase_transfer_function"][0, 0]),
+        **recon_settings.phase.apply_inverse.dict(),
+    )
+    tf_dataset.close()
+
+    retardance = apply_inverse_models.radians_to_nanometers(
+        parameters_2d[0], 0.532
+    )
+    expected = torch.stack(
+        (retardance,) + parameters_2d[1:] + (torch.unsqueeze(yx_phase, 0),)
+    )
+    torch.testing.assert_close(output, expected)
@@ -1,6 +1,12 @@
-from recOrder.cli.main import cli
+import subprocess
+import sys
+
+import click
 from click.testing import CliRunner
 
+from recOrder.cli import main
+from recOrder.cli.main import cli
+
 
 def test_main():
     runner = CliRunner()
@@ -8,3 +14,46 @@ def test_main():
 
     assert result.exit_code == 0
     assert "Toolkit" in result.output
+
+
+def test_lazy_subcommands():
+    ctx = click.Context(cli)
+    for name, (_, _, help) in main.LAZY_SUBCOMMANDS.items():
+        if name not in cli.list_commands(ctx):
+            continue
+        command = cli.get_command(ctx, name)
+        assert command.name == name
+        assert command.get_short_help_str(limit=300) == help
+
+
+def test_import_time():
+    # `recorder -h` must not import the reconstruction or GUI dependencies
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "recOrder.cli.main", "-h"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert "reconstruct" in result.stdout
+    imported = {
+        line.split("|")[-1].strip().split(".")[0]
+        for line in result.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    assert "recOrder" in imported
+    for heavy_module in ("torch", "waveorder", "submitit", "napari", "qtpy"):
+        assert heavy_module not in imported
+
+
+def test_gui_without_napari(monkeypatch):
+    find_spec = main.importlib.util.find_spec
+    monkeypatch.setattr(
+        main.importlib.util,
+        "find_spec",
+        lambda name: None if name == "napari" else find_spec(name),
+    )
+    assert "gui" not in cli.list_commands(click.Context(cli))
+
+    result = CliRunner().invoke(cli, ["gui"])
+    assert result.exit_code == 2
+    assert "pip install recOrder-napari[all]" in result.output
@@ -0,0 +1,90 @@
+import threading
+
+import pytest
+from iohub.ngff import open_ome_zarr
+
+from recOrder.cli import settings
+from recOrder.cli.daemon import (
+    ReconstructionClient,
+    ReconstructionService,
+    is_service_running,
+)
+from recOrder.io import utils
+
+
+@pytest.fixture(scope="function")
+def service():
+    service = ReconstructionService(port=0, max_workers=1)
+    thread = threading.Thread(target=service.serve_forever)
+    thread.start()
+    yield service
+    service.shutdown()
+    thread.join()
+
+
+def test_daemon_reconstruct(tmp_path, example_plate, service):
+    plate_path, _ = example_plate
+    config_path = tmp_path / "birefringence.yml"
+    utils.model_to_yaml(
+        settings.ReconstructionSettings(
+            input_channel_names=[f"State{i}" for i in range(4)],
+            birefringence=settings.BirefringenceSettings(),
+        ),
+        config_path,
+    )
+    assert is_service_running(service.port)
+
+    with ReconstructionClient(service.port) as client:
+        # Both requests submit their jobs to the single warm worker
+        for job_idx in range(2):
+            reply = client.reconstruct(
+                "exp",
+                job_idx,
+                input_position_dirpaths=[str(plate_path)],
+                config_filepath=str(config_path),
+                output_dirpath=str(tmp_path / f"output_{job_idx}.zarr"),
+                tf_cache_dirpath=str(tmp_path / "tf_cache"),
+            )
+            assert reply == {
+                "uID": "exp",
+                "jID": str(job_idx),
+                "status": "accepted",
+            }
+        # the requests finish in either order
+        replies = sorted(
+            [client.wait(), client.wait()], key=lambda reply: reply["jID"]
+        )
+        assert replies == [
+            {"uID": "exp", "jID": str(job_idx), "status": "completed"}
+            for job_idx in range(2)
+        ]
+
+        # Both requests used one cached transfer function
+        assert len(list((tmp_path / "tf_cache").glob("*.zarr"))) == 1
+        for job_idx in range(2):
+            with open_ome_zarr(tmp_path / f"output_{job_idx}.zarr") as plate:
+                assert len(list(plate.positions())) == 3
+            # One job per position ran in the pool of the service
+            logs_path = tmp_path / f"output_{job_idx}_logs"
+            assert len(list(logs_path.glob("*_0_log.out"))) == 3
+
+        # Failures are reported to the client
+        client.reconstruct(
+            "exp",
+            2,
+            input_position_dirpaths=[str(tmp_path / "missing.zarr")],
+            config_filepath=str(config_path),
+            output_dirpath=str(tmp_path / "output_2.zarr"),
+        )
+        reply = client.wait()
+        assert reply["status"] == "errored"
+        assert "missing.zarr" in reply["error"]
+
+        client.send("unknown")
+        assert client.receive()["status"] == "errored"
+
+
+def test_daemon_shutdown(service):
+    with ReconstructionClient(service.port) as client:
+        client.send("shutdown")
+        assert client.receive()["status"] == "stopping"
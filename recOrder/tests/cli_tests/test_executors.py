@@ -0,0 +1,114 @@
+import time
+
+import submitit
+from iohub.ngff import open_ome_zarr
+
+from recOrder.cli import executors, settings
+from recOrder.cli.apply_inverse_transfer_function import (
+    apply_inverse_transfer_function_cli,
+)
+from recOrder.cli.compute_transfer_function import (
+    compute_transfer_function_cli,
+)
+from recOrder.io import utils
+
+
+def _add(a, b):
+    print(f"adding {a} and {b}")
+    return a + b
+
+
+def _fail():
+    raise ValueError("failed job")
+
+
+def test_process_pool_executor(tmp_path):
+    executor = executors.get_executor(
+        settings.ExecutorSettings(backend="process-pool", array_parallelism=2),
+        tmp_path / "logs",
+        num_jobs=3,
+        gb_per_cpu=1,
+        cpus_per_task=1,
+        time_limit_min=10,
+    )
+    assert executor.cluster == "process-pool"
+
+    with executor.batch():
+        jobs = [executor.submit(_add, i, 1) for i in range(3)]
+        failed_job = executor.submit(_fail)
+    assert [job.result() for job in jobs] == [1, 2, 3]
+    assert all(job.done() and job.state == "COMPLETED" for job in jobs)
+    assert "adding 2 and 1" in jobs[2].stdout()
+    # log files are found by job id, like the logs of submitit jobs
+    assert len({job.job_id for job in jobs}) == 3
+    assert (tmp_path / "logs" / f"{jobs[0].job_id}_0_log.out").exists()
+
+    assert isinstance(failed_job.exception(), ValueError)
+    assert failed_job.state == "FAILED"
+    executor.pool.shutdown()
+
+
+def test_process_pool_job_states(tmp_path):
+    executor = executors.ProcessPoolJobExecutor(tmp_path, max_workers=1)
+    running_job = executor.submit(time.sleep, 2)
+    queued_job = executor.submit(time.sleep, 0)
+    start = time.monotonic()
+    while running_job.state != "RUNNING" and time.monotonic() - start < 60:
+        time.sleep(0.05)
+
+    # the pool already moved the second job to its call queue, but no worker
+    # started it
+    assert running_job.state == "RUNNING"
+    assert queued_job._future.running()
+    assert queued_job.state == "PENDING"
+    assert queued_job.get_info()["NodeList"] == ""
+
+    queued_job.result()
+    assert queued_job.state == "COMPLETED"
+    executor.pool.shutdown()
+
+
+def test_submitit_executor(tmp_path):
+    executor = executors.get_executor(
+        settings.ExecutorSettings(backend="local", local_timeout_min=7),
+        tmp_path,
+        num_jobs=3,
+        gb_per_cpu=2,
+        cpus_per_task=4,
+        time_limit_min=10,
+    )
+    assert isinstance(executor, submitit.AutoExecutor)
+    assert executor.cluster == "local"
+    assert executor._executor.parameters["timeout_min"] == 7
+
+
+def test_process_pool_reconstruction(tmp_path, example_plate, capsys):
+    plate_path, _ = example_plate
+    position_paths = [
+        plate_path / "A" / "1" / "0",
+        plate_path / "B" / "1" / "0",
+        plate_path / "B" / "2" / "0",
+    ]
+    config_path = tmp_path / "birefringence.yml"
+    utils.model_to_yaml(
+        settings.ReconstructionSettings(
+            input_channel_names=[f"State{i}" for i in range(4)],
+            birefringence=settings.BirefringenceSettings(),
+            executor=settings.ExecutorSettings(
+                backend="process-pool", array_parallelism=2
+            ),
+        ),
+        config_path,
+    )
+    tf_path = tmp_path / "tf.zarr"
+    compute_transfer_function_cli(position_paths[0], config_path, tf_path)
+    output_path = tmp_path / "output.zarr"
+
+    apply_inverse_transfer_function_cli(
+        position_paths, tf_path, config_path, output_path
+    )
+
+    assert "3 jobs submitted via process-pool" in capsys.readouterr().out
+    assert len(list((tmp_path / "output_logs").glob("*_log.out"))) == 3
+    with open_ome_zarr(output_path / "B/2/0") as position:
+        assert "settings" in position.zattrs
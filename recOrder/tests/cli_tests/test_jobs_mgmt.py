@@ -0,0 +1,171 @@
+import queue
+import threading
+
+import pytest
+
+from recOrder.cli import jobs_mgmt
+from recOrder.cli.monitor import JobStates
+
+
+class FakeJob:
+    """Stand-in for a submitit job whose state the test controls."""
+
+    def __init__(self, job_id=""):
+        self.job_id = str(job_id)
+        self.state = "PENDING"
+        self.error = None
+        self.cancelled = threading.Event()
+
+    def get_info(self):
+        return {"State": self.state, "NodeList": ""}
+
+    def done(self):
+        return self.state in ("COMPLETED", "FAILED")
+
+    def exception(self):
+        return self.error
+
+    def cancel(self):
+        self.cancelled.set()
+
+
+@pytest.fixture(scope="function")
+def listener():
+    messages = queue.Queue()
+    listener = jobs_mgmt.JobEventListener(
+        lambda message, client_socket: messages.put((message, client_socket)),
+        port=0,
+    )
+    thread = threading.Thread(target=listener.serve_forever)
+    thread.start()
+    yield listener, messages
+    listener.stop()
+    thread.join()
+
+
+def test_message_reader():
+    messages = [{"a": 1}, {"b": "\n" * 3}, {"c": list(range(5000))}]
+    data = b"".join(map(jobs_mgmt.encode_message, messages))
+
+    # Messages split across reads at every possible boundary
+    for chunk_size in (1, 3, 4, 7, 1024, len(data)):
+        reader = jobs_mgmt.MessageReader()
+        received = []
+        for start in range(0, len(data), chunk_size):
+            received += reader.feed(data[start : start + chunk_size])
+        assert received == messages
+        assert len(reader.buffer) == 0
+    assert reader.feed(b"") == []
+
+
+def test_message_reader_corrupt_frame():
+    reader = jobs_mgmt.MessageReader()
+    with pytest.raises(ValueError):
+        reader.feed(jobs_mgmt.HEADER.pack(jobs_mgmt.MAX_MESSAGE_SIZE + 1))
+
+
+@pytest.mark.parametrize(
+    "state, error, status",
+    [
+        ("PENDING", None, jobs_mgmt.JOB_SUBMITTED),
+        ("RUNNING", None, jobs_mgmt.JOB_RUNNING),
+        ("COMPLETED", None, jobs_mgmt.JOB_DONE),
+        ("FAILED", ValueError(), jobs_mgmt.JOB_FAILED),
+    ],
+)
+def test_job_status(state, error, status):
+    job = FakeJob()
+    job.state, job.error = state, error
+    assert jobs_mgmt.job_status(job) == status
+
+
+def test_job_status_events(listener):
+    listener, messages = listener
+    jobs = [FakeJob(0), FakeJob(1)]
+    job_states = JobStates(jobs)
+
+    def update():
+        # like every update of monitor_jobs
+        changed = job_states.update()
+        if len(changed) > 0:
+            JM.push_status_transitions(job_states, changed)
+
+    JM = jobs_mgmt.JobsManagement()
+    client_thread = JM.start_client(port=listener.port)
+    for job_idx, job in enumerate(jobs):
+        JM.put_Job_in_list(job, "exp", job_idx, f"plate.zarr/A/1/{job_idx}")
+    JM.send_data()
+
+    message, client_socket = messages.get(timeout=5)
+    assert message == {
+        "jobs": [
+            {
+                "uID": "exp",
+                "jID": str(job_idx),
+                "pos": f"A-1-{job_idx}",
+                "log": "",
+            }
+            for job_idx in range(2)
+        ]
+    }
+
+    # Commands from the GUI reach the jobs
+    client_socket.sendall(
+        jobs_mgmt.encode_message({"uID": "exp", "jID": 1, "command": "cancel"})
+    )
+    assert jobs[1].cancelled.wait(timeout=5)
+
+    # Only state transitions are pushed, in the order they happen
+    update()
+    assert messages.empty()
+    jobs[0].state = "RUNNING"
+    update()
+    assert messages.get(timeout=5)[0] == {
+        "uID": "exp",
+        "jID": "0",
+        "status": jobs_mgmt.JOB_RUNNING,
+    }
+    jobs[0].state = "COMPLETED"
+    jobs[1].state, jobs[1].error = "FAILED", RuntimeError()
+    update()
+    received = [messages.get(timeout=5)[0] for _ in range(2)]
+    assert received == [
+        {"uID": "exp", "jID": "0", "status": jobs_mgmt.JOB_DONE},
+        {"uID": "exp", "jID": "1", "status": jobs_mgmt.JOB_FAILED},
+    ]
+
+    # The client exits once all of its jobs are done
+    client_thread.join(timeout=5)
+    assert not client_thread.is_alive()
+    assert messages.empty()
+
+
+def test_register_jobs_burst(listener):
+    listener, messages = listener
+    num_jobs = 10000
+
+    JM = jobs_mgmt.JobsManagement()
+    client_thread = JM.start_client(port=listener.port)
+    for job_idx in range(num_jobs):
+        JM.put_Job_in_list(
+            FakeJob(), "exp", job_idx, f"plate.zarr/A/1/{job_idx}", "logs"
+        )
+    JM.send_data()
+
+    # All registrations arrive, in order, batched in a few messages
+    registered = []
+    while len(registered) < num_jobs:
+        message, client_socket = messages.get(timeout=10)
+        registered += message["jobs"]
+    assert [job["jID"] for job in registered] == list(
+        map(str, range(num_jobs))
+    )
+    assert messages.empty()
+
+    client_socket.sendall(
+        jobs_mgmt.encode_message(
+            {"uID": "exp", "jID": "0", "command": "clientRelease"}
+        )
+    )
+    client_thread.join(timeout=5)
+    assert not client_thread.is_alive()
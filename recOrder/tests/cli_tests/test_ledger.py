@@ -0,0 +1,133 @@
+from unittest.mock import patch
+
+import numpy as np
+from iohub.ngff import open_ome_zarr
+
+from recOrder.cli import ledger, settings
+from recOrder.cli.apply_inverse_transfer_function import (
+    apply_inverse_transfer_function_cli,
+)
+from recOrder.cli.compute_transfer_function import (
+    compute_transfer_function_cli,
+)
+from recOrder.io import utils
+
+
+def test_ledger_key():
+    s = settings.ReconstructionSettings(
+        birefringence=settings.BirefringenceSettings()
+    )
+    key = ledger.ledger_key(s, ["Retardance"])
+
+    # the time indices, the executor, I/O and storage settings do not change
+    # written time points
+    s.time_indices = [0, 1]
+    s.executor = settings.ExecutorSettings(backend="process-pool")
+    s.processing = settings.ProcessingSettings(
+        prefetch_depth=2, time_batch_size="auto"
+    )
+    s.output = settings.OutputSettings(
+        compression="none", chunks=[1, 1, 1, 4, 4]
+    )
+    assert key == ledger.ledger_key(s, ["Retardance"])
+
+    s.processing = settings.ProcessingSettings(tile_size=64)
+    assert key != ledger.ledger_key(s, ["Retardance"])
+    s.processing = settings.ProcessingSettings()
+
+    assert key != ledger.ledger_key(s, ["Retardance", "Orientation"])
+    s.output = settings.OutputSettings(dtype="uint16")
+    assert key != ledger.ledger_key(s, ["Retardance"])
+
+
+def test_completion_ledger(tmp_path):
+    completion_ledger = ledger.CompletionLedger(tmp_path / "A/1/0", "key")
+    assert completion_ledger.completed() == set()
+    assert completion_ledger.remaining([0, 1, 2]) == [0, 1, 2]
+
+    completion_ledger.record([0])
+    completion_ledger.record([2, 0])
+    assert completion_ledger.completed() == {0, 2}
+    assert completion_ledger.remaining([0, 1, 2]) == [1]
+
+    # other reconstructions of the same position have their own ledger
+    assert (
+        ledger.CompletionLedger(tmp_path / "A/1/0", "other").completed()
+        == set()
+    )
+
+
+def test_resume_reconstruction(tmp_path, example_plate):
+    plate_path, plate_dataset = example_plate
+    position_paths = [
+        plate_path / "A" / "1" / "0",
+        plate_path / "B" / "1" / "0",
+    ]
+    for position_path in position_paths:
+        position = plate_dataset["/".join(position_path.parts[-3:])]
+        position["0"][:] = np.random.default_rng(0).integers(
+            1000, 2000, position["0"].shape, dtype=np.uint16
+        )
+    config_path = tmp_path / "birefringence.yml"
+    reconstruction_settings = settings.ReconstructionSettings(
+        input_channel_names=[f"State{i}" for i in range(4)],
+        birefringence=settings.BirefringenceSettings(),
+    )
+    utils.model_to_yaml(reconstruction_settings, config_path)
+    tf_path = tmp_path / "tf.zarr"
+    compute_transfer_function_cli(position_paths[0], config_path, tf_path)
+    output_path = tmp_path / "output.zarr"
+
+    apply_inverse_transfer_function_cli(
+        position_paths, tf_path, config_path, output_path
+    )
+    with open_ome_zarr(output_path / "A/1/0") as position:
+        expected = position["0"][:]
+        channel_names = position.channel_names
+    completion_ledger = ledger.CompletionLedger(
+        output_path / "A/1/0",
+        ledger.ledger_key(reconstruction_settings, channel_names),
+    )
+    assert completion_ledger.completed() == {0, 1}
+
+    # t=1 of A/1/0 was lost, e.g. by a preempted job
+    (completion_ledger.dirpath / "1").unlink()
+    with open_ome_zarr(output_path / "A/1/0", mode="r+") as position:
+        position["0"][:] = 0
+
+    with patch(
+        "recOrder.cli.apply_inverse_transfer_function.monitor_jobs"
+    ) as mock_monitor:
+        apply_inverse_transfer_function_cli(
+            position_paths, tf_path, config_path, output_path, resume=True
+        )
+        jobs, positions, _, _, _ = mock_monitor.call_args.args
+        for job in jobs:
+            job.result()
+
+    # only A/1/0 is resubmitted and only t=1 is reconstructed again
+    assert positions == [position_paths[0]]
+    assert completion_ledger.completed() == {0, 1}
+    with open_ome_zarr(output_path / "A/1/0") as position:
+        assert not position["0"][0].any()
+        np.testing.assert_array_equal(position["0"][1], expected[1])
+
+    # nothing is submitted once every time point is written
+    with patch(
+        "recOrder.cli.apply_inverse_transfer_function.get_executor"
+    ) as mock_executor:
+        apply_inverse_transfer_function_cli(
+            position_paths, tf_path, config_path, output_path, resume=True
+        )
+    mock_executor.assert_not_called()
+
+    # also when only I/O settings changed since the first run
+    reconstruction_settings.processing.prefetch_depth = 2
+    utils.model_to_yaml(reconstruction_settings, config_path)
+    with patch(
+        "recOrder.cli.apply_inverse_transfer_function.get_executor"
+    ) as mock_executor:
+        apply_inverse_transfer_function_cli(
+            position_paths, tf_path, config_path, output_path, resume=True
+        )
+    mock_executor.assert_not_called()
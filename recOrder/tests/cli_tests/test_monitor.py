@@ -0,0 +1,178 @@
+import csv
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+from submitit.core.utils import cloudpickle_dump
+
+from recOrder.cli import monitor
+from recOrder.scripts.benchmark_monitor import fake_jobs
+
+
+def test_job_states_one_query_per_update(tmp_path):
+    jobs, watcher = fake_jobs(tmp_path, 2000, 1000, duration=1e6)
+    job_states = monitor.JobStates(jobs)
+
+    changed = job_states.update()
+    assert watcher.num_calls == 1
+    # the first wave is running, the second one is pending
+    assert len(changed) == 2000
+    assert job_states.state(0) == "RUNNING"
+    assert job_states.state(1999) == "PENDING"
+    assert not job_states.done.any()
+
+    # unchanged jobs are not reported again
+    assert len(job_states.update()) == 0
+    assert watcher.num_calls == 2
+
+
+def test_monitor_jobs_until_done(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(monitor, "MIN_INTERVAL", 0.05)
+    monkeypatch.setattr(monitor, "MAX_INTERVAL", 0.2)
+    jobs, watcher = fake_jobs(tmp_path, 10000, 5000, duration=0.5)
+    positions = [Path(f"plate.zarr/A/1/{i}") for i in range(len(jobs))]
+
+    monitor.monitor_jobs(jobs, positions)
+
+    # one query per update, not per job
+    assert watcher.num_calls < 50
+    assert "10000/10000 jobs complete" in capsys.readouterr().out
+
+
+def test_status_display_redraws_changed_lines(capsys):
+    display = monitor._StatusDisplay()
+    display.draw(["header", "job 0", "job 1", "footer"])
+    assert capsys.readouterr().out.count("\033[K") == 4
+
+    display.draw(["header", "job 0", "job 1 done", "footer"])
+    output = capsys.readouterr().out
+    assert output.count("\033[K") == 1
+    assert "job 1 done" in output and "job 0" not in output
+
+
+def test_get_jobs_to_print(tmp_path):
+    jobs, _ = fake_jobs(tmp_path, 5, 5, duration=1e6)
+    job_states = monitor.JobStates(jobs)
+    job_states.done[[0, 2]] = True
+    np.testing.assert_array_equal(
+        monitor._get_jobs_to_print(job_states, 4), [1, 3, 4, 0]
+    )
+
+
+def test_throughput(tmp_path):
+    jobs, _ = fake_jobs(tmp_path, 4, 4, duration=1e6)
+    job_states = monitor.JobStates(jobs)
+    now = job_states.monitor_start_time + 3600
+    assert job_states.eta(now) is None
+
+    job_states.done[:2] = True
+    job_states.nodes[:2] = ["node0", "node1"]
+    job_states.start_times[:2] = job_states.monitor_start_time
+    job_states.end_times[:2] = job_states.monitor_start_time + np.array(
+        [60, 120]
+    )
+    assert job_states.jobs_per_hour(now) == 2
+    # whole-position jobs have no known number of time points
+    assert job_states.time_points_per_hour(now) is None
+    assert job_states.eta(now) == 3600
+    assert job_states.node_throughput(now) == {
+        "node0": {
+            "jobs": 1,
+            "jobs_per_hour": 1,
+            "time_points_per_hour": None,
+            "mean_job_s": 60,
+        },
+        "node1": {
+            "jobs": 1,
+            "jobs_per_hour": 1,
+            "time_points_per_hour": None,
+            "mean_job_s": 120,
+        },
+    }
+
+
+def test_throughput_sharded_jobs(tmp_path):
+    jobs, _ = fake_jobs(tmp_path, 4, 4, duration=1e6)
+    # two positions, each split into shards of 3 and 2 time points
+    job_states = monitor.JobStates(jobs, [[0, 1, 2], [3, 4]] * 2)
+    now = job_states.monitor_start_time + 3600
+
+    job_states.done[:2] = True
+    job_states.nodes[:2] = "node0"
+    job_states.start_times[:2] = job_states.monitor_start_time
+    job_states.end_times[:2] = job_states.monitor_start_time + 60
+    # one position in an hour, not two
+    assert job_states.jobs_per_hour(now) == 2
+    assert job_states.time_points_per_hour(now) == 5
+    assert (
+        job_states.node_throughput(now)["node0"]["time_points_per_hour"] == 5
+    )
+    assert "2.0 jobs/h, 5.0 time points/h" in monitor._format_footer(
+        job_states, now
+    )
+
+
+def test_job_states_reported_times(tmp_path):
+    jobs, watcher = fake_jobs(tmp_path, 2, 2, duration=0)
+    job_states = monitor.JobStates(jobs)
+    # the first job returns the times it ran, the second one has no result
+    # file, like a failed job
+    reported = (watcher.start - 30, watcher.start - 10)
+    jobs[0].paths.folder.mkdir(parents=True, exist_ok=True)
+    cloudpickle_dump(
+        ("success", {"start_time": reported[0], "end_time": reported[1]}),
+        jobs[0].paths.result_pickle,
+    )
+
+    job_states.update()
+    assert job_states.done.all()
+    assert (job_states.start_times[0], job_states.end_times[0]) == reported
+    assert job_states.elapsed(0, time.time()) == 20
+    # without reported times, the times of the update are kept
+    assert job_states.end_times[1] >= watcher.start
+
+
+def test_monitor_jobs_run_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(monitor, "MIN_INTERVAL", 0.05)
+    jobs, _ = fake_jobs(tmp_path, 20, 10, duration=0.2)
+    positions = [Path(f"plate.zarr/A/1/{i}") for i in range(len(jobs))]
+    report_path = tmp_path / "output_report.json"
+
+    monitor.monitor_jobs(
+        jobs, positions, do_print=False, report_filepath=report_path
+    )
+
+    with open(report_path) as file:
+        report = json.load(file)
+    assert report["num_done"] == 20
+    assert report["states"] == {"COMPLETED": 20}
+    assert report["jobs_per_hour"] > 0
+    assert report["time_points_per_hour"] is None
+    assert sum(node["jobs"] for node in report["nodes"].values()) == 20
+    # the second wave starts once the first one finishes
+    first, last = report["jobs"][0], report["jobs"][-1]
+    assert first["position"] == "A/1/0"
+    assert first["start"] <= first["end"] <= last["end"]
+    assert 0 < first["elapsed_s"] < 5
+
+    with open(report_path.with_suffix(".csv")) as file:
+        rows = list(csv.DictReader(file))
+    assert len(rows) == 20
+    assert rows[-1]["job_id"] == "19"
+
+
+def test_run_report_sharded_jobs(tmp_path):
+    jobs, _ = fake_jobs(tmp_path, 3, 3, duration=1e6)
+    position = Path("plate.zarr/A/1/0")
+    job_states = monitor.JobStates(jobs)
+
+    report = monitor.run_report(
+        job_states, [position] * 3, [None, [0, 1, 2], [3, 4]]
+    )
+    assert [job["position"] for job in report["jobs"]] == ["A/1/0"] * 3
+    assert [job["time_points"] for job in report["jobs"]] == [
+        "all",
+        "t0-2",
+        "t3-4",
+    ]
@@ -0,0 +1,57 @@
+import time
+
+import click
+import pytest
+from iohub.ngff import open_ome_zarr
+
+from recOrder.cli.parsing import _validate_and_process_paths
+
+
+def test_validate_and_process_paths(tmp_path, example_plate):
+    plate_path, plate_dataset = example_plate
+    expected = [plate_path / name for name, _ in plate_dataset.positions()]
+
+    # A plate expands to its positions, and positions pass through
+    assert _validate_and_process_paths(None, None, (str(plate_path),)) == (
+        expected
+    )
+    assert _validate_and_process_paths(
+        None, None, tuple(str(path) for path in reversed(expected))
+    ) == (expected)
+
+    # Positions added to the plate are seen after the metadata changes
+    time.sleep(0.01)
+    plate_dataset.create_position("B", "2", "1").create_zeros(
+        "0", (1, 1, 1, 1, 1), dtype="uint16"
+    )
+    assert _validate_and_process_paths(None, None, (str(plate_path),)) == (
+        expected + [plate_path / "B" / "2" / "1"]
+    )
+
+    with pytest.raises(click.BadParameter):
+        _validate_and_process_paths(None, None, (str(plate_path / "A"),))
+    with pytest.raises(click.BadParameter):
+        _validate_and_process_paths(None, None, (str(tmp_path / "none"),))
+
+
+def test_validate_many_positions(tmp_path):
+    plate_path = tmp_path / "input.zarr"
+    with open_ome_zarr(
+        plate_path, layout="hcs", mode="w", channel_names=["BF"]
+    ) as plate_dataset:
+        for well_idx in range(12):
+            for position_idx in range(25):
+                plate_dataset.create_position(
+                    "A", str(well_idx + 1), str(position_idx)
+                ).create_zeros("0", (1, 1, 1, 1, 1), dtype="uint16")
+
+    position_paths = tuple(
+        str(plate_path / "A" / str(well_idx + 1) / str(position_idx))
+        for well_idx in range(12)
+        for position_idx in range(25)
+    )
+    assert _validate_and_process_paths(None, None, position_paths) == [
+        plate_path / "A" / str(well_idx + 1) / str(position_idx)
+        for well_idx in range(12)
+        for position_idx in range(25)
+    ]
@@ -0,0 +1,290 @@
+import numpy as np
+import pytest
+from click.testing import CliRunner
+from iohub.ngff import open_ome_zarr
+
+from recOrder.cli import settings
+from recOrder.cli.main import cli
+from recOrder.cli.utils import (
+    apply_inverse_to_zyx_and_save_overlap_tiled,
+    close_output_positions,
+    create_empty_hcs_zarr,
+)
+from recOrder.io import utils
+
+
+@pytest.fixture(scope="function")
+def random_input_path(tmp_path):
+    input_path = tmp_path / "input.zarr"
+    dataset = open_ome_zarr(
+        input_path,
+        layout="hcs",
+        mode="w",
+        channel_names=[f"State{i}" for i in range(4)],
+    )
+    position = dataset.create_position("0", "0", "0")
+    rng = np.random.default_rng(0)
+    position.create_image(
+        "0", rng.integers(100, 1000, (2, 4, 3, 7, 9), dtype=np.uint16)
+    )
+    dataset.close()
+    yield input_path / "0" / "0" / "0"
+
+
+def _reconstruct(tmp_path, input_path, name, recon_settings):
+    config_path = tmp_path / f"{name}.yml"
+    output_path = tmp_path / f"{name}.zarr"
+    utils.model_to_yaml(recon_settings, config_path)
+    result = CliRunner().invoke(
+        cli,
+        [
+            "reconstruct",
+            "-i",
+            str(input_path),
+            "-c",
+            str(config_path),
+            "-o",
+            str(output_path),
+        ],
+        catch_exceptions=False,
+    )
+    assert result.exit_code == 0
+    with open_ome_zarr(output_path / "0" / "0" / "0") as dataset:
+        return dataset["0"][:]
+
+
+@pytest.mark.parametrize("reconstruction_dimension", [2, 3])
+def test_tiled_birefringence(
+    tmp_path, random_input_path, reconstruction_dimension
+):
+    volumes = []
+    for tile_size in (0, 4):
+        recon_settings = settings.ReconstructionSettings(
+            reconstruction_dimension=reconstruction_dimension,
+            birefringence=settings.BirefringenceSettings(),
+            processing=settings.ProcessingSettings(tile_size=tile_size),
+        )
+        volumes.append(
+            _reconstruct(
+                tmp_path,
+                random_input_path,
+                f"tile_{tile_size}",
+                recon_settings,
+            )
+        )
+
+    # The tiled job streamed tiles through the inverse
+    job_logs = "".join(
+        log_path.read_text()
+        for log_path in (tmp_path / "tile_4_logs").glob("*.out")
+    )
+    assert "in 4px tiles" in job_logs
+
+    assert np.any(volumes[0] != 0)
+    np.testing.assert_allclose(volumes[0], volumes[1], rtol=1e-5, atol=1e-5)
+
+
+def test_overlap_tiles_cover_output(tmp_path, random_input_path):
+    # A pixel-local function must be reproduced exactly through the blending
+    output_path = tmp_path / "output.zarr"
+    create_empty_hcs_zarr(
+        output_path,
+        [("0", "0", "0")],
+        (2, 4, 3, 7, 9),
+        (1, 1, 1, 7, 9),
+        (1,) * 5,
+        [f"State{i}" for i in range(4)],
+        np.float32,
+    )
+    output_position_path = output_path / "0" / "0" / "0"
+    with open_ome_zarr(random_input_path) as input_dataset:
+        apply_inverse_to_zyx_and_save_overlap_tiled(
+            lambda czyx_data: 2 * czyx_data,
+            input_dataset,
+            output_position_path,
+            [0, 1, 2, 3],
+            [0, 1, 2, 3],
+            t_idx=1,
+            tile_size=3,
+            tile_overlap=4,
+        )
+        close_output_positions(output_position_path)
+        expected = 2 * input_dataset["0"][1].astype(np.float32)
+
+    with open_ome_zarr(output_position_path) as output_dataset:
+        np.testing.assert_allclose(output_dataset["0"][1], expected)
+
+
+@pytest.mark.parametrize("tile_size", [4, 16])
+def test_overlap_tiled_phase(tmp_path, random_input_path, tile_size):
+    volumes = []
+    for name, processing in (
+        ("whole", settings.ProcessingSettings()),
+        (
+            "tiled",
+            settings.ProcessingSettings(tile_size=tile_size, tile_overlap=2),
+        ),
+    ):
+        recon_settings = settings.ReconstructionSettings(
+            input_channel_names=["State0"],
+            reconstruction_dimension=3,
+            phase=settings.PhaseSettings(),
+            processing=processing,
+        )
+        volumes.append(
+            _reconstruct(tmp_path, random_input_path, name, recon_settings)
+        )
+
+    # The transfer function was computed for one tile and its halo
+    tf_path = tmp_path / "transfer_function_tiled.zarr"
+    with open_ome_zarr(tf_path) as tf_dataset:
+        tf_yx_shape = tf_dataset["real_potential_transfer_function"].shape
+    assert tf_yx_shape[-2:] == (min(tile_size + 4, 7), min(tile_size + 4, 9))
+
+    assert volumes[1].shape == volumes[0].shape
+    assert np.all(np.isfinite(volumes[1]))
+    if tile_size >= 9:
+        # a single tile covers the field of view
+        np.testing.assert_allclose(volumes[0], volumes[1], atol=1e-6)
+
+
+def test_overlap_tiled_phase_matches_whole(tmp_path):
+    # Smooth random sample, large enough for 3x3 tiles with a wide halo
+    rng = np.random.default_rng(0)
+    spectrum = np.fft.fftn(rng.normal(size=(8, 96, 96)))
+    frequencies = np.meshgrid(
+        *(np.fft.fftfreq(n) for n in (8, 96, 96)), indexing="ij"
+    )
+    spectrum *= np.exp(-sum((f / 0.1) ** 2 for f in frequencies))
+    sample = np.real(np.fft.ifftn(spectrum))
+    input_path = tmp_path / "smooth.zarr"
+    with open_ome_zarr(
+        input_path, layout="hcs", mode="w", channel_names=["State0"]
+    ) as dataset:
+        position = dataset.create_position("0", "0", "0")
+        position.create_image(
+            "0",
+            (1000 + 300 * sample / sample.std())[None, None].astype(np.uint16),
+        )
+
+    volumes = []
+    for name, processing in (
+        ("whole", settings.ProcessingSettings()),
+        (
+            "tiled",
+            settings.ProcessingSettings(tile_size=32, tile_overlap=16),
+        ),
+    ):
+        recon_settings = settings.ReconstructionSettings(
+            input_channel_names=["State0"],
+            reconstruction_dimension=3,
+            phase=settings.PhaseSettings(),
+            processing=processing,
+        )
+        volumes.append(
+            _reconstruct(
+                tmp_path, input_path / "0" / "0" / "0", name, recon_settings
+            )[0, 0]
+        )
+
+    # Tiles only see their halo of the sample, and the whole-image inverse
+    # wraps around the field of view, so compare away from the field of view
+    # edges, where the blended tiles must agree with the whole image
+    whole, tiled = (volume[2:-2, 16:-16, 16:-16] for volume in volumes)
+    np.testing.assert_allclose(tiled, whole, atol=0.03 * np.abs(whole).max())
+
+
+@pytest.mark.parametrize("time_batch_size", [2, "auto"])
+def test_time_batched_birefringence(
+    tmp_path, random_input_path, time_batch_size
+):
+    volumes = []
+    for name, processing in (
+        ("single", settings.ProcessingSettings()),
+        (
+            "batched",
+            settings.ProcessingSettings(time_batch_size=time_batch_size),
+        ),
+    ):
+        recon_settings = settings.ReconstructionSettings(
+            reconstruction_dimension=2,
+            birefringence=settings.BirefringenceSettings(),
+            processing=processing,
+        )
+        volumes.append(
+            _reconstruct(tmp_path, random_input_path, name, recon_settings)
+        )
+
+    job_logs = "".join(
+        log_path.read_text()
+        for log_path in (tmp_path / "batched_logs").glob("*.out")
+    )
+    assert "time points per batch" in job_logs
+
+    np.testing.assert_allclose(volumes[0], volumes[1], rtol=1e-5, atol=1e-5)
+
+
+@pytest.mark.parametrize(
+    "dtype, modality, processing",
+    [
+        ("float16", "birefringence", {}),
+        ("uint16", "birefringence", {}),
+        ("uint16", "phase", {"tile_size": 4, "tile_overlap": 2}),
+    ],
+)
+def test_output_dtype(
+    tmp_path, random_input_path, dtype, modality, processing
+):
+    volumes = []
+    for output_dtype in ("float32", dtype):
+        recon_settings = settings.ReconstructionSettings(
+            input_channel_names=(
+                ["State0"]
+                if modality == "phase"
+                else [f"State{i}" for i in range(4)]
+            ),
+            **{
+                modality: getattr(
+                    settings, f"{modality.capitalize()}Settings"
+                )()
+            },
+            processing=settings.ProcessingSettings(**processing),
+            output=settings.OutputSettings(dtype=output_dtype),
+        )
+        volumes.append(
+            _reconstruct(
+                tmp_path, random_input_path, output_dtype, recon_settings
+            )
+        )
+    assert volumes[1].dtype == np.dtype(dtype)
+
+    if dtype == "float16":
+        np.testing.assert_allclose(
+            volumes[1], volumes[0], rtol=1e-3, atol=1e-3
+        )
+        return
+
+    output_path = tmp_path / f"{dtype}.zarr"
+    with open_ome_zarr(output_path / "0" / "0" / "0") as dataset:
+        output_scaling = dataset.zattrs["output_scaling"]
+        channel_names = dataset.channel_names
+    # Values outside the range estimated from the first time point clip
+    scale, offset = (
+        np.array([output_scaling[name][key] for name in channel_names])[
+            :, None, None, None
+        ]
+        for key in ("scale", "offset")
+    )
+    expected = np.clip(volumes[0], offset, offset + 65535 * scale)
+    np.testing.assert_allclose(
+        volumes[1] * scale + offset, expected, rtol=0, atol=scale.max()
+    )
+
+    # The napari reader decodes to float32
+    pytest.importorskip("napari_ome_zarr")
+    from recOrder.io._reader import hcs_zarr_reader
+
+    (napari_data, _), *_ = hcs_zarr_reader(str(output_path))
+    napari_data = np.asarray(napari_data)
+    assert napari_data.dtype == np.float32
+    np.testing.assert_allclose(napari_data, expected, atol=scale.max())
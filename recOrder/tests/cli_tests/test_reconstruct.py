@@ -10,6 +10,7 @@ from recOrder.cli.main import cli
 from recOrder.io import utils
 from recOrder.cli.apply_inverse_transfer_function import (
     apply_inverse_transfer_function_cli,
+    get_reconstruction_output_metadata,
 )
 from unittest.mock import patch
 import pytest
@@ -222,6 +223,10 @@ def test_cli_apply_inv_tf_mock(tmp_input_path_zarr):
             Path(result_path),
             1,
             1,
+            run_report=False,
+            calibrate=False,
+            job_minutes=None,
+            resume=False,
         )
         assert result_inv.exit_code == 0
 
@@ -260,3 +265,41 @@ def test_cli_apply_inv_tf_output(tmp_input_path_zarr, capsys):
 
         # Check scale transformations pass through
         assert input_scale == result_dataset.scale
+
+
+@pytest.mark.parametrize(
+    "dimension, processing, output, expected_chunks",
+    [
+        (3, {}, {}, (1, 1, 4, 5, 6)),
+        (2, {}, {}, (1, 1, 1, 5, 6)),
+        (3, {"tile_size": 2}, {}, (1, 1, 1, 2, 2)),
+        (3, {}, {"target_chunk_mb": 1e-4}, (1, 1, 1, 5, 6)),
+        (3, {}, {"chunks": [1, 1, 2, 5, 6]}, (1, 1, 2, 5, 6)),
+    ],
+)
+def test_output_chunks(
+    tmp_path, example_plate, dimension, processing, output, expected_chunks
+):
+    plate_path, _ = example_plate
+    recon_settings = settings.ReconstructionSettings(
+        reconstruction_dimension=dimension,
+        birefringence=settings.BirefringenceSettings(),
+        processing=settings.ProcessingSettings(**processing),
+        output=settings.OutputSettings(**output),
+    )
+    config_path = tmp_path / "config.yml"
+    utils.model_to_yaml(recon_settings, config_path)
+
+    output_metadata = get_reconstruction_output_metadata(
+        plate_path / "A" / "1" / "0", config_path
+    )
+    assert output_metadata["chunks"] == expected_chunks
+
+
+def test_output_chunks_validation():
+    with pytest.raises(ValueError):
+        settings.OutputSettings(chunks=[1, 1, 5, 6])
+    with pytest.raises(ValueError):
+        settings.OutputSettings(chunks=[2, 1, 1, 5, 6])
+    with pytest.raises(ValueError):
+        settings.OutputSettings(chunks=[1, 2, 1, 5, 6])
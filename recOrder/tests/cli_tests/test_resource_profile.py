@@ -0,0 +1,93 @@
+import time
+from unittest.mock import patch
+
+from recOrder.cli import resource_profile, settings
+from recOrder.cli.compute_transfer_function import (
+    compute_transfer_function_cli,
+)
+from recOrder.io import utils
+
+
+def test_resource_profile_key():
+    s = settings.ReconstructionSettings(
+        birefringence=settings.BirefringenceSettings()
+    )
+    key_hash = resource_profile.resource_profile_hash(
+        resource_profile.resource_profile_key(s, (4, 5, 6, 7), "uint16")
+    )
+
+    # profiles are per time point
+    s.time_indices = [0, 1]
+    assert key_hash == resource_profile.resource_profile_hash(
+        resource_profile.resource_profile_key(s, (4, 5, 6, 7), "uint16")
+    )
+
+    # settings and shapes change the profile
+    s.phase = settings.PhaseSettings()
+    assert key_hash != resource_profile.resource_profile_hash(
+        resource_profile.resource_profile_key(s, (4, 5, 6, 7), "uint16")
+    )
+    assert key_hash != resource_profile.resource_profile_hash(
+        resource_profile.resource_profile_key(s, (4, 5, 6, 8), "uint16")
+    )
+
+
+def test_size_job():
+    profile = {"peak_gb": 3.0, "seconds_per_time_point": 90.0}
+    resources = resource_profile.size_job(profile, 100, 8)
+    assert resources == {
+        "slurm_mem_per_cpu": 5,  # ceil(1.5 * 3)
+        "slurm_cpus_per_task": 8,
+        "slurm_time": 39,  # 2 * 90 s * ceil(100 / 8) time points
+    }
+
+    # no more CPUs than time points, at least 1 GB and MIN_SLURM_TIME
+    profile = {"peak_gb": 0.1, "seconds_per_time_point": 1.0}
+    assert resource_profile.size_job(profile, 2, 8) == {
+        "slurm_mem_per_cpu": 1,
+        "slurm_cpus_per_task": 2,
+        "slurm_time": resource_profile.MIN_SLURM_TIME,
+    }
+    assert (
+        resource_profile.size_job(profile, 2, 8, ram_multiplier=20)[
+            "slurm_mem_per_cpu"
+        ]
+        == 3
+    )
+
+
+def test_get_resource_profile(tmp_path, example_plate):
+    plate_path, _ = example_plate
+    position_path = plate_path / "A" / "1" / "0"
+    config_path = tmp_path / "birefringence.yml"
+    utils.model_to_yaml(
+        settings.ReconstructionSettings(
+            input_channel_names=[f"State{i}" for i in range(4)],
+            birefringence=settings.BirefringenceSettings(),
+        ),
+        config_path,
+    )
+    tf_path = tmp_path / "tf.zarr"
+    compute_transfer_function_cli(position_path, config_path, tf_path)
+    profile_path = tmp_path / "profiles"
+
+    start = time.perf_counter()
+    profile = resource_profile.get_resource_profile(
+        position_path, tf_path, config_path, profile_path
+    )
+    elapsed = time.perf_counter() - start
+    assert profile["num_time_points"] == 1
+    # only the reconstruction loop, without starting the probe process
+    assert 0 < profile["seconds_per_time_point"] < elapsed / 2
+    # at least the interpreter of the probe process
+    assert profile["peak_gb"] > 0.01
+    assert len(list(profile_path.glob("*.json"))) == 1
+
+    # later runs reuse the cached profile
+    with patch(
+        "recOrder.cli.resource_profile.measure_resource_profile"
+    ) as mock:
+        assert profile == resource_profile.get_resource_profile(
+            position_path, tf_path, config_path, profile_path
+        )
+    mock.assert_not_called()
@@ -87,6 +87,29 @@ def test_fluor_tf_settings():
         )
 
 
+def test_executor_settings():
+    s = settings.ExecutorSettings()
+    assert s.backend == "auto"
+    assert s.mem_per_cpu_gb == "auto"
+
+    settings.ExecutorSettings(
+        backend="process-pool", array_parallelism=4, time_limit_min=120
+    )
+
+    with pytest.raises(ValidationError):
+        settings.ExecutorSettings(backend="kubernetes")
+
+    with pytest.raises(ValidationError):
+        settings.ExecutorSettings(array_parallelism=0)
+
+    with pytest.raises(ValidationError):
+        settings.ExecutorSettings(mem_per_cpu_gb="lots")
+
+    # Test typo
+    with pytest.raises(ValidationError):
+        settings.ExecutorSettings(partiton="gpu")
+
+
 def test_generate_example_settings():
     example_path = "./examples/"
 
@@ -0,0 +1,112 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+from iohub.ngff import open_ome_zarr
+
+from recOrder.cli import settings, sharding
+from recOrder.cli.apply_inverse_transfer_function import (
+    apply_inverse_transfer_function_cli,
+)
+from recOrder.cli.compute_transfer_function import (
+    compute_transfer_function_cli,
+)
+from recOrder.io import utils
+
+
+def test_shard_size():
+    # 10 time points per process in 5 minutes
+    assert sharding.shard_size(30, 5) == 10
+    assert sharding.shard_size(30, 5, num_processes=4) == 40
+    # at least one time point per process
+    assert sharding.shard_size(600, 5, num_processes=2) == 2
+
+
+def test_plan_shards():
+    positions = [Path("input.zarr/A/1/0"), Path("input.zarr/B/1/0")]
+
+    # whole positions by default and when a shard holds all time points
+    assert sharding.plan_shards(positions, list(range(10))) == [
+        (positions[0], None),
+        (positions[1], None),
+    ]
+    assert sharding.plan_shards(positions, list(range(10)), 10) == [
+        (positions[0], None),
+        (positions[1], None),
+    ]
+
+    # balanced chunks instead of a short last chunk
+    shards = sharding.plan_shards(positions, list(range(10)), 4)
+    assert shards == [
+        (positions[0], [0, 1, 2, 3]),
+        (positions[0], [4, 5, 6]),
+        (positions[0], [7, 8, 9]),
+        (positions[1], [0, 1, 2, 3]),
+        (positions[1], [4, 5, 6]),
+        (positions[1], [7, 8, 9]),
+    ]
+    assert sharding.plan_shards(positions[:1], [3, 5, 8], 1) == [
+        (positions[0], [3]),
+        (positions[0], [5]),
+        (positions[0], [8]),
+    ]
+
+
+def test_shard_label():
+    position = Path("input.zarr/A/1/0")
+    assert sharding.shard_label(position) == "A/1/0"
+    assert sharding.shard_label(position, [4]) == "A/1/0 t4"
+    assert sharding.shard_label(position, [4, 5, 6]) == "A/1/0 t4-6"
+    assert sharding.shard_label(position, [0, 2, 4]) == "A/1/0 t0..4 (3)"
+
+
+def test_sharded_reconstruction(tmp_path, example_plate):
+    plate_path, plate_dataset = example_plate
+    position_path = plate_path / "A" / "1" / "0"
+    position = plate_dataset["A/1/0"]
+    position["0"][:] = np.random.default_rng(0).integers(
+        1000, 2000, position["0"].shape, dtype=np.uint16
+    )
+    config_path = tmp_path / "birefringence.yml"
+    utils.model_to_yaml(
+        settings.ReconstructionSettings(
+            input_channel_names=[f"State{i}" for i in range(4)],
+            birefringence=settings.BirefringenceSettings(),
+        ),
+        config_path,
+    )
+    tf_path = tmp_path / "tf.zarr"
+    compute_transfer_function_cli(position_path, config_path, tf_path)
+
+    whole_path = tmp_path / "whole.zarr"
+    apply_inverse_transfer_function_cli(
+        [position_path], tf_path, config_path, whole_path
+    )
+
+    # one time point per job
+    sharded_path = tmp_path / "sharded.zarr"
+    profile = {"peak_gb": 0.1, "seconds_per_time_point": 60.0}
+    with patch(
+        "recOrder.cli.apply_inverse_transfer_function.get_resource_profile",
+        return_value=profile,
+    ), patch(
+        "recOrder.cli.apply_inverse_transfer_function.monitor_jobs"
+    ) as mock_monitor:
+        apply_inverse_transfer_function_cli(
+            [position_path],
+            tf_path,
+            config_path,
+            sharded_path,
+            job_minutes=1,
+        )
+        jobs, positions, _, _, time_indices = mock_monitor.call_args.args
+        for job in jobs:
+            job.result()
+
+    assert len(jobs) == 2
+    assert positions == [position_path, position_path]
+    assert time_indices == [[0], [1]]
+    with open_ome_zarr(whole_path / "A/1/0") as whole, open_ome_zarr(
+        sharded_path / "A/1/0"
+    ) as sharded:
+        np.testing.assert_array_equal(whole["0"][:], sharded["0"][:])
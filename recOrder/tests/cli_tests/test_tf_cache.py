@@ -0,0 +1,100 @@
+from unittest.mock import patch
+
+from click.testing import CliRunner
+
+from recOrder.cli import settings, tf_cache
+from recOrder.cli.main import cli
+from recOrder.io import utils
+
+
+def _write_config(tmp_path, name, swing=0.1):
+    recon_settings = settings.ReconstructionSettings(
+        birefringence=settings.BirefringenceSettings(
+            transfer_function=settings.BirefringenceTransferFunctionSettings(
+                swing=swing
+            )
+        )
+    )
+    config_path = tmp_path / name
+    utils.model_to_yaml(recon_settings, config_path)
+    return config_path
+
+
+def test_cache_key():
+    s = settings.ReconstructionSettings(
+        birefringence=settings.BirefringenceSettings()
+    )
+    key = tf_cache.transfer_function_cache_key(s, (4, 5, 6))
+    key_hash = tf_cache.transfer_function_cache_hash(key)
+
+    # apply-inverse settings do not change the transfer function
+    s.birefringence.apply_inverse.flip_orientation = True
+    assert key_hash == tf_cache.transfer_function_cache_hash(
+        tf_cache.transfer_function_cache_key(s, (4, 5, 6))
+    )
+
+    # transfer function settings and shapes do
+    s.birefringence.transfer_function.swing = 0.2
+    assert key_hash != tf_cache.transfer_function_cache_hash(
+        tf_cache.transfer_function_cache_key(s, (4, 5, 6))
+    )
+    assert key_hash != tf_cache.transfer_function_cache_hash(
+        tf_cache.transfer_function_cache_key(s, (4, 5, 7))
+    )
+
+
+def test_get_cached_transfer_function(tmp_path, example_plate):
+    plate_path, _ = example_plate
+    position_path = plate_path / "A" / "1" / "0"
+    cache_path = tmp_path / "cache"
+    config_path = _write_config(tmp_path, "biref.yml")
+
+    entry_path = tf_cache.get_cached_transfer_function(
+        position_path, config_path, cache_path
+    )
+    assert entry_path.exists()
+    assert entry_path.parent == cache_path
+
+    # A hit returns the same entry without recomputing
+    with patch("recOrder.cli.tf_cache.compute_transfer_function_cli") as mock:
+        assert entry_path == tf_cache.get_cached_transfer_function(
+            position_path, config_path, cache_path
+        )
+        mock.assert_not_called()
+
+    entries = tf_cache.list_cached_transfer_functions(cache_path)
+    assert len(entries) == 1
+    assert entries[0]["cache_key"]["zyx_shape"] == [4, 5, 6]
+
+
+def test_prune_and_cli(tmp_path, example_plate):
+    plate_path, _ = example_plate
+    position_path = plate_path / "A" / "1" / "0"
+    cache_path = tmp_path / "cache"
+    for swing in (0.1, 0.2):
+        config_path = _write_config(tmp_path, f"{swing}.yml", swing)
+        tf_cache.get_cached_transfer_function(
+            position_path, config_path, cache_path
+        )
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli, ["tf-cache", "ls", "--cache-dirpath", str(cache_path)]
+    )
+    assert result.exit_code == 0
+    assert "2 entries" in result.output
+
+    result = runner.invoke(
+        cli,
+        [
+            "tf-cache",
+            "prune",
+            "--cache-dirpath",
+            str(cache_path),
+            "--max-gb",
+            "0",
+        ],
+    )
+    assert result.exit_code == 0
+    assert "Removed 2 entries" in result.output
+    assert tf_cache.list_cached_transfer_functions(cache_path) == []
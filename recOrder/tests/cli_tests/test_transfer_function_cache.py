@@ -0,0 +1,119 @@
+import numpy as np
+import torch
+import torch.multiprocessing as mp
+from iohub.ngff import open_ome_zarr
+
+from recOrder.cli.transfer_function_cache import (
+    TRANSFER_FUNCTION_CACHE,
+    TransferFunctionCache,
+    attach_shared_transfer_functions,
+)
+
+
+def _write_transfer_functions(path):
+    dataset = open_ome_zarr(
+        path, layout="fov", mode="w", channel_names=["None"]
+    )
+    dataset["optical_transfer_function"] = np.ones(
+        (1, 1, 3, 4, 5), dtype=np.complex64
+    )
+    dataset["intensity_to_stokes_matrix"] = np.ones(
+        (1, 1, 1, 5, 4), dtype=np.float32
+    )
+    return dataset
+
+
+def test_cache_hits_and_misses(tmp_path):
+    dataset = _write_transfer_functions(tmp_path / "tf.zarr")
+    cache = TransferFunctionCache()
+
+    otf = cache.get(dataset, "optical_transfer_function")
+    assert isinstance(otf, torch.Tensor)
+    assert otf.shape == (3, 4, 5)
+    assert cache.get(dataset, "optical_transfer_function") is otf
+
+    matrix = cache.get(dataset, "intensity_to_stokes_matrix", (0, 0, 0))
+    assert matrix.shape == (5, 4)
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 2
+    assert stats["bytes_loaded"] == 3 * 4 * 5 * 8 + 5 * 4 * 4
+    assert stats["num_arrays"] == 2
+
+    # counters restart, cached arrays stay
+    cache.reset_stats()
+    cache.get(dataset, "optical_transfer_function")
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 0
+    assert cache.stats()["num_arrays"] == 2
+
+
+def test_cache_eviction(tmp_path):
+    dataset = _write_transfer_functions(tmp_path / "tf.zarr")
+    otf_bytes = 3 * 4 * 5 * 8
+
+    # Only the most recently used array fits
+    cache = TransferFunctionCache(budget_bytes=otf_bytes)
+    cache.get(dataset, "intensity_to_stokes_matrix", (0, 0, 0))
+    cache.get(dataset, "optical_transfer_function")
+    assert cache.stats()["num_arrays"] == 1
+    assert cache.bytes_resident == otf_bytes
+
+    # Arrays larger than the budget are returned but not kept
+    cache.set_budget(otf_bytes - 1)
+    assert cache.stats()["num_arrays"] == 0
+    cache.get(dataset, "optical_transfer_function")
+    assert cache.stats()["num_arrays"] == 0
+
+
+def test_cache_invalidate(tmp_path):
+    tf_path = tmp_path / "tf.zarr"
+    dataset = _write_transfer_functions(tf_path)
+    cache = TransferFunctionCache()
+    cache.get(dataset, "optical_transfer_function")
+
+    cache.invalidate(tmp_path / "tf.zarr2")
+    assert cache.stats()["num_arrays"] == 1
+
+    cache.invalidate(tf_path)
+    assert cache.stats()["num_arrays"] == 0
+
+
+def _shared_otf_stats(tf_path):
+    dataset = open_ome_zarr(tf_path)
+    misses = TRANSFER_FUNCTION_CACHE.stats()["misses"]
+    otf = TRANSFER_FUNCTION_CACHE.get(dataset, "optical_transfer_function")
+    return (
+        otf.is_shared(),
+        float(otf.real.sum()),
+        TRANSFER_FUNCTION_CACHE.stats()["misses"] - misses,
+    )
+
+
+def test_cache_share_with_pool(tmp_path):
+    tf_path = tmp_path / "tf.zarr"
+    dataset = _write_transfer_functions(tf_path)
+    cache = TransferFunctionCache()
+
+    shared_tensors = cache.share(dataset)
+    assert len(shared_tensors) == 2
+    assert cache.stats()["bytes_shared"] == 3 * 4 * 5 * 8 + 5 * 4 * 4
+
+    # Shared arrays are served as views without reading from disk
+    matrix = cache.get(dataset, "intensity_to_stokes_matrix", (0, 0, 0))
+    assert matrix.shape == (5, 4)
+    assert matrix.is_shared()
+    assert cache.stats()["misses"] == 0
+
+    # Workers attach to the shared arrays instead of reloading them
+    with mp.Pool(
+        2,
+        initializer=attach_shared_transfer_functions,
+        initargs=(shared_tensors,),
+    ) as pool:
+        results = pool.map(_shared_otf_stats, [tf_path] * 2)
+    assert results == [(True, 60.0, 0)] * 2
+
+    cache.invalidate(tf_path)
+    assert cache.stats()["bytes_shared"] == 0
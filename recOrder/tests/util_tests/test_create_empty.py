@@ -1,9 +1,10 @@
 from pathlib import Path
 
 import numpy as np
+import pytest
 from iohub.ngff import Position, open_ome_zarr
 
-from recOrder.cli.utils import create_empty_hcs_zarr
+from recOrder.cli.utils import create_empty_hcs_zarr, get_storage_options
 
 
 def test_create_empty_hcs_zarr(tmp_path):
@@ -58,3 +59,86 @@ def test_create_empty_hcs_zarr(tmp_path):
             position_path /= element
         with open_ome_zarr(position_path, mode="r") as position:
             assert position.channel_names == channel_names
+
+
+def test_create_empty_hcs_zarr_storage_options(tmp_path):
+    store_path = tmp_path / "test_store.zarr"
+    shape = (2, 1, 3, 16, 16)
+    storage_options = get_storage_options(
+        "blosc-lz4", compression_level=5, quantize_digits=2
+    )
+    create_empty_hcs_zarr(
+        store_path,
+        [("A", "1", "0")],
+        shape,
+        (1, 1, 1, 16, 16),
+        (1,) * 5,
+        ["Channel1"],
+        np.float32,
+        storage_options=storage_options,
+    )
+
+    with open_ome_zarr(store_path / "A" / "1" / "0", mode="r+") as position:
+        array = position["0"]
+        assert array.compressor.cname == "lz4"
+        assert array.compressor.clevel == 5
+        assert array.filters[0].digits == 2
+        assert position.scale == [1.0] * 5
+
+        data = np.random.default_rng(0).random(shape, dtype=np.float32)
+        array[:] = data
+        np.testing.assert_allclose(array[:], data, atol=1e-2)
+
+    assert get_storage_options("none") == {
+        "compressor": None,
+        "filters": None,
+    }
+    with pytest.raises(ValueError):
+        get_storage_options("blosc-zstd", quantize_digits=2, dtype=np.uint16)
+
+
+def test_create_empty_hcs_zarr_many_positions(tmp_path):
+    store_path = tmp_path / "test_store.zarr"
+    shape = (1, 1, 1, 4, 4)
+    position_keys = [
+        (row, col, fov) for row in "AB" for col in "123" for fov in "01"
+    ]
+    create_empty_hcs_zarr(
+        store_path,
+        position_keys,
+        shape,
+        shape,
+        (1,) * 5,
+        ["Channel1"],
+        np.float32,
+        max_workers=4,
+    )
+
+    # Append positions to an existing well and a new well, and a channel
+    more_position_keys = [("A", "1", "2"), ("C", "1", "0")]
+    create_empty_hcs_zarr(
+        store_path,
+        position_keys + more_position_keys,
+        (1, 2, 1, 4, 4),
+        shape,
+        (1,) * 5,
+        ["Channel1", "Channel2"],
+        np.float32,
+    )
+
+    with open_ome_zarr(store_path, mode="r") as plate:
+        assert [row.name for row in plate.metadata.rows] == ["A", "B", "C"]
+        assert [col.name for col in plate.metadata.columns] == ["1", "2", "3"]
+        assert len(plate.metadata.wells) == 7
+        assert [image.path for image in plate["A/1"].metadata.images] == [
+            "0",
+            "1",
+            "2",
+        ]
+        positions = dict(plate.positions())
+        assert set(positions) == {
+            "/".join(key) for key in position_keys + more_position_keys
+        }
+        for position in positions.values():
+            assert position.channel_names == ["Channel1", "Channel2"]
+            assert position["0"].shape == (1, 2, 1, 4, 4)
@@ -0,0 +1,213 @@
+import numpy as np
+import pytest
+import torch
+from iohub.ngff import open_ome_zarr
+
+from recOrder.cli import utils
+
+
+def test_persistent_output_handle(tmp_path, example_plate):
+    plate_path, _ = example_plate
+    input_dataset = open_ome_zarr(plate_path / "A" / "1" / "0")
+    output_path = tmp_path / "output.zarr"
+    utils.create_empty_hcs_zarr(
+        output_path,
+        [("A", "1", "0")],
+        (2, 2, 4, 5, 6),
+        (1, 1, 1, 5, 6),
+        (1, 1, 1, 1, 1),
+        ["Out0", "Out1"],
+        np.float32,
+    )
+    output_position_path = output_path / "A" / "1" / "0"
+
+    for t_idx in range(2):
+        utils.apply_inverse_to_zyx_and_save(
+            lambda czyx_data: czyx_data + 1,
+            input_dataset,
+            output_position_path,
+            [0, 1],
+            [0, 1],
+            t_idx=t_idx,
+        )
+
+    # One handle is opened and reused for every time point
+    assert len(utils._OUTPUT_POSITIONS) == 1
+    handle = utils.get_output_position(output_position_path)
+    assert handle is utils.get_output_position(output_position_path)
+    utils.close_output_positions(output_position_path)
+    assert len(utils._OUTPUT_POSITIONS) == 0
+
+    with open_ome_zarr(output_position_path) as output_dataset:
+        assert np.all(output_dataset[0][:] == 1)
+
+
+def test_pipelined_apply_inverse(tmp_path, example_plate):
+    plate_path, plate_dataset = example_plate
+    input_dataset = plate_dataset["A/1/0"]
+    input_dataset.data[:] = np.arange(
+        input_dataset.data.size, dtype=np.uint16
+    ).reshape(input_dataset.data.shape)
+    output_path = tmp_path / "output.zarr"
+    utils.create_empty_hcs_zarr(
+        output_path,
+        [("A", "1", "0")],
+        (2, 2, 4, 5, 6),
+        (1, 1, 1, 5, 6),
+        (1, 1, 1, 1, 1),
+        ["Out0", "Out1"],
+        np.float32,
+    )
+    output_position_path = output_path / "A" / "1" / "0"
+
+    # An in-place reconstruction returns the reused ingest buffer
+    written = []
+    utils.apply_inverse_to_zyx_and_save_pipelined(
+        lambda czyx_data, offset: czyx_data.add_(offset),
+        input_dataset,
+        output_position_path,
+        [2, 3],
+        [0, 1],
+        [0, 1],
+        queue_depth=1,
+        on_written=written.append,
+        offset=1,
+    )
+    utils.close_output_positions()
+    assert written == [[0], [1]]
+
+    with open_ome_zarr(output_position_path) as output_dataset:
+        expected = input_dataset.data[:, 2:4].astype(np.float32) + 1
+        assert np.array_equal(output_dataset[0][:], expected)
+
+
+def test_pipelined_apply_inverse_raises(tmp_path, example_plate):
+    plate_path, plate_dataset = example_plate
+
+    def failing_reconstruction(czyx_data):
+        raise RuntimeError("reconstruction failed")
+
+    with pytest.raises(RuntimeError, match="reconstruction failed"):
+        utils.apply_inverse_to_zyx_and_save_pipelined(
+            failing_reconstruction,
+            plate_dataset["A/1/0"],
+            tmp_path / "output.zarr",
+            [0],
+            [0],
+            [0, 1],
+        )
+
+
+def test_ingest_buffer_reuse():
+    czyx_uint16 = np.full((2, 3, 4, 5), 65535, dtype=np.uint16)
+    first = utils._czyx_to_tensor(czyx_uint16)
+    assert first.dtype == torch.float32
+    assert torch.all(first == 65535)
+
+    second = utils._czyx_to_tensor(czyx_uint16 // 2)
+    assert second.data_ptr() == first.data_ptr()
+    assert torch.all(second == 32767)
+
+    # A new shape allocates a new buffer
+    third = utils._czyx_to_tensor(czyx_uint16[:1])
+    assert third.shape == (1, 3, 4, 5)
+
+
+def test_batched_apply_inverse(tmp_path, example_plate):
+    plate_path, plate_dataset = example_plate
+    input_dataset = plate_dataset["A/1/0"]
+    input_dataset.data[:] = np.arange(
+        input_dataset.data.size, dtype=np.uint16
+    ).reshape(input_dataset.data.shape)
+    output_path = tmp_path / "output.zarr"
+    utils.create_empty_hcs_zarr(
+        output_path,
+        [("A", "1", "0")],
+        (2, 2, 1, 5, 6),
+        (1, 1, 1, 5, 6),
+        (1, 1, 1, 1, 1),
+        ["Out0", "Out1"],
+        np.float32,
+    )
+    output_position_path = output_path / "A" / "1" / "0"
+    cyx_no_sample_data = torch.arange(2 * 5 * 6.0).reshape(2, 5, 6)
+
+    # A Z-projection is pixel-local in YX, so batching must not change it
+    written = []
+    utils.apply_inverse_to_zyx_and_save_batched(
+        lambda czyx_data, cyx_no_sample_data: (
+            czyx_data.mean(dim=1, keepdim=True) - cyx_no_sample_data[:, None]
+        ),
+        input_dataset,
+        output_position_path,
+        [1, 3],
+        [0, 1],
+        [1, 0],
+        batch_size=2,
+        on_written=written.append,
+        cyx_no_sample_data=cyx_no_sample_data,
+    )
+    utils.close_output_positions()
+    assert written == [[1, 0]]
+
+    with open_ome_zarr(output_position_path) as output_dataset:
+        expected = (
+            input_dataset.data.oindex[:, [1, 3]]
+            .astype(np.float32)
+            .mean(axis=2, keepdims=True)
+            - cyx_no_sample_data.numpy()[None, :, None]
+        )
+        np.testing.assert_allclose(output_dataset[0][:], expected)
+
+
+def test_auto_time_batch_size(monkeypatch):
+    monkeypatch.setenv("SLURM_MEM_PER_NODE", "1024")
+    assert utils.available_memory_bytes() == 2**30
+    # 1 MB per float32 time point, 4x working memory, a quarter of 1 GB
+    assert utils.auto_time_batch_size((1, 1, 512, 512), 1000) == 64
+    assert utils.auto_time_batch_size((1, 1, 512, 512), 10) == 10
+    assert utils.auto_time_batch_size((1, 64, 2048, 2048), 10) == 1
+
+
+def test_encode_output_clipping(tmp_path):
+    output_path = tmp_path / "output.zarr"
+    utils.create_empty_hcs_zarr(
+        output_path,
+        [("A", "1", "0")],
+        (1, 1, 1, 2, 2),
+        (1, 1, 1, 2, 2),
+        (1, 1, 1, 1, 1),
+        ["Out0"],
+        np.uint16,
+    )
+    with open_ome_zarr(output_path / "A" / "1" / "0", mode="r+") as position:
+        utils.set_output_scaling(
+            position, ["Out0"], [{"scale": 1.0, "offset": 0.0}]
+        )
+        reconstruction = np.array([[[[-5.0, 1.0], [2.0, 70000.0]]]])
+        with pytest.warns(UserWarning, match="2 of 4 voxels"):
+            encoded = utils._encode_output(position, [0], reconstruction)
+        np.testing.assert_array_equal(encoded, [[[[0, 1], [2, 65535]]]])
+
+
+def test_fov_reader_rescales_output(tmp_path):
+    pytest.importorskip("napari_ome_zarr")
+    from recOrder.io._reader import napari_get_reader
+
+    stored = np.arange(2 * 2 * 3 * 4, dtype=np.uint16).reshape(2, 1, 2, 3, 4)
+    fov_path = tmp_path / "fov.zarr"
+    with open_ome_zarr(
+        fov_path, layout="fov", mode="w", channel_names=["Retardance"]
+    ) as fov:
+        fov.create_image("0", stored)
+        fov.zattrs["output_scaling"] = {
+            "Retardance": {"scale": 0.5, "offset": -1.0}
+        }
+
+    # single positions are read by napari-ome-zarr, and decoded like plates
+    reader = napari_get_reader(str(fov_path))
+    (data, kwargs, *_), *_ = reader(str(fov_path))
+    napari_data = np.asarray(data[0] if isinstance(data, list) else data)
+    assert napari_data.dtype == np.float32
+    np.testing.assert_allclose(napari_data, stored * 0.5 - 1.0)
+    assert "contrast_limits" not in kwargs